@@ -0,0 +1,32 @@
+"""Utilidades compartidas por los benchmarks: base de datos SQLite en memoria y estadísticas"""
+import statistics
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.infrastructure.database import Base, enable_sqlite_foreign_keys
+import src.infrastructure.models  # noqa: F401  (registra las tablas en Base.metadata)
+
+def make_engine() -> Engine:
+    # Una única conexión compartida para que la base de datos en memoria sobreviva entre sesiones
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    enable_sqlite_foreign_keys(engine)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+def make_session_factory(engine: Engine) -> sessionmaker:
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+@contextmanager
+def timer(samples: List[float]) -> Iterator[None]:
+    start = time.perf_counter()
+    yield
+    samples.append(time.perf_counter() - start)
+
+def summary(samples: List[float]) -> str:
+    ordered = sorted(samples)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    return f"median={statistics.median(ordered) * 1000:8.3f} ms  p95={p95 * 1000:8.3f} ms  n={len(ordered)}"
@@ -0,0 +1,90 @@
+"""
+Benchmark del archivo: latencia de las consultas del día a día sobre N tareas antes y después de mover a
+tasks_archive el trabajo terminado (SQLite en memoria).
+
+El 80 % de las tareas están DONE y sin tocar desde hace dos años, como en una instalación con años de uso;
+el resto siguen abiertas. Se miden las consultas cuyo coste crece con el tamaño de la tabla.
+
+    uv run python -m benchmarks.bench_archive [N]
+"""
+import datetime
+import random
+import sys
+import time
+from typing import Callable, Dict, List
+from sqlalchemy import insert
+from src.domain.entities.task import TaskPriority, TaskStatus
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.archive import archive_completed
+from src.infrastructure.repositories.counters import reconcile_counters
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+TASKS_PER_EPIC = 500
+EPICS_PER_PROJECT = 20
+DONE_RATIO = 0.8
+ASSIGNEES = [f"user{n}" for n in range(200)]
+QUERIES = 50
+BATCH = 10_000
+
+def populate(session) -> None:
+    rng = random.Random(42)
+    now = datetime.datetime.now()
+    old = now - datetime.timedelta(days=730)
+    epics = TASKS // TASKS_PER_EPIC
+    projects = max(1, epics // EPICS_PER_PROJECT)
+    session.execute(insert(ProjectModel), [{"name": f"project {p}", "name_normalized": f"project {p}"} for p in range(projects)])
+    session.execute(insert(EpicModel), [{"project_id": e % projects + 1, "name": f"epic {e}", "name_normalized": f"epic {e}"}
+                                        for e in range(epics)])
+    open_statuses = [TaskStatus.TO_DO, TaskStatus.IN_PROGRESS, TaskStatus.BLOCKED]
+    for start in range(0, TASKS, BATCH):
+        rows = []
+        for t in range(start, min(start + BATCH, TASKS)):
+            done = rng.random() < DONE_RATIO
+            rows.append({"epic_id": t // TASKS_PER_EPIC + 1, "name": f"task {t}", "name_normalized": f"task {t}",
+                         "status": TaskStatus.DONE if done else rng.choice(open_statuses),
+                         "priority": rng.choice(list(TaskPriority)), "assignee": rng.choice(ASSIGNEES),
+                         "target_date": (old if done else now) + datetime.timedelta(days=rng.randint(0, 60)),
+                         "updated_at": old if done else now})
+        session.execute(insert(TaskModel), rows)
+    reconcile_counters(session)
+    session.commit()
+
+def measure(repository: SQLAlchemyTaskRepository) -> Dict[str, str]:
+    rng = random.Random(7)
+    epics = TASKS // TASKS_PER_EPIC
+    cases: Dict[str, Callable[[], object]] = {
+        "GET /tasks/ ETag (COUNT + MAX)": lambda: repository.get_version(),
+        "GET /tasks/?status=to_do page": lambda: repository.get_page(50, status=TaskStatus.TO_DO),
+        "GET /tasks/?priority=high page": lambda: repository.get_page(50, priority=TaskPriority.HIGH),
+        "GET /tasks/due (now)": lambda: repository.get_due_page(datetime.datetime.now(), 50),
+        "GET /assignees/workload": lambda: repository.get_workload_page(50),
+        "GET /epics/{id}/stats": lambda: repository.get_stats_by_epic_ids([rng.randint(1, epics)]),
+    }
+    results = {}
+    for name, query in cases.items():
+        samples: List[float] = []
+        for _ in range(QUERIES):
+            with timer(samples):
+                query()
+        results[name] = summary(samples)
+    return results
+
+if __name__ == "__main__":
+    session = make_session_factory(make_engine())()
+    start = time.perf_counter()
+    populate(session)
+    print(f"{TASKS} tasks inserted in {time.perf_counter() - start:.1f} s")
+    repository = SQLAlchemyTaskRepository(session)
+    before = measure(repository)
+
+    start = time.perf_counter()
+    moved = archive_completed(session, datetime.datetime.now() - datetime.timedelta(days=180), batch_size=1000)
+    print(f"archived {moved['tasks']} tasks in {time.perf_counter() - start:.1f} s")
+    after = measure(repository)
+
+    for name in before:
+        print(f"  {name}")
+        print(f"    before  {before[name]}")
+        print(f"    after   {after[name]}")
@@ -0,0 +1,54 @@
+"""
+Micro-benchmark: operaciones masivas de TaskService frente a una llamada por tarea.
+
+    uv run python -m benchmarks.bench_bulk_tasks
+"""
+import time
+from sqlalchemy import insert
+from src.app.services.task_service import TaskService
+from src.domain.entities.task import Task, TaskStatus
+from src.infrastructure.models import EpicModel, ProjectModel
+from src.infrastructure.repositories.sqlalchemy_epic_repository import SQLAlchemyEpicRepository
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from src.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.event_broker import get_broker
+from benchmarks._common import make_engine, make_session_factory
+
+TASKS = 10_000
+SINGLE = 1_000 # Las llamadas una a una son mucho más lentas: medimos menos y extrapolamos
+
+def make_service():
+    engine = make_engine()
+    session = make_session_factory(engine)()
+    session.execute(insert(ProjectModel), [{"name": "bench", "name_normalized": "bench"}])
+    session.execute(insert(EpicModel), [{"project_id": 1, "name": "bench", "name_normalized": "bench"}])
+    session.commit()
+    return TaskService(SQLAlchemyTaskRepository(session), SQLAlchemyEpicRepository(session),
+                       SQLAlchemyUnitOfWork(session), get_broker())
+
+def elapsed(start: float) -> str:
+    return f"{time.perf_counter() - start:7.3f} s"
+
+if __name__ == "__main__":
+    service = make_service()
+    print(f"{TASKS} tasks")
+
+    start = time.perf_counter()
+    result = service.bulk_create_tasks([Task(epic_id=1, name=f"task-{i}") for i in range(TASKS)])
+    print(f"  bulk_create_tasks: {elapsed(start)}  ({len(result.items)} created)")
+
+    ids = [task.id for task in result.items]
+    start = time.perf_counter()
+    result = service.bulk_update_tasks([(task_id, {"status": TaskStatus.IN_PROGRESS}) for task_id in ids])
+    print(f"  bulk_update_tasks: {elapsed(start)}  ({len(result.items)} updated)")
+
+    start = time.perf_counter()
+    result = service.bulk_delete_tasks(ids) # type: ignore[arg-type]
+    print(f"  bulk_delete_tasks: {elapsed(start)}  ({len(result.items)} deleted)")
+
+    service = make_service()
+    start = time.perf_counter()
+    for i in range(SINGLE):
+        service.create_task(name=f"task-{i}", epic_id=1)
+    per_call = (time.perf_counter() - start) / SINGLE
+    print(f"  create_task x{TASKS} (extrapolated from {SINGLE}): {per_call * TASKS:7.3f} s")
@@ -0,0 +1,64 @@
+"""
+Bytes enviados y latencia de GET /projects/{id}/board (un tablero realista: 10 épicas x 100 tareas con descripción,
+responsable y fechas) y de una página de 500 tareas de GET /tasks/, sin comprimir y con cada codificación disponible
+(br y zstd requieren el extra "compression").
+
+La latencia es la mediana de la petición completa en proceso (TestClient, sin red: incluye comprimir y descomprimir);
+el tiempo de transferencia se estima para enlaces de 2, 10 y 50 Mbit/s.
+
+    uv run python -m benchmarks.bench_compression
+"""
+import os
+import random
+import tempfile
+from typing import List
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'compression.db')}")
+
+from fastapi.testclient import TestClient
+import main
+from src.infrastructure.adapters.api.compression import available_encodings
+from benchmarks._common import timer
+
+EPICS = 10
+TASKS_PER_EPIC = 100
+RUNS = 30
+LINKS_MBIT = (2, 10, 50)
+WORDS = ("revisar", "informe", "cliente", "despliegue", "corregir", "pantalla", "factura", "pruebas", "migrar",
+         "servidor", "diseño", "validar", "importar", "datos", "usuarios", "permisos", "integración", "pago",
+         "notificación", "rendimiento", "documentar", "API", "tablero", "filtros", "exportar", "móvil")
+
+def populate(client: TestClient) -> int:
+    rng = random.Random(42)
+    project = client.post("/projects/", json={"name": "Plataforma de pagos", "description": "Proyecto de ejemplo"}).json()
+    for e in range(EPICS):
+        epic = client.post("/epics/", json={"name": f"Épica {e}: {' '.join(rng.sample(WORDS, 3))}",
+                                            "project_id": project["id"]}).json()
+        client.post("/tasks/bulk", json={"items": [{
+            "epic_id": epic["id"], "name": f"{' '.join(rng.sample(WORDS, 4))} #{t}",
+            "description": " ".join(rng.choices(WORDS, k=rng.randint(8, 30))).capitalize() + ".",
+            "status": rng.choice(["to_do", "in_progress", "done", "blocked"]),
+            "priority": rng.choice(["low", "medium", "high", "critical"]),
+            "assignee": f"user{rng.randint(1, 12)}",
+            "target_date": f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T10:00:00",
+        } for t in range(TASKS_PER_EPIC)]})
+    return project["id"]
+
+def measure(client: TestClient, url: str) -> None:
+    print(url)
+    encodings = ["identity"] + [name for name, available in available_encodings().items() if available][::-1]
+    for encoding in encodings:
+        samples: List[float] = []
+        for _ in range(RUNS):
+            with timer(samples):
+                response = client.get(url, headers={"Accept-Encoding": encoding})
+        size = int(response.headers["content-length"])
+        samples.sort()
+        transfer = "  ".join(f"{mbit:>2} Mbit/s {size * 8 / (mbit * 1000):7.1f} ms" for mbit in LINKS_MBIT)
+        print(f"  {encoding:9s} {size:>8} B  median={samples[len(samples) // 2] * 1000:6.1f} ms  {transfer}")
+
+if __name__ == "__main__":
+    client = TestClient(main.app)
+    project_id = populate(client)
+    measure(client, f"/projects/{project_id}/board")
+    measure(client, "/tasks/?limit=500")
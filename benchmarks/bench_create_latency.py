@@ -0,0 +1,47 @@
+"""
+Micro-benchmark: latencia de ProjectService.create_project según el tamaño de la tabla.
+
+Con la comprobación de nombres duplicados resuelta por exists_by_name (SELECT ... LIMIT 1 sobre el
+índice UNIQUE) la latencia debe mantenerse plana aunque la tabla crezca.
+
+    uv run python -m benchmarks.bench_create_latency
+"""
+from typing import List
+from sqlalchemy import insert
+from src.app.services.project_service import ProjectService
+from src.infrastructure.models import ProjectModel
+from src.infrastructure.repositories.sqlalchemy_epic_repository import SQLAlchemyEpicRepository
+from src.infrastructure.repositories.sqlalchemy_project_repository import SQLAlchemyProjectRepository
+from src.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.event_broker import get_broker
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+SIZES = (1_000, 10_000, 100_000)
+CREATES = 200
+
+def seed_projects(session, size: int) -> None:
+    # Insert masivo directo para preparar la tabla rápidamente
+    rows = [{"name": f"seed-{i}", "name_normalized": f"seed-{i}"} for i in range(size)]
+    for start in range(0, size, 10_000):
+        session.execute(insert(ProjectModel), rows[start:start + 10_000])
+    session.commit()
+
+def run(size: int) -> List[float]:
+    engine = make_engine()
+    session = make_session_factory(engine)()
+    seed_projects(session, size)
+    service = ProjectService(SQLAlchemyProjectRepository(session), SQLAlchemyEpicRepository(session),
+                             SQLAlchemyUnitOfWork(session), get_broker())
+
+    samples: List[float] = []
+    for i in range(CREATES):
+        with timer(samples):
+            service.create_project(name=f"bench-{i}")
+    session.close()
+    engine.dispose()
+    return samples
+
+if __name__ == "__main__":
+    print(f"create_project latency ({CREATES} creates per size)")
+    for size in SIZES:
+        print(f"  {size:>7} existing projects: {summary(run(size))}")
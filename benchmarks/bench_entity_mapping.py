@@ -0,0 +1,60 @@
+"""
+Benchmark de la conversión fila -> entidad en las lecturas de listas: N tareas leídas como instancias del ORM y
+convertidas una a una con _to_entity (el camino anterior), frente a filas Core convertidas por lote con
+tasks_from_rows (SQLite en memoria).
+
+Se mide la lectura completa (consulta + conversión) y, por separado, solo la conversión de filas ya leídas.
+
+    uv run python -m benchmarks.bench_entity_mapping [N]
+"""
+import sys
+from typing import Callable, List
+from sqlalchemy import insert
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.row_mapping import tasks_from_rows
+from src.infrastructure.repositories.sqlalchemy_task_repository import TASK_COLUMNS, SQLAlchemyTaskRepository
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+TASKS_PER_EPIC = 500
+RUNS = 10
+BATCH = 10_000
+
+def populate(session) -> None:
+    epics = TASKS // TASKS_PER_EPIC
+    session.execute(insert(ProjectModel), [{"name": "bench", "name_normalized": "bench"}])
+    session.execute(insert(EpicModel), [{"project_id": 1, "name": f"epic {e}", "name_normalized": f"epic {e}"}
+                                        for e in range(epics)])
+    for start in range(0, TASKS, BATCH):
+        session.execute(insert(TaskModel), [{
+            "epic_id": t // TASKS_PER_EPIC + 1, "name": f"task {t}", "name_normalized": f"task {t}",
+            "description": "Revisar el informe", "assignee": "ana",
+        } for t in range(start, min(start + BATCH, TASKS))])
+    session.commit()
+
+def measure(name: str, run: Callable[[], object]) -> None:
+    samples: List[float] = []
+    for _ in range(RUNS):
+        with timer(samples):
+            run()
+    print(f"  {name:34s} {summary(samples)}")
+
+if __name__ == "__main__":
+    factory = make_session_factory(make_engine())
+    populate(factory())
+    print(f"{TASKS} tasks")
+    session = factory()
+    repository = SQLAlchemyTaskRepository(session)
+
+    def orm_read():
+        entities = [repository._to_entity(db_task) for db_task in session.query(TaskModel).all()]
+        session.expunge_all()
+        return entities
+
+    measure("read: ORM + _to_entity", orm_read)
+    measure("read: Core rows + tasks_from_rows", lambda: tasks_from_rows(session.query(*TASK_COLUMNS).all()))
+
+    db_tasks = session.query(TaskModel).all()
+    rows = session.query(*TASK_COLUMNS).all()
+    measure("mapping only: _to_entity", lambda: [repository._to_entity(db_task) for db_task in db_tasks])
+    measure("mapping only: tasks_from_rows", lambda: tasks_from_rows(rows))
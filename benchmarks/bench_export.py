@@ -0,0 +1,76 @@
+"""
+Benchmark de GET /export: tiempo y memoria máxima (objetos Python, tracemalloc) al volcar N tareas en streaming,
+frente a construir primero la lista completa de respuestas como hacen los listados.
+
+El tiempo se mide en una pasada sin tracemalloc (que lo multiplica varias veces) y la memoria en otra.
+
+    uv run python -m benchmarks.bench_export [N]
+"""
+import asyncio
+import sys
+import time
+import tracemalloc
+from typing import Callable, Tuple
+from sqlalchemy import insert
+from src.app.schemas.task_schema import TaskResponse
+from src.app.services.export_service import ExportService
+from src.infrastructure.adapters.api.export_stream import export_response
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.sqlalchemy_export_repository import SQLAlchemyExportRepository
+from src.infrastructure.repositories.sqlalchemy_project_repository import SQLAlchemyProjectRepository
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from benchmarks._common import make_engine, make_session_factory
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+TASKS_PER_EPIC = 500
+BATCH = 10_000
+
+def populate(session) -> None:
+    epics = TASKS // TASKS_PER_EPIC
+    session.execute(insert(ProjectModel), [{"name": "bench", "name_normalized": "bench"}])
+    session.execute(insert(EpicModel), [{"project_id": 1, "name": f"epic {e}", "name_normalized": f"epic {e}"}
+                                        for e in range(epics)])
+    for start in range(0, TASKS, BATCH):
+        session.execute(insert(TaskModel), [{
+            "epic_id": t // TASKS_PER_EPIC + 1, "name": f"task {t}", "name_normalized": f"task {t}",
+            "description": "Revisar el informe trimestral, corregir las cifras y enviarlo al equipo", "assignee": "ana",
+        } for t in range(start, min(start + BATCH, TASKS))])
+    session.commit()
+
+async def drain(response) -> int:
+    size = 0
+    async for chunk in response.body_iterator:
+        size += len(chunk)
+    return size
+
+def measure(run: Callable[[], int]) -> Tuple[float, float, int]:
+    start = time.perf_counter()
+    size = run()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1024 / 1024, size
+
+if __name__ == "__main__":
+    factory = make_session_factory(make_engine())
+    populate(factory())
+    print(f"{TASKS} tasks")
+
+    for export_format, gzip in (("ndjson", False), ("csv", False), ("ndjson", True)):
+        session = factory()
+        service = ExportService(SQLAlchemyExportRepository(session), SQLAlchemyProjectRepository(session))
+        elapsed, peak, size = measure(lambda: asyncio.run(drain(export_response(
+            service.export_project(1), export_format, gzip, "bench")))) # type: ignore[arg-type]
+        session.close()
+        label = f"{export_format}{' + gzip' if gzip else ''}"
+        print(f"  export {label:14s} {elapsed:6.1f} s  peak={peak:7.1f} MB  body={size / 1024 / 1024:7.1f} MB")
+
+    # Lo que hacen los listados: cargar todas las filas y construir la lista de respuestas antes de serializar
+    session = factory()
+    repository = SQLAlchemyTaskRepository(session)
+    elapsed, peak, size = measure(lambda: len(b"\n".join(TaskResponse.model_validate(task).model_dump_json().encode()
+                                                         for epic_id in range(1, TASKS // TASKS_PER_EPIC + 1)
+                                                         for task in repository.get_by_epic_id(epic_id))))
+    print(f"  in-memory list        {elapsed:6.1f} s  peak={peak:7.1f} MB  body={size / 1024 / 1024:7.1f} MB")
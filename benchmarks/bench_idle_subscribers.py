@@ -0,0 +1,143 @@
+"""
+Prueba de carga: miles de suscriptores SSE inactivos en un solo worker.
+
+Abre N conexiones a GET /projects/{id}/events directamente sobre la aplicación ASGI (sin sockets, así que
+mide el coste del worker y no el de la pila de red), comprueba la memoria y las conexiones del pool que
+retienen, y mide cuánto tarda un cambio en llegar a todas.
+
+    uv run python -m benchmarks.bench_idle_subscribers [N]
+"""
+import asyncio
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'subscribers.db')}")
+
+import main
+from src.infrastructure.event_broker import get_broker
+from src.infrastructure.pool_metrics import pool_snapshot
+
+SUBSCRIBERS = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+
+def rss_mb() -> float:
+    # Memoria residente del proceso (Linux); en otros sistemas, el máximo alcanzado
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def scope(method: str, path: str) -> Dict[str, Any]:
+    return {"type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": method, "path": path,
+            "raw_path": path.encode(), "query_string": b"", "root_path": "", "scheme": "http",
+            "headers": [(b"host", b"bench"), (b"content-type", b"application/json")],
+            "client": ("127.0.0.1", 0), "server": ("bench", 80)}
+
+async def request(method: str, path: str, body: Optional[dict] = None) -> Tuple[int, Any]:
+    payload = json.dumps(body).encode() if body is not None else b""
+    sent = False
+    status = 0
+    chunks: List[bytes] = []
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    await main.app(scope(method, path), receive, send)
+    raw = b"".join(chunks)
+    return status, json.loads(raw) if raw else None
+
+
+class Subscriber:
+    # Un cliente SSE: guarda cuándo recibe el primer mensaje "changes" y se desconecta cuando se le pide
+    def __init__(self, path: str):
+        self.path = path
+        self.status = 0
+        self.received_at: Optional[float] = None
+        self.received = asyncio.Event()
+        self.disconnect = asyncio.Event()
+        self._requested = False
+
+    async def receive(self):
+        if not self._requested:
+            self._requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await self.disconnect.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.start":
+            self.status = message["status"]
+        elif message["type"] == "http.response.body" and b"event: changes" in message.get("body", b""):
+            if self.received_at is None:
+                self.received_at = time.perf_counter()
+                self.received.set()
+
+    async def run(self) -> None:
+        await main.app(scope("GET", self.path), self.receive, self.send)
+
+
+async def wait_for_subscribers(count: int, timeout: float = 120) -> None:
+    deadline = time.perf_counter() + timeout
+    while get_broker().subscriber_count() != count:
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"expected {count} subscribers, got {get_broker().subscriber_count()}")
+        await asyncio.sleep(0.05)
+
+async def bench() -> None:
+    await request("POST", "/projects/", {"name": "Load test"})
+    await request("POST", "/epics/", {"name": "Load epic", "project_id": 1})
+    await request("POST", "/tasks/", {"name": "Load task", "epic_id": 1})
+
+    base_rss = rss_mb()
+    base_tasks = len(asyncio.all_tasks())
+    subscribers = [Subscriber("/projects/1/events") for _ in range(SUBSCRIBERS)]
+    start = time.perf_counter()
+    runs = [asyncio.create_task(subscriber.run()) for subscriber in subscribers]
+    await wait_for_subscribers(SUBSCRIBERS)
+    connect_seconds = time.perf_counter() - start
+
+    await asyncio.sleep(1) # Inactivos: no debe pasar nada
+    idle_rss = rss_mb()
+    tasks_per_subscriber = (len(asyncio.all_tasks()) - base_tasks) / SUBSCRIBERS
+    pools = pool_snapshot()
+    checked_out = sum(int(pool.get("checked_out", 0)) for pool in pools.values())
+
+    published = time.perf_counter()
+    status, _ = await request("PUT", "/tasks/1", {"name": "Load task renamed", "epic_id": 1})
+    await asyncio.wait_for(asyncio.gather(*(subscriber.received.wait() for subscriber in subscribers)), 60)
+    latencies = sorted(subscriber.received_at - published for subscriber in subscribers) # type: ignore[operator]
+
+    for subscriber in subscribers:
+        subscriber.disconnect.set()
+    await asyncio.gather(*runs)
+    await wait_for_subscribers(0)
+
+    print(f"{SUBSCRIBERS} idle SSE subscribers on one project")
+    print(f"  connect all:          {connect_seconds:7.2f} s")
+    print(f"  memory:               {idle_rss - base_rss:7.1f} MB  ({(idle_rss - base_rss) * 1024 / SUBSCRIBERS:.1f} KB per subscriber)")
+    print(f"  asyncio tasks:        {tasks_per_subscriber:7.1f} per subscriber")
+    print(f"  pool connections held while idle: {checked_out}")
+    print(f"  fan-out of one update (PUT {status}, includes the {get_broker().coalesce_seconds * 1000:.0f} ms coalescing window):")
+    print(f"    median={statistics.median(latencies) * 1000:8.1f} ms  max={latencies[-1] * 1000:8.1f} ms")
+    if checked_out:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(bench())
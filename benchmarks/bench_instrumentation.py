@@ -0,0 +1,65 @@
+"""
+Coste de la instrumentación (INSTRUMENTATION_ENABLED): los eventos before/after_cursor_execute sobre N consultas
+por clave primaria en SQLite en memoria, con y sin instrument_queries, y el InstrumentationMiddleware sobre una ruta
+FastAPI que no hace nada, con y sin el middleware (TestClient).
+
+    uv run python -m benchmarks.bench_instrumentation
+"""
+from typing import Callable, List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from src.infrastructure.adapters.api.instrumentation import InstrumentationMiddleware
+from src.infrastructure.models import ProjectModel
+from src.infrastructure.query_metrics import instrument_queries, track_queries
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+STATEMENTS = 10_000
+REQUESTS = 2_000
+RUNS = 10
+
+def measure(name: str, run: Callable[[], object]) -> None:
+    samples: List[float] = []
+    for _ in range(RUNS):
+        with timer(samples):
+            run()
+    print(f"  {name:28s} {summary(samples)}")
+
+def make_app(instrumented: bool) -> TestClient:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        return {"id": item_id}
+
+    if instrumented:
+        app.add_middleware(InstrumentationMiddleware)
+    return TestClient(app)
+
+if __name__ == "__main__":
+    print(f"{STATEMENTS} SELECT by primary key")
+    for instrumented in (False, True):
+        engine = make_engine()
+        if instrumented:
+            instrument_queries(engine, "bench", slow_query_ms=200)
+        session = make_session_factory(engine)()
+        session.add(ProjectModel(name="bench", name_normalized="bench"))
+        session.commit()
+        statement = select(ProjectModel.id, ProjectModel.name).where(ProjectModel.id == 1)
+
+        def queries():
+            with track_queries():
+                for _ in range(STATEMENTS):
+                    session.execute(statement).one()
+
+        measure("hooks" if instrumented else "no hooks", queries)
+
+    print(f"{REQUESTS} requests to an empty route")
+    for instrumented in (False, True):
+        client = make_app(instrumented)
+
+        def requests():
+            for item_id in range(REQUESTS):
+                client.get(f"/items/{item_id}")
+
+        measure("middleware" if instrumented else "no middleware", requests)
@@ -0,0 +1,84 @@
+"""
+Benchmark del planificador de vencimientos: coste de cada pasada incremental sobre N tareas con fecha objetivo
+(SQLite), frente a recorrer todas las tareas abiertas vencidas en cada pasada.
+
+Las fechas se reparten a lo largo de un año (un tercio de las tareas ya terminadas). Cada pasada simula que
+avanza el reloj SCAN_SECONDS: solo lee lo que ha vencido desde la anterior.
+
+    uv run python -m benchmarks.bench_overdue_scan [N]
+"""
+import datetime
+import random
+import sys
+import time
+from typing import List
+from sqlalchemy import insert
+from src.domain.entities.task import TaskStatus
+from src.domain.repositories.overdue_sink import OverdueSink
+from src.infrastructure.jobs.overdue_scheduler import OverdueScheduler
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+TASKS_PER_EPIC = 500
+SCAN_SECONDS = 60
+TICKS = 500
+BATCH = 10_000
+START = datetime.datetime(2026, 1, 1)
+YEAR_SECONDS = 365 * 24 * 3600
+
+class CountingSink(OverdueSink):
+    def __init__(self):
+        self.count = 0
+
+    def publish(self, alerts) -> None:
+        self.count += len(alerts)
+
+def populate(session) -> None:
+    rng = random.Random(42)
+    epics = TASKS // TASKS_PER_EPIC
+    session.execute(insert(ProjectModel), [{"name": "bench", "name_normalized": "bench"}])
+    session.execute(insert(EpicModel), [{"project_id": 1, "name": f"epic {e}", "name_normalized": f"epic {e}"}
+                                        for e in range(epics)])
+    statuses = [TaskStatus.TO_DO, TaskStatus.IN_PROGRESS, TaskStatus.DONE]
+    for start in range(0, TASKS, BATCH):
+        session.execute(insert(TaskModel), [{
+            "epic_id": t // TASKS_PER_EPIC + 1, "name": f"task {t}", "name_normalized": f"task {t}",
+            "target_date": START + datetime.timedelta(seconds=rng.randrange(YEAR_SECONDS)),
+            "status": rng.choice(statuses),
+        } for t in range(start, min(start + BATCH, TASKS))])
+    session.commit()
+
+if __name__ == "__main__":
+    factory = make_session_factory(make_engine())
+    start = time.perf_counter()
+    populate(factory())
+    print(f"{TASKS} tasks inserted in {time.perf_counter() - start:.1f} s")
+
+    # Reloj a mitad de año: la mitad de las tareas ya han vencido
+    now = START + datetime.timedelta(days=182)
+    sink = CountingSink()
+    scheduler = OverdueScheduler(sink, SCAN_SECONDS, 1000, session_factory=factory, start=now)
+    samples: List[float] = []
+    for _ in range(TICKS):
+        now += datetime.timedelta(seconds=SCAN_SECONDS)
+        with timer(samples):
+            scheduler.tick(now)
+    print(f"  incremental tick ({SCAN_SECONDS} s of due dates)  {summary(samples)}  alerts={sink.count}")
+
+    # Alternativa sin marca de agua: en cada pasada, todas las tareas abiertas vencidas
+    full: List[float] = []
+    session = factory()
+    repository = SQLAlchemyTaskRepository(session)
+    for _ in range(5):
+        with timer(full):
+            cursor, rows = None, 0
+            while True:
+                page = repository.get_due_page(now, 1000, cursor=cursor)
+                rows += len(page.items)
+                cursor = page.next_cursor
+                if not cursor:
+                    break
+        session.expunge_all()
+    print(f"  full rescan of overdue tasks          {summary(full)}  rows={rows}")
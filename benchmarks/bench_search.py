@@ -0,0 +1,72 @@
+"""
+Benchmark de GET /search: latencia de la búsqueda de texto completo sobre N tareas (SQLite FTS5).
+
+Genera proyectos, épicas y tareas con texto aleatorio (vocabulario con distribución de Zipf, como el texto real)
+y mide el repositorio con consultas de una y dos palabras, con y sin proyecto y con prefijos.
+
+    uv run python -m benchmarks.bench_search [N]
+"""
+import itertools
+import random
+import sys
+import time
+from typing import List
+from sqlalchemy import insert
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.sqlalchemy_search_repository import SQLAlchemySearchRepository
+from src.domain.entities.change import ChangeEntity
+from benchmarks._common import make_engine, make_session_factory, summary, timer
+
+TASKS = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+TASKS_PER_EPIC = 500
+EPICS_PER_PROJECT = 20
+VOCABULARY = 20_000
+QUERIES = 300
+BATCH = 10_000
+
+rng = random.Random(42)
+SYLLABLES = ["ka", "lo", "me", "ri", "ta", "su", "ne", "po", "vi", "da", "mor", "lin", "sec", "tra", "pen"]
+words = list(dict.fromkeys("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(VOCABULARY * 2)))[:VOCABULARY]
+cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+
+def sentence(length: int) -> str:
+    return " ".join(rng.choices(words, cum_weights=cum_weights, k=length))
+
+def populate(session) -> None:
+    epics = TASKS // TASKS_PER_EPIC
+    projects = max(1, epics // EPICS_PER_PROJECT)
+    session.execute(insert(ProjectModel), [{"name": f"project {p} {sentence(2)}", "name_normalized": f"project {p}",
+                                            "description": sentence(12)} for p in range(projects)])
+    session.execute(insert(EpicModel), [{"project_id": e % projects + 1, "name": f"epic {e} {sentence(2)}",
+                                         "name_normalized": f"epic {e}", "description": sentence(12)} for e in range(epics)])
+    for start in range(0, TASKS, BATCH):
+        session.execute(insert(TaskModel), [{
+            "epic_id": t // TASKS_PER_EPIC + 1, "name": f"task {t} {sentence(3)}", "name_normalized": f"task {t}",
+            "description": sentence(rng.randint(5, 25)), "finalization_criteria": sentence(6),
+        } for t in range(start, min(start + BATCH, TASKS))])
+    session.commit()
+
+if __name__ == "__main__":
+    session = make_session_factory(make_engine())()
+    start = time.perf_counter()
+    populate(session)
+    print(f"{TASKS} tasks indexed in {time.perf_counter() - start:.1f} s")
+
+    repository = SQLAlchemySearchRepository(session)
+    projects = max(1, TASKS // TASKS_PER_EPIC // EPICS_PER_PROJECT)
+    cases = {
+        "one word": lambda: {"text": rng.choice(words[50:])},
+        "two words": lambda: {"text": f"{rng.choice(words[50:])} {rng.choice(words[50:])}"},
+        "prefix (3 letters)": lambda: {"text": rng.choice(words[50:])[:3]},
+        "common word": lambda: {"text": rng.choice(words[:50])},
+        "one word, one project": lambda: {"text": rng.choice(words[50:]), "project_id": rng.randint(1, projects)},
+        "common word, tasks, one project": lambda: {"text": rng.choice(words[:50]), "entity": ChangeEntity.TASK,
+                                                    "project_id": rng.randint(1, projects)},
+    }
+    for name, make_query in cases.items():
+        samples: List[float] = []
+        for _ in range(QUERIES):
+            query = make_query()
+            with timer(samples):
+                repository.search(limit=20, **query)
+        print(f"  {name:32s} {summary(samples)}")
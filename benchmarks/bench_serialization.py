@@ -0,0 +1,53 @@
+"""
+Benchmark de la serialización de listados: una página de N tareas devuelta por una ruta FastAPI con
+response_model=TaskPage (validación por objeto + json.dumps, el camino por defecto) frente a la misma página
+escrita con EntityJSONResponse y el TypeAdapter de Page[Task] (FAST_SERIALIZATION=true).
+
+Las dos rutas devuelven entidades ya construidas, así que solo se mide la serialización y el envío (TestClient).
+
+    uv run python -m benchmarks.bench_serialization
+"""
+import datetime
+from typing import List
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from src.app.schemas.task_schema import TaskPage
+from src.domain.entities.page import Page
+from src.domain.entities.task import Task, TaskPriority, TaskStatus
+from src.infrastructure.adapters.api.fast_json import EntityJSONResponse
+from src.infrastructure.adapters.api.routers.task_router import TASK_PAGE_JSON
+from benchmarks._common import summary, timer
+
+SIZES = (1_000, 10_000, 100_000)
+RUNS = {1_000: 50, 10_000: 20, 100_000: 5}
+
+def make_page(size: int) -> Page[Task]:
+    now = datetime.datetime.now()
+    statuses, priorities = list(TaskStatus), list(TaskPriority)
+    return Page(items=[Task(epic_id=t // 500 + 1, name=f"task {t}", id=t + 1, description="Revisar el informe trimestral",
+                            target_date=now if t % 2 else None, status=statuses[t % 4], priority=priorities[t % 4],
+                            assignee=f"user{t % 50}") for t in range(size)],
+                next_cursor="eyJpZCI6IDF9")
+
+if __name__ == "__main__":
+    pages = {size: make_page(size) for size in SIZES}
+    app = FastAPI()
+
+    @app.get("/validated/{size}", response_model=TaskPage)
+    async def validated(size: int):
+        return pages[size]
+
+    @app.get("/fast/{size}", response_model=TaskPage)
+    async def fast(size: int):
+        return EntityJSONResponse(pages[size], TASK_PAGE_JSON)
+
+    client = TestClient(app)
+    for size in SIZES:
+        assert client.get(f"/validated/{size}").json() == client.get(f"/fast/{size}").json()
+        print(f"{size} tasks")
+        for route in ("validated", "fast"):
+            samples: List[float] = []
+            for _ in range(RUNS[size]):
+                with timer(samples):
+                    client.get(f"/{route}/{size}")
+            print(f"  {route:10s} {summary(samples)}")
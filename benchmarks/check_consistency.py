@@ -0,0 +1,266 @@
+"""
+Comprueba invariantes de consistencia de las escrituras a través de la API (SQLite en un fichero temporal):
+
+* ajustar o reconciliar los contadores por estado no cambia el updated_at de la épica o el proyecto padre;
+* PATCH /epics/bulk solo escribe los campos que trae cada elemento;
+* borrar una épica borra sus tareas (claves foráneas activadas también en SQLite);
+* una lectura concurrente entre la escritura y el COMMIT no deja en la caché la versión anterior de la épica;
+* lo archivado llega a /sync como borrado y sale de la caché, y el archivo no se lleva una tarea abierta de una
+  épica COMPLETED antigua;
+* include_archived lista una épica viva con todas sus tareas archivadas, y un padre que no existe es un 404;
+* crear una tarea en una épica que ya no existe (aunque siga en caché) es un 400;
+* /sync espera ante un hueco reciente en la secuencia y salta uno que ninguna transacción abierta retiene;
+* purgar change_log borra un prefijo contiguo de la secuencia, y un cursor anterior a lo que queda recibe resync.
+
+Termina con código de salida 1 si alguna comprobación falla.
+
+    uv run python -m benchmarks.check_consistency
+"""
+import datetime
+import os
+import sys
+import tempfile
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'consistency.db')}")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import delete, func, select, update
+import main
+from src.infrastructure.adapters.api.dependencies import epic_repository
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.entity_cache import get_cache
+from src.infrastructure.repositories.archive import archive_completed
+from src.infrastructure.repositories.change_log import prune_change_log
+from src.infrastructure.models import ChangeLogModel, EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.counters import reconcile_counters
+
+client = TestClient(main.app, raise_server_exceptions=False)
+Check = Callable[[], Tuple[bool, str]]
+checks: List[Check] = []
+
+def check(function: Check) -> Check:
+    checks.append(function)
+    return function
+
+def scalar(statement):
+    with SessionLocal() as session:
+        return session.execute(statement).scalar()
+
+def create_board(name: str) -> Tuple[int, int]:
+    project = client.post("/projects/", json={"name": name}).json()
+    epic = client.post("/epics/", json={"name": f"{name} epic", "project_id": project["id"]}).json()
+    return project["id"], epic["id"]
+
+@check
+def child_writes_keep_parent_updated_at() -> Tuple[bool, str]:
+    project_id, epic_id = create_board("Counters")
+    epic_before = scalar(select(EpicModel.updated_at).where(EpicModel.id == epic_id))
+    project_before = scalar(select(ProjectModel.updated_at).where(ProjectModel.id == project_id))
+    task = client.post("/tasks/", json={"name": "Counted task", "epic_id": epic_id}).json()
+    client.put(f"/tasks/{task['id']}", json={"status": "done"})
+    client.delete(f"/tasks/{task['id']}")
+    client.post("/epics/", json={"name": "Sibling epic", "project_id": project_id})
+    epic_after = scalar(select(EpicModel.updated_at).where(EpicModel.id == epic_id))
+    project_after = scalar(select(ProjectModel.updated_at).where(ProjectModel.id == project_id))
+    return (epic_before == epic_after and project_before == project_after,
+            "task/epic writes leave the parent's updated_at unchanged")
+
+@check
+def reconcile_keeps_updated_at() -> Tuple[bool, str]:
+    _, epic_id = create_board("Reconcile")
+    before = scalar(select(EpicModel.updated_at).where(EpicModel.id == epic_id))
+    with SessionLocal() as session:
+        session.execute(update(EpicModel.__table__).where(EpicModel.id == epic_id)
+                        .values(tasks_to_do=7, updated_at=EpicModel.__table__.c.updated_at))
+        fixed = reconcile_counters(session)
+        session.commit()
+    after = scalar(select(EpicModel.updated_at).where(EpicModel.id == epic_id))
+    return fixed["epics"] == 1 and before == after, "reconcile_counters fixes drift without touching updated_at"
+
+@check
+def bulk_patch_writes_only_sent_fields() -> Tuple[bool, str]:
+    project_id, epic_id = create_board("Bulk patch")
+    other = client.post("/epics/", json={"name": "Bulk patch renamed", "project_id": project_id}).json()
+    with SessionLocal() as session:
+        session.execute(update(EpicModel.__table__).where(EpicModel.id.in_([epic_id, other["id"]]))
+                        .values(start_date=None, description="kept"))
+        session.commit()
+    patched = client.patch("/epics/bulk", json={"items": [{"id": epic_id, "status": "in_progress"},
+                                                          {"id": other["id"], "name": "Bulk patch other"}]})
+    with SessionLocal() as session:
+        rows = session.execute(select(EpicModel.id, EpicModel.start_date, EpicModel.description, EpicModel.name,
+                                      EpicModel.status).where(EpicModel.id.in_([epic_id, other["id"]]))
+                               .order_by(EpicModel.id)).all()
+    return (patched.status_code == 200 and not patched.json()["errors"]
+            and [(row.start_date, row.description) for row in rows] == [(None, "kept")] * 2
+            and rows[0].status.name == "IN_PROGRESS" and rows[1].name == "Bulk patch other",
+            "PATCH /epics/bulk writes only the fields each item sends (a NULL start_date stays NULL)")
+
+@check
+def epic_delete_cascades_to_tasks() -> Tuple[bool, str]:
+    _, epic_id = create_board("Cascade")
+    client.post("/tasks/bulk", json={"items": [{"epic_id": epic_id, "name": f"cascade {t}"} for t in range(50)]})
+    deleted = client.delete(f"/epics/{epic_id}").status_code == 204
+    orphans = scalar(select(func.count()).select_from(TaskModel).where(TaskModel.epic_id == epic_id))
+    return deleted and orphans == 0, "deleting an epic deletes its tasks (no orphan rows)"
+
+@check
+def concurrent_read_does_not_recache_old_row() -> Tuple[bool, str]:
+    _, epic_id = create_board("Race")
+    with SessionLocal() as writer, SessionLocal() as reader:
+        epic = epic_repository(writer).get_by_id(epic_id)
+        epic.name = "Race epic renamed"
+        epic_repository(writer).update(epic_id, epic)
+        # Otra petición falla la caché antes del COMMIT, lee la fila confirmada (la anterior) y la guarda
+        stale = epic_repository(reader).get_by_id(epic_id).name
+        writer.commit()
+    with SessionLocal() as session:
+        cached = epic_repository(session).get_by_id(epic_id).name
+    return (stale == "Race epic" and cached == "Race epic renamed",
+            "a read between the write and the commit does not leave the old epic cached")
+
+def sync_cursor(since: str = "") -> dict:
+    body = client.get("/sync/", params={"since": since, "limit": 5000} if since else {"limit": 5000}).json()
+    while body["has_more"]:
+        body = client.get("/sync/", params={"since": body["next_cursor"], "limit": 5000}).json()
+    return body
+
+@check
+def archived_rows_reach_sync_and_leave_cache() -> Tuple[bool, str]:
+    project_id, epic_id = create_board("Archive")
+    task = client.post("/tasks/", json={"name": "Archived task", "epic_id": epic_id}).json()
+    # La fila con el ID más alto de cada tabla nunca se archiva
+    newest = client.post("/epics/", json={"name": "Archive newest epic", "project_id": project_id}).json()
+    client.post("/tasks/", json={"name": "Newest task", "epic_id": newest["id"]})
+    client.get(f"/epics/{epic_id}") # queda en caché
+    cursor = sync_cursor()["next_cursor"]
+    long_ago = datetime.datetime.now() - datetime.timedelta(days=365)
+    with SessionLocal() as session:
+        session.execute(update(EpicModel.__table__).where(EpicModel.id == epic_id)
+                        .values(status="COMPLETED", updated_at=long_ago))
+        session.execute(update(TaskModel.__table__).where(TaskModel.id == task["id"])
+                        .values(status="DONE", updated_at=long_ago))
+        session.commit()
+        archive_completed(session, datetime.datetime.now() - datetime.timedelta(days=1))
+    changes = client.get("/sync/", params={"since": cursor}).json()
+    archived = client.get(f"/tasks/epic-tasks/{epic_id}", params={"include_archived": "true"})
+    return (epic_id in changes["deleted_epics"] and task["id"] in changes["deleted_tasks"]
+            and get_cache("epics").get(epic_id) is None
+            and archived.status_code == 200 and [t["id"] for t in archived.json()] == [task["id"]],
+            "archiving records deletions for /sync and invalidates the cached epic (still listed with include_archived)")
+
+@check
+def open_work_under_old_completed_epic_stays() -> Tuple[bool, str]:
+    project_id, epic_id = create_board("Open work")
+    old_done = client.post("/tasks/", json={"name": "Old done task", "epic_id": epic_id}).json()
+    open_task = client.post("/tasks/", json={"name": "Open task", "epic_id": epic_id}).json()
+    newest = client.post("/epics/", json={"name": "Open work newest epic", "project_id": project_id}).json()
+    client.post("/tasks/", json={"name": "Newest task", "epic_id": newest["id"]})
+    long_ago = datetime.datetime.now() - datetime.timedelta(days=365)
+    with SessionLocal() as session:
+        session.execute(update(ProjectModel.__table__).where(ProjectModel.id == project_id)
+                        .values(status="COMPLETED", updated_at=long_ago))
+        session.execute(update(EpicModel.__table__).where(EpicModel.id == epic_id)
+                        .values(status="COMPLETED", updated_at=long_ago))
+        session.execute(update(TaskModel.__table__).where(TaskModel.id == old_done["id"])
+                        .values(status="DONE", updated_at=long_ago))
+        session.commit()
+        archive_completed(session, datetime.datetime.now() - datetime.timedelta(days=1))
+    listed = [task["id"] for task in
+              client.get("/tasks/", params={"status": "to_do", "epic_id": epic_id}).json()["items"]]
+    live_epic = scalar(select(func.count()).select_from(EpicModel).where(EpicModel.id == epic_id))
+    live_project = scalar(select(func.count()).select_from(ProjectModel).where(ProjectModel.id == project_id))
+    archived_done = scalar(select(func.count()).select_from(TaskModel).where(TaskModel.id == old_done["id"])) == 0
+    return (open_task["id"] in listed and live_epic == 1 and live_project == 1 and archived_done,
+            "an open task keeps its old COMPLETED epic and project live (only its DONE siblings are archived)")
+
+@check
+def include_archived_lists_live_parent_with_archived_children() -> Tuple[bool, str]:
+    project_id, epic_id = create_board("Archived children")
+    task = client.post("/tasks/", json={"name": "Only task", "epic_id": epic_id}).json()
+    newest = client.post("/epics/", json={"name": "Archived children newest epic", "project_id": project_id}).json()
+    client.post("/tasks/", json={"name": "Newest task", "epic_id": newest["id"]})
+    with SessionLocal() as session:
+        session.execute(update(TaskModel.__table__).where(TaskModel.id == task["id"])
+                        .values(status="DONE", updated_at=datetime.datetime.now() - datetime.timedelta(days=365)))
+        session.commit()
+        archive_completed(session, datetime.datetime.now() - datetime.timedelta(days=1))
+    listed = client.get(f"/tasks/epic-tasks/{epic_id}", params={"include_archived": "true"})
+    empty_project = client.post("/projects/", json={"name": "Archived children empty"}).json()
+    epics = client.get(f"/epics/project-epic/{empty_project['id']}", params={"include_archived": "true"})
+    missing = [client.get(f"/tasks/epic-tasks/{10 ** 9}", params={"include_archived": archived}).status_code
+               for archived in ("true", "false")]
+    missing += [client.get(f"/epics/project-epic/{10 ** 9}", params={"include_archived": archived}).status_code
+                for archived in ("true", "false")]
+    return (listed.status_code == 200 and [t["id"] for t in listed.json()] == [task["id"]]
+            and epics.status_code == 200 and epics.json() == [] and missing == [404] * 4,
+            "include_archived lists a live parent whose children are all archived; an unknown parent is a 404")
+
+@check
+def child_of_missing_cached_parent_is_rejected() -> Tuple[bool, str]:
+    _, epic_id = create_board("Stale parent")
+    client.get(f"/epics/{epic_id}") # queda en caché
+    with SessionLocal() as session:
+        # Como si otro proceso la hubiera archivado sin llegar a la caché de este worker
+        session.execute(delete(EpicModel.__table__).where(EpicModel.id == epic_id))
+        session.commit()
+    single = client.post("/tasks/", json={"name": "Stale task", "epic_id": epic_id}).status_code
+    bulk = client.post("/tasks/bulk", json={"items": [{"name": "Stale bulk task", "epic_id": epic_id}]})
+    return (single == 400 and bulk.status_code in (200, 400) and bulk.status_code != 500,
+            "creating a task in an epic that no longer exists (but is cached) is a 400, not a 500")
+
+@check
+def sync_waits_for_recent_gap_only() -> Tuple[bool, str]:
+    _, epic_id = create_board("Gap")
+    cursor = sync_cursor()["next_cursor"]
+    last = scalar(select(func.max(ChangeLogModel.seq)))
+    with SessionLocal() as session:
+        # Un hueco de dos números, como el que deja una transacción deshecha, seguido de un cambio reciente
+        session.add(ChangeLogModel(seq=last + 3, entity_type="epic", entity_id=epic_id, operation="upsert"))
+        session.commit()
+    waiting = client.get("/sync/", params={"since": cursor}).json()
+    with SessionLocal() as session:
+        session.execute(update(ChangeLogModel.__table__).where(ChangeLogModel.seq == last + 3)
+                        .values(changed_at=datetime.datetime.now() - datetime.timedelta(minutes=1)))
+        session.commit()
+    settled = client.get("/sync/", params={"since": cursor}).json()
+    return (waiting["next_cursor"] == cursor and epic_id not in [e["id"] for e in waiting["epics"]]
+            and settled["next_cursor"] != cursor and epic_id in [e["id"] for e in settled["epics"]],
+            "/sync stops before a recent sequence gap and skips it once no open transaction can fill it")
+
+@check
+def pruned_cursor_gets_resync() -> Tuple[bool, str]:
+    # El cliente se quedó antes del tablero, cuyos cambios se purgan
+    stale_cursor = sync_cursor()["next_cursor"]
+    _, epic_id = create_board("Retention")
+    last_before = scalar(select(func.max(ChangeLogModel.seq)))
+    expired = scalar(select(func.count()).select_from(ChangeLogModel))
+    task = client.post("/tasks/", json={"name": "Retained task", "epic_id": epic_id}).json()
+    client.put(f"/tasks/{task['id']}", json={"name": "Retained task renamed", "epic_id": epic_id})
+    current_cursor = sync_cursor(stale_cursor)["next_cursor"]
+    newest = scalar(select(func.max(ChangeLogModel.seq)))
+    long_ago = datetime.datetime.now() - datetime.timedelta(days=365)
+    with SessionLocal() as session:
+        # Todo lo anterior a la tarea queda fuera de la retención, y también la última entrada (que no es contigua)
+        session.execute(update(ChangeLogModel.__table__)
+                        .where((ChangeLogModel.seq <= last_before) | (ChangeLogModel.seq == newest))
+                        .values(changed_at=long_ago))
+        session.commit()
+        pruned = prune_change_log(session, datetime.datetime.now() - datetime.timedelta(days=1), batch_size=7)
+    resync = client.get("/sync/", params={"since": stale_cursor}).json()
+    replay = client.get("/sync/", params={"since": resync["next_cursor"]}).json()
+    current = client.get("/sync/", params={"since": current_cursor}).json()
+    return (pruned == expired and scalar(select(func.min(ChangeLogModel.seq))) == last_before + 1
+            and scalar(select(func.count()).select_from(ChangeLogModel).where(ChangeLogModel.seq == newest)) == 1
+            and resync["resync"] and not resync["tasks"] and not replay["resync"]
+            and task["id"] in [t["id"] for t in replay["tasks"]] and not current["resync"],
+            "pruning removes a contiguous prefix of change_log and a cursor older than it gets resync")
+
+if __name__ == "__main__":
+    failures = 0
+    for function in checks:
+        ok, description = function()
+        failures += not ok
+        print(f"  {'ok  ' if ok else 'FAIL'} {description}")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,75 @@
+"""
+Comprueba que las lecturas jerárquicas hacen un número fijo de consultas, sea cual sea el tamaño de los datos,
+y que con la estrategia por defecto (RAISE) recorrer una relación sin cargarla falla en lugar de hacer N+1.
+Termina con código de salida 1 si alguna comprobación falla.
+
+    uv run python -m benchmarks.check_query_counts
+"""
+import sys
+from typing import Callable, List
+from sqlalchemy import event, insert
+from sqlalchemy.exc import InvalidRequestError
+from src.app.services.board_service import BoardService
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.loading import LoadingStrategy
+from src.infrastructure.repositories.sqlalchemy_epic_repository import SQLAlchemyEpicRepository
+from src.infrastructure.repositories.sqlalchemy_project_repository import SQLAlchemyProjectRepository
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from benchmarks._common import make_engine, make_session_factory
+
+# (épicas, tareas por épica)
+SIZES = ((1, 1), (10, 10), (50, 100))
+EXPECTED = {LoadingStrategy.SELECTIN: 3, LoadingStrategy.JOINED: 1}
+
+def seed(session, epics: int, tasks: int) -> None:
+    session.execute(insert(ProjectModel), [{"name": "board", "name_normalized": "board"}])
+    session.execute(insert(EpicModel), [{"project_id": 1, "name": f"epic-{e}", "name_normalized": f"epic-{e}"}
+                                        for e in range(epics)])
+    session.execute(insert(TaskModel), [{"epic_id": e + 1, "name": f"task-{t}", "name_normalized": f"task-{t}"}
+                                        for e in range(epics) for t in range(tasks)])
+    session.commit()
+
+def count_statements(engine, call: Callable[[], object]) -> int:
+    statements: List[str] = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        call()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return len(statements)
+
+def board_service(session, loading: LoadingStrategy) -> BoardService:
+    return BoardService(SQLAlchemyProjectRepository(session, loading=loading), SQLAlchemyEpicRepository(session),
+                        SQLAlchemyTaskRepository(session))
+
+if __name__ == "__main__":
+    failures = 0
+    for epics, tasks in SIZES:
+        engine = make_engine()
+        session_factory = make_session_factory(engine)
+        with session_factory() as session:
+            seed(session, epics, tasks)
+
+        for loading, expected in EXPECTED.items():
+            with session_factory() as session:
+                service = board_service(session, loading)
+                count = count_statements(engine, lambda: service.get_project_board(1))
+            with session_factory() as session:
+                service = board_service(session, loading)
+                limited = count_statements(engine, lambda: service.get_project_board(1, limit_per_column=5))
+            ok = count == expected and limited == 3
+            failures += not ok
+            print(f"  {'ok  ' if ok else 'FAIL'} board {epics:>3} epics x {tasks:>3} tasks, {loading.value:>8}: "
+                  f"{count} queries (expected {expected}), limit_per_column: {limited} (expected 3)")
+
+        with session_factory() as session:
+            try:
+                board_service(session, LoadingStrategy.RAISE).get_project_board(1)
+                print("  FAIL raise: traversing an unloaded relationship did not raise")
+                failures += 1
+            except InvalidRequestError:
+                print(f"  ok   raise: traversing an unloaded relationship raises ({epics} epics)")
+        engine.dispose()
+
+    sys.exit(1 if failures else 0)
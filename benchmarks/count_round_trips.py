@@ -0,0 +1,57 @@
+"""
+Cuenta los viajes a la base de datos (sentencias SQL + COMMIT) que hace cada endpoint de escritura.
+
+    uv run python -m benchmarks.count_round_trips
+"""
+import os
+import sys
+import tempfile
+from typing import Callable, List, Tuple
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'round_trips.db')}")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+import main
+from src.infrastructure.database import engine
+
+round_trips: List[str] = []
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    round_trips.append(statement.split()[0].upper())
+
+@event.listens_for(engine, "commit")
+def _count_commit(conn):
+    round_trips.append("COMMIT")
+
+def measure(label: str, call: Callable[[], object]) -> Tuple[str, int, str]:
+    round_trips.clear()
+    response = call()
+    status = getattr(response, "status_code", "?")
+    return label, len(round_trips), f"{status} {' '.join(round_trips)}"
+
+if __name__ == "__main__":
+    client = TestClient(main.app, raise_server_exceptions=False)
+    # Datos previos para que las operaciones tengan padre y objetivo
+    client.post("/projects/", json={"name": "Seed project"})
+    client.post("/projects/", json={"name": "Spare project"})
+    client.post("/epics/", json={"name": "Seed epic", "project_id": 1})
+    client.post("/epics/", json={"name": "Spare epic", "project_id": 1})
+    client.post("/tasks/", json={"name": "Seed task", "epic_id": 1})
+
+    results = [
+        measure("POST /projects/", lambda: client.post("/projects/", json={"name": "New project"})),
+        measure("PUT /projects/{id}", lambda: client.put("/projects/1", json={"name": "Renamed project"})),
+        measure("DELETE /projects/{id}", lambda: client.delete("/projects/2")),
+        measure("POST /epics/", lambda: client.post("/epics/", json={"name": "New epic", "project_id": 1})),
+        measure("PUT /epics/{id}", lambda: client.put("/epics/1", json={"name": "Renamed epic", "project_id": 1})),
+        measure("DELETE /epics/{id}", lambda: client.delete("/epics/2")),
+        measure("POST /tasks/", lambda: client.post("/tasks/", json={"name": "New task", "epic_id": 1})),
+        measure("PUT /tasks/{id}", lambda: client.put("/tasks/1", json={"name": "Renamed task", "epic_id": 1})),
+        measure("DELETE /tasks/{id}", lambda: client.delete("/tasks/2")),
+    ]
+    width = max(len(label) for label, _, _ in results)
+    for label, count, detail in results:
+        print(f"{label:<{width}}  {count:>2}  {detail}")
+    sys.exit(0)
@@ -1,4 +1,4 @@
-import type { Project, ProjectCreate } from '../types';
+import type { Page, Project, ProjectCreate } from '../types';
 
 const BASE_URL = 'http://127.0.0.1:8000';
 
@@ -11,7 +11,9 @@ export const getProjects = async (): Promise<Project[]> => {
     throw new Error('Error al obtener los proyectos');
   }
 
-  return await response.json(); // Convertimos la respuesta cruda a JSON
+  // La API devuelve una página ({ items, next_cursor }); nos quedamos con los elementos
+  const page: Page<Project> = await response.json();
+  return page.items;
 };
 
 // Función para crear un proyecto nuevo
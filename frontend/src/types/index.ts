@@ -7,4 +7,9 @@ export interface ProjectCreate {
 export interface Project extends ProjectCreate {
   id: number;
   created_at?: string; 
-}
\ No newline at end of file
+}
+
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
@@ -1,15 +1,37 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from src.infrastructure.database import engine, Base
-from src.infrastructure.adapters.api.routers import project_router, epic_router, task_router
+from src.infrastructure.async_database import DATABASE_ASYNC, get_async_engine, dispose_async_engine
+from src.infrastructure.adapters.api.compression import CompressionMiddleware
+from src.infrastructure.adapters.api.instrumentation import InstrumentationMiddleware
+from src.infrastructure.adapters.api.routers import project_router, epic_router, task_router, metrics_router, sync_router, events_router, search_router, assignee_router, export_router
+from src.infrastructure.config.settings import settings
+from src.infrastructure.jobs.overdue_scheduler import start_scheduler
+from src.infrastructure import search_index # noqa: F401 - registra la creación de los índices de texto completo tras create_all
 
 # 1. Crear las tablas en la base de datos (si no existen)
-Base.metadata.create_all(bind=engine)
+# En modo asíncrono se crean con el engine async al arrancar (ver lifespan)
+if not DATABASE_ASYNC:
+    Base.metadata.create_all(bind=engine)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if DATABASE_ASYNC:
+        async with get_async_engine().begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    # Avisos de tareas vencidas en segundo plano (en un solo worker si hay varios)
+    scheduler = start_scheduler() if settings.overdue_scheduler_enabled else None
+    yield
+    if scheduler is not None:
+        scheduler.cancel()
+    await dispose_async_engine()
 
 app = FastAPI(
     title="Kanban API",
     description="API para gestionar Proyectos, Épicas y Tareas",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # --- 2. CONFIGURACIÓN DE CORS ---
@@ -25,12 +47,37 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],        # Permitir todos los métodos (GET, POST, PUT, DELETE)
     allow_headers=["*"],        # Permitir todas las cabeceras
+    expose_headers=["ETag", "Last-Modified", "Server-Timing"], # Validadores de las peticiones condicionales y tiempos
 )
 
+# Compresión de las respuestas grandes (listados, tablero, exportación sin gzip) según el Accept-Encoding del cliente
+if settings.compression_enabled:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.compression_min_size,
+        encodings=[encoding.strip() for encoding in settings.compression_encodings.split(",") if encoding.strip()],
+        gzip_level=settings.compression_gzip_level,
+    )
+
+# Latencia y sentencias SQL de cada petición (GET /metrics). Se añade la última para que sea la más externa y su
+# medida incluya la compresión
+if settings.instrumentation_enabled:
+    app.add_middleware(
+        InstrumentationMiddleware,
+        server_timing=settings.server_timing_enabled,
+        n_plus_one_threshold=settings.n_plus_one_threshold,
+    )
+
 # 2. Registrar los routers
 app.include_router(project_router.router)
 app.include_router(epic_router.router)
 app.include_router(task_router.router)
+app.include_router(metrics_router.router)
+app.include_router(sync_router.router)
+app.include_router(events_router.router)
+app.include_router(search_router.router)
+app.include_router(assignee_router.router)
+app.include_router(export_router.router)
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List
+from src.domain.entities.task import TaskStatus
+from src.app.schemas.project_schema import ProjectResponse
+from src.app.schemas.epic_schema import EpicResponse
+from src.app.schemas.task_schema import TaskResponse
+
+class BoardColumnResponse(BaseModel):
+    status: TaskStatus
+    count: int # Total de tareas en la columna, aunque se haya limitado la lista
+    tasks: List[TaskResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class EpicBoardResponse(BaseModel):
+    epic: EpicResponse
+    columns: List[BoardColumnResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectBoardResponse(BaseModel):
+    project: ProjectResponse
+    epics: List[EpicBoardResponse]
+
+    class Config:
+        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
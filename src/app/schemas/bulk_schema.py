@@ -0,0 +1,24 @@
+from pydantic import BaseModel, Field
+from typing import List
+
+# Máximo de elementos por petición masiva
+MAX_BULK_ITEMS = 10_000
+
+class BulkItemErrorResponse(BaseModel):
+    index: int # Posición del elemento en la petición
+    message: str
+
+    class Config:
+        from_attributes = True
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class BulkDeleteResponse(BaseModel):
+    items: List[int] # IDs eliminados
+    errors: List[BulkItemErrorResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -1,7 +1,8 @@
 import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from src.domain.entities.epic import EpicStatus, EpicPriority
+from src.app.schemas.bulk_schema import BulkItemErrorResponse, MAX_BULK_ITEMS
 
 class EpicCreate(BaseModel):
     project_id: int
@@ -26,4 +27,40 @@ class EpicResponse(BaseModel):
     priority: EpicPriority = EpicPriority.LOW
 
     class Config:
-        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
\ No newline at end of file
+        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
+
+
+class EpicPage(BaseModel):
+    items: List[EpicResponse]
+    next_cursor: Optional[str] = None # Cursor para pedir la siguiente página, None si es la última
+
+    class Config:
+        from_attributes = True
+
+
+class EpicBulkCreate(BaseModel):
+    items: List[EpicCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class EpicBulkUpdateItem(BaseModel):
+    # Solo se modifican los campos enviados (PATCH); el proyecto de una épica no cambia
+    id: int
+    name: Optional[str] = Field(None, min_length=3, max_length=100)
+    description: Optional[str] = None
+    start_date: Optional[datetime.datetime] = None
+    end_date: Optional[datetime.datetime] = None
+    completion_criteria: Optional[str] = None
+    status: Optional[EpicStatus] = None
+    priority: Optional[EpicPriority] = None
+
+
+class EpicBulkUpdate(BaseModel):
+    items: List[EpicBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class EpicBulkResponse(BaseModel):
+    items: List[EpicResponse] # Épicas creadas o actualizadas
+    errors: List[BulkItemErrorResponse] = []
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,6 @@
 import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from src.domain.entities.project import ProjectStatus
 
 class ProjectCreate(BaseModel):
@@ -24,4 +24,12 @@ class ProjectResponse(BaseModel):
     budget: Optional[float] = None
 
     class Config:
-        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
\ No newline at end of file
+        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
+
+
+class ProjectPage(BaseModel):
+    items: List[ProjectResponse]
+    next_cursor: Optional[str] = None # Cursor para pedir la siguiente página, None si es la última
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,23 @@
+from pydantic import BaseModel
+from typing import List, Optional
+from src.domain.entities.change import ChangeEntity
+
+class SearchHitResponse(BaseModel):
+    entity: ChangeEntity # project, epic o task
+    id: int
+    project_id: int
+    epic_id: Optional[int] = None # Solo en las tareas
+    name: str
+    description: Optional[str] = None
+    score: float # Relevancia: solo sirve para comparar resultados de la misma búsqueda
+
+    class Config:
+        from_attributes = True
+
+
+class SearchPage(BaseModel):
+    items: List[SearchHitResponse] # Los más relevantes primero
+    next_cursor: Optional[str] = None # Cursor para pedir la siguiente página, None si es la última
+
+    class Config:
+        from_attributes = True
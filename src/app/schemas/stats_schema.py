@@ -0,0 +1,58 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from src.domain.entities.task import TaskPriority, TaskStatus
+
+# Máximo de IDs en GET /epics/stats?ids=...: los IDs viajan en la URL y muchos servidores y proxies
+# rechazan URLs de más de ~8 KB. Para todas las épicas de un proyecto está GET /projects/{id}/stats
+MAX_STATS_IDS = 1_000
+
+class TaskStatsResponse(BaseModel):
+    total: int
+    done: int
+    progress: float # done / total, 0 si no hay tareas
+    overdue: int # No terminadas con target_date en el pasado
+    by_status: Dict[TaskStatus, int]
+    by_priority: Dict[TaskPriority, int]
+
+    class Config:
+        from_attributes = True
+
+
+class EpicStatsResponse(BaseModel):
+    epic_id: int
+    tasks: TaskStatsResponse
+
+    class Config:
+        from_attributes = True
+
+
+class EpicStatsList(BaseModel):
+    items: List[EpicStatsResponse]
+
+    class Config:
+        from_attributes = True
+
+
+class ProjectStatsResponse(BaseModel):
+    project_id: int
+    epics: int
+    tasks: TaskStatsResponse
+
+    class Config:
+        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
+
+
+class AssigneeWorkloadResponse(BaseModel):
+    assignee: str
+    tasks: TaskStatsResponse
+
+    class Config:
+        from_attributes = True
+
+
+class AssigneeWorkloadPage(BaseModel):
+    items: List[AssigneeWorkloadResponse] # Por orden alfabético
+    next_cursor: Optional[str] = None # Cursor para pedir la siguiente página, None si es la última
+
+    class Config:
+        from_attributes = True
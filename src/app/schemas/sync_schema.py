@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+from src.app.schemas.project_schema import ProjectResponse
+from src.app.schemas.epic_schema import EpicResponse
+from src.app.schemas.task_schema import TaskResponse
+
+class SyncResponse(BaseModel):
+    next_cursor: str # Se envía como "since" en la siguiente llamada; también cuando no hay cambios
+    has_more: bool # True si quedan cambios por leer: conviene volver a llamar enseguida
+    resync: bool # True si el cursor ya no está en el registro (purgado): recargar todo y seguir desde next_cursor
+    projects: List[ProjectResponse] # Creados o modificados desde el cursor, con su estado actual
+    epics: List[EpicResponse]
+    tasks: List[TaskResponse]
+    deleted_projects: List[int]
+    deleted_epics: List[int]
+    deleted_tasks: List[int]
@@ -1,7 +1,8 @@
 import datetime
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from src.domain.entities.task import TaskStatus, TaskPriority
+from src.app.schemas.bulk_schema import BulkItemErrorResponse, MAX_BULK_ITEMS
 
 class TaskCreate(BaseModel):
     epic_id: int
@@ -28,4 +29,60 @@ class TaskResponse(BaseModel):
     priority: TaskPriority = TaskPriority.LOW
 
     class Config:
-        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
\ No newline at end of file
+        from_attributes = True # Esto permite que Pydantic lea la Entidad de Dominio
+
+
+class TaskPage(BaseModel):
+    items: List[TaskResponse]
+    next_cursor: Optional[str] = None # Cursor para pedir la siguiente página, None si es la última
+
+    class Config:
+        from_attributes = True
+
+
+class TaskBulkCreate(BaseModel):
+    items: List[TaskCreate] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TaskBulkUpdateItem(BaseModel):
+    # Solo se modifican los campos enviados (PATCH); la épica de una tarea no cambia
+    id: int
+    name: Optional[str] = Field(None, min_length=3, max_length=100)
+    description: Optional[str] = None
+    target_date: Optional[datetime.datetime] = None
+    finalization_criteria: Optional[str] = None
+    finalization_date: Optional[datetime.datetime] = None
+    status: Optional[TaskStatus] = None
+    assignee: Optional[str] = None
+    priority: Optional[TaskPriority] = None
+
+
+class TaskBulkUpdate(BaseModel):
+    items: List[TaskBulkUpdateItem] = Field(..., min_length=1, max_length=MAX_BULK_ITEMS)
+
+
+class TaskBulkResponse(BaseModel):
+    items: List[TaskResponse] # Tareas creadas o actualizadas
+    errors: List[BulkItemErrorResponse] = []
+
+    class Config:
+        from_attributes = True
+
+
+class OverdueAlertResponse(BaseModel):
+    seq: int # Posición en el historial: se pasa como "since" para pedir solo los avisos posteriores
+    task_id: int
+    epic_id: int
+    name: str
+    status: TaskStatus
+    assignee: Optional[str] = None
+    target_date: datetime.datetime
+    detected_at: datetime.datetime
+
+    class Config:
+        from_attributes = True
+
+
+class OverdueAlertPage(BaseModel):
+    items: List[OverdueAlertResponse]
+    last_seq: int # Último aviso publicado hasta ahora (aunque no quepa en esta página)
@@ -0,0 +1,36 @@
+from typing import Optional
+from src.domain.entities.board import EpicBoard, ProjectBoard
+from src.domain.entities.version import Version
+from src.domain.repositories.project_repository import ProjectRepository
+from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.task_repository import TaskRepository
+
+class BoardService:
+    def __init__(self, project_repository: ProjectRepository, epic_repository: EpicRepository, task_repository: TaskRepository):
+        # Inyectamos la interfaz (Puerto), no la implementación
+        self.project_repository = project_repository
+        self.epic_repository = epic_repository
+        self.task_repository = task_repository
+
+    def get_project_board(self, project_id: int, limit_per_column: Optional[int] = None) -> ProjectBoard:
+        # Tres consultas como máximo, sea cual sea el tamaño del tablero
+        if limit_per_column is None:
+            # Tablero completo: lectura jerárquica proyecto -> épicas -> tareas con la estrategia de carga del repositorio
+            return self.project_repository.get_board(project_id)
+
+        # Columnas limitadas: proyecto, épicas y las primeras tareas de cada columna (con el total) de todas las épicas
+        # --- REGLA DE NEGOCIO 1: Verificar que el proyecto exista ---
+        project = self.project_repository.get_by_id(project_id)
+        if not project:
+            raise ValueError(f"The project with ID {project_id} does not exist.")
+
+        epics = self.epic_repository.list_by_project_id(project_id)
+        if not epics:
+            return ProjectBoard(project=project)
+
+        columns = self.task_repository.get_board_columns([epic.id for epic in epics], limit_per_column) # type: ignore[misc]
+        return ProjectBoard(project=project, epics=[EpicBoard(epic, columns[epic.id]) for epic in epics]) # type: ignore[index]
+
+    def get_board_version(self, project_id: int) -> Version:
+        # Una consulta agregada sobre proyecto, épicas y tareas: si el tablero no ha cambiado se responde 304 sin cargarlo
+        return self.project_repository.get_board_version(project_id)
@@ -1,13 +1,36 @@
-from typing import List, Optional
-from src.domain.entities.epic import Epic, EpicStatus
+import dataclasses
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.domain.entities.epic import Epic, EpicStatus, EpicPriority
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.bulk import BulkItemError, BulkResult
+from src.domain.entities.board_event import BoardEvent
+from src.domain.entities.change import ChangeEntity, ChangeOperation
 from src.domain.repositories.project_repository import ProjectRepository
 from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.domain.repositories.event_publisher import EventPublisher
+from src.domain.repositories.archive_repository import ArchiveRepository
+
+# Campos que ya no se pueden cambiar cuando la épica está COMPLETED (REGLA DE NEGOCIO 5)
+LOCKED_WHEN_COMPLETED = ("name", "description", "start_date", "end_date", "project_id")
 
 class EpicService:
-    def __init__(self, epic_repository: EpicRepository, project_repository: ProjectRepository):
+    def __init__(self, epic_repository: EpicRepository, project_repository: ProjectRepository, unit_of_work: UnitOfWork,
+                 event_publisher: EventPublisher, archive_repository: Optional[ArchiveRepository] = None):
         # Inyectamos la interfaz (Puerto), no la implementación
         self.epic_repository = epic_repository
         self.project_repository = project_repository
+        # Cada caso de uso que escribe confirma una única vez a través de la unidad de trabajo
+        self.unit_of_work = unit_of_work
+        # Tras confirmar, los cambios se notifican a quien esté viendo el tablero del proyecto
+        self.event_publisher = event_publisher
+        # Lecturas con include_archived: el trabajo terminado y antiguo se mueve a las tablas de archivo
+        self.archive_repository = archive_repository
+
+    def _publish(self, operation: ChangeOperation, epics: List[Tuple[int, int]]) -> None:
+        # epics: pares (epic_id, project_id). Borrar una épica borra sus tareas: el cliente las quita con ella
+        self.event_publisher.publish([BoardEvent(project_id, ChangeEntity.EPIC, epic_id, operation) for epic_id, project_id in epics])
 
     def create_epic(self, name: str, project_id: int, description: Optional[str] = None) -> Epic:
         # --- REGLA DE NEGOCIO 1: Verificar que el proyecto exista ---
@@ -16,19 +39,36 @@ class EpicService:
             raise ValueError(f"The project with ID {project_id} does not exist.")
 
         # --- REGLA DE NEGOCIO 2: No nombres duplicados dentro del mismo proyecto ---
-        existing_epics = self.epic_repository.get_by_project_id(project_id)
-        if any(e.name.lower() == name.lower() for e in existing_epics):
+        if self.epic_repository.exists_by_name(project_id, name):
             raise ValueError(f"The epic with name '{name}' already exists in project ID {project_id}.")
 
         # Creamos la entidad y la mandamos al "puerto"
         new_epic = Epic(name=name, project_id=project_id, description=description)
-        return self.epic_repository.add(new_epic)
+        with self.unit_of_work:
+            created = self.epic_repository.add(new_epic)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.UPSERT, [(created.id, created.project_id)]) # type: ignore[list-item]
+        return created
     
-    def get_epic_by_id(self, epic_id: int) -> Optional[Epic]:
+    def get_epic_by_id(self, epic_id: int, include_archived: bool = False) -> Optional[Epic]:
+        if include_archived and self.archive_repository:
+            # El repositorio lanza ValueError si la épica no está en la tabla viva: se busca en el archivo
+            try:
+                return self.epic_repository.get_by_id(epic_id)
+            except ValueError:
+                return self.archive_repository.get_epic_by_id(epic_id)
         return self.epic_repository.get_by_id(epic_id)
     
-    def get_all_epics(self) -> List[Epic]:
-        return self.epic_repository.get_all()
+    def list_epics(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                   status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                   project_id: Optional[int] = None) -> Page[Epic]:
+        return self.epic_repository.get_page(limit, cursor=cursor, order_by=order_by, status=status,
+                                             priority=priority, project_id=project_id)
+    
+    def get_epics_version(self, status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                          project_id: Optional[int] = None) -> Version:
+        # Para las peticiones condicionales: permite responder 304 sin cargar las épicas
+        return self.epic_repository.get_version(status=status, priority=priority, project_id=project_id)
     
     def update_epic(self, epic: Epic, epic_id: int) -> Epic:
         
@@ -38,10 +78,8 @@ class EpicService:
             raise ValueError(f"The epic with ID {epic_id} does not exist.")
         
         # --- REGLA DE NEGOCIO 4: No actualizar si el nombre ya existe (excepto para la misma épica) ---
-        existing_epics = self.epic_repository.get_by_project_id(existing_epic.project_id)
-        for e in existing_epics:
-            if e.name.lower() == epic.name.lower() and e.id != epic_id:
-                raise ValueError(f"The epic with name '{epic.name}' already exists in project ID {existing_epic.project_id}.")
+        if self.epic_repository.exists_by_name(existing_epic.project_id, epic.name, exclude_id=epic_id):
+            raise ValueError(f"The epic with name '{epic.name}' already exists in project ID {existing_epic.project_id}.")
         
         # --- REGLA DE NEGOCIO 5: No actualizar si la épica está COMPLETED, solo el estado ---
         if existing_epic.status == EpicStatus.COMPLETED:
@@ -50,8 +88,11 @@ class EpicService:
                 raise ValueError(f"The epic with ID {epic_id} cannot be updated because its status is COMPLETED.")
 
         # Actualizamos la épica
-        epic.id = epic_id
-        return self.epic_repository.update(epic)
+        with self.unit_of_work:
+            updated = self.epic_repository.update(epic_id, epic)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.UPSERT, [(epic_id, existing_epic.project_id)])
+        return updated
     
     def delete_epic(self, epic_id: int):
         # --- REGLA DE NEGOCIO 6: Verificar que la épica exista antes de eliminar ---
@@ -63,20 +104,141 @@ class EpicService:
         if existing_epic.status == EpicStatus.COMPLETED:
             raise ValueError(f"The epic with ID {epic_id} cannot be deleted because its status is COMPLETED.")
         
-        return self.epic_repository.delete(epic_id)
+        with self.unit_of_work:
+            deleted = self.epic_repository.delete(epic_id)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.DELETE, [(epic_id, existing_epic.project_id)])
+        return deleted
     
-    def get_epics_by_project_id(self, project_id: int) -> List[Epic]:
+    def get_epics_by_project_id(self, project_id: int, include_archived: bool = False) -> List[Epic]:
+        archive = self.archive_repository if include_archived else None
         #  --- REGLA DE NEGOCIO 8: Verificar que el proyecto exista ---
-        project = self.project_repository.get_by_id(project_id)
-        if not project:
-            raise ValueError(f"The project with ID {project_id} does not exist.")
-        
-        return self.epic_repository.get_by_project_id(project_id)
+        if not archive:
+            project = self.project_repository.get_by_id(project_id)
+            if not project:
+                raise ValueError(f"The project with ID {project_id} does not exist.")
+            return self.epic_repository.list_by_project_id(project_id)
+
+        # Con las archivadas: el proyecto puede estar vivo (con épicas en ambos sitios, o ya todas archivadas)
+        # o archivado (todas archivadas). El repositorio lanza ValueError si no está en la tabla viva
+        try:
+            self.project_repository.get_by_id(project_id)
+            epics = self.epic_repository.list_by_project_id(project_id)
+        except ValueError:
+            if not archive.get_project_by_id(project_id):
+                raise ValueError(f"The project with ID {project_id} does not exist.")
+            epics = []
+        return sorted(epics + archive.get_epics_by_project_id(project_id), key=lambda epic: epic.id) # type: ignore[arg-type, return-value]
     
-    def count_epics_by_project_id(self, project_id: int) -> int:
+    def count_epics_by_project_id(self, project_id: int, status: Optional[EpicStatus] = None) -> int:
         #  --- REGLA DE NEGOCIO 9: Verificar que el proyecto exista ---
         project = self.project_repository.get_by_id(project_id)
         if not project:
             raise ValueError(f"The project with ID {project_id} does not exist.")
         
-        return self.epic_repository.get_count_by_project_id(project_id)
\ No newline at end of file
+        return self.epic_repository.get_count_by_project_id(project_id, status=status)
+
+    # --- Operaciones masivas: las mismas reglas de negocio, comprobadas por conjuntos ---
+    # Cada elemento que no cumple una regla se informa en BulkResult.errors con su posición;
+    # el resto se guarda en una única transacción.
+
+    def bulk_create_epics(self, epics: List[Epic]) -> BulkResult[Epic]:
+        result: BulkResult[Epic] = BulkResult()
+        # --- REGLA DE NEGOCIO 1: los proyectos deben existir (una consulta para todos) ---
+        project_ids = {project.id for project in self.project_repository.get_by_ids({epic.project_id for epic in epics})}
+        # --- REGLA DE NEGOCIO 2: sin nombres duplicados en el proyecto (una consulta), ni dentro de la propia petición ---
+        taken = self.epic_repository.get_ids_by_names((epic.project_id, epic.name) for epic in epics)
+        seen: Set[Tuple[int, str]] = set()
+
+        valid: List[Epic] = []
+        for index, epic in enumerate(epics):
+            key = (epic.project_id, epic.name.lower())
+            if epic.project_id not in project_ids:
+                result.errors.append(BulkItemError(index, f"The project with ID {epic.project_id} does not exist."))
+            elif key in taken or key in seen:
+                result.errors.append(BulkItemError(index, f"The epic with name '{epic.name}' already exists in project ID {epic.project_id}."))
+            else:
+                seen.add(key)
+                valid.append(epic)
+
+        if valid:
+            with self.unit_of_work:
+                result.items = self.epic_repository.add_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.UPSERT, [(epic.id, epic.project_id) for epic in result.items]) # type: ignore[misc]
+        return result
+
+    def bulk_update_epics(self, changes: List[Tuple[int, Dict[str, Any]]]) -> BulkResult[Epic]:
+        result: BulkResult[Epic] = BulkResult()
+        # --- REGLA DE NEGOCIO 3: las épicas deben existir (una consulta para todas) ---
+        existing = {epic.id: epic for epic in self.epic_repository.get_by_ids(epic_id for epic_id, _ in changes)}
+        # --- REGLA DE NEGOCIO 4: los nombres nuevos no pueden estar en uso por otra épica del proyecto (una consulta) ---
+        taken = self.epic_repository.get_ids_by_names(
+            (existing[epic_id].project_id, fields["name"]) for epic_id, fields in changes
+            if epic_id in existing and "name" in fields)
+        seen_ids: Set[int] = set()
+        seen_names: Dict[Tuple[int, str], int] = {}
+
+        valid: List[Tuple[Epic, Set[str]]] = []
+        for index, (epic_id, fields) in enumerate(changes):
+            current = existing.get(epic_id)
+            if current is None:
+                result.errors.append(BulkItemError(index, f"The epic with ID {epic_id} does not exist."))
+                continue
+            if epic_id in seen_ids:
+                result.errors.append(BulkItemError(index, f"The epic with ID {epic_id} appears more than once in the request."))
+                continue
+            if "name" in fields:
+                key = (current.project_id, fields["name"].lower())
+                if taken.get(key, epic_id) != epic_id or seen_names.get(key, epic_id) != epic_id:
+                    result.errors.append(BulkItemError(index, f"The epic with name '{fields['name']}' already exists in project ID {current.project_id}."))
+                    continue
+            # --- REGLA DE NEGOCIO 5: una épica COMPLETED solo admite cambios de estado, prioridad y criterio ---
+            if current.status == EpicStatus.COMPLETED and any(
+                    field in fields and fields[field] != getattr(current, field) for field in LOCKED_WHEN_COMPLETED):
+                result.errors.append(BulkItemError(index, f"The epic with ID {epic_id} cannot be updated because its status is COMPLETED."))
+                continue
+
+            try:
+                # replace() vuelve a pasar por __post_init__ (p. ej. end_date posterior a start_date)
+                updated = dataclasses.replace(current, **fields)
+            except ValueError as e:
+                result.errors.append(BulkItemError(index, str(e)))
+                continue
+            seen_ids.add(epic_id)
+            if "name" in fields:
+                seen_names[(current.project_id, fields["name"].lower())] = epic_id
+            valid.append((updated, set(fields)))
+
+        if valid:
+            with self.unit_of_work:
+                result.items = self.epic_repository.update_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.UPSERT, [(epic.id, epic.project_id) for epic in result.items]) # type: ignore[misc]
+        return result
+
+    def bulk_delete_epics(self, epic_ids: List[int]) -> BulkResult[int]:
+        result: BulkResult[int] = BulkResult()
+        existing = {epic.id: epic for epic in self.epic_repository.get_by_ids(epic_ids)}
+
+        valid: List[int] = []
+        seen: Set[int] = set()
+        for index, epic_id in enumerate(epic_ids):
+            epic = existing.get(epic_id)
+            # --- REGLA DE NEGOCIO 6: la épica debe existir ---
+            if epic is None:
+                result.errors.append(BulkItemError(index, f"The epic with ID {epic_id} does not exist."))
+            # --- REGLA DE NEGOCIO 7: no borrar épicas COMPLETED ---
+            elif epic.status == EpicStatus.COMPLETED:
+                result.errors.append(BulkItemError(index, f"The epic with ID {epic_id} cannot be deleted because its status is COMPLETED."))
+            elif epic_id not in seen: # Los IDs repetidos se borran una sola vez
+                seen.add(epic_id)
+                valid.append(epic_id)
+
+        if valid:
+            with self.unit_of_work:
+                self.epic_repository.delete_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.DELETE, [(epic_id, existing[epic_id].project_id) for epic_id in valid])
+        result.items = valid
+        return result
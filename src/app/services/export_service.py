@@ -0,0 +1,35 @@
+from itertools import chain
+from typing import Iterator, Optional, Tuple, Union
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+from src.domain.entities.change import ChangeEntity
+from src.domain.repositories.export_repository import ExportRepository
+from src.domain.repositories.project_repository import ProjectRepository
+
+# Un elemento del volcado: su tipo y la entidad
+ExportRecord = Tuple[ChangeEntity, Union[Project, Epic, Task]]
+
+class ExportService:
+    def __init__(self, export_repository: ExportRepository, project_repository: ProjectRepository):
+        # Inyectamos la interfaz (Puerto), no la implementación
+        self.export_repository = export_repository
+        self.project_repository = project_repository
+
+    def _records(self, project_id: Optional[int]) -> Iterator[ExportRecord]:
+        # Perezoso: cada consulta empieza cuando se ha consumido la anterior (proyectos, épicas y tareas)
+        return chain(
+            ((ChangeEntity.PROJECT, project) for project in self.export_repository.stream_projects(project_id)),
+            ((ChangeEntity.EPIC, epic) for epic in self.export_repository.stream_epics(project_id)),
+            ((ChangeEntity.TASK, task) for task in self.export_repository.stream_tasks(project_id)),
+        )
+
+    def export_project(self, project_id: int) -> Iterator[ExportRecord]:
+        # --- REGLA DE NEGOCIO 1: Verificar que el proyecto exista (antes de empezar a enviar la respuesta) ---
+        project = self.project_repository.get_by_id(project_id)
+        if not project:
+            raise ValueError(f"The project with ID {project_id} does not exist.")
+        return self._records(project_id)
+
+    def export_all(self) -> Iterator[ExportRecord]:
+        return self._records(None)
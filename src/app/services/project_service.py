@@ -1,20 +1,37 @@
 from typing import List, Optional
 from datetime import datetime
 from src.domain.entities.project import Project, ProjectStatus
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.board_event import BoardEvent
+from src.domain.entities.change import ChangeEntity, ChangeOperation
 from src.domain.repositories.project_repository import ProjectRepository
 from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.domain.repositories.event_publisher import EventPublisher
+from src.domain.repositories.archive_repository import ArchiveRepository
 
 class ProjectService:
-    def __init__(self, project_repository: ProjectRepository, epic_repository: EpicRepository):
+    def __init__(self, project_repository: ProjectRepository, epic_repository: EpicRepository, unit_of_work: UnitOfWork,
+                 event_publisher: EventPublisher, archive_repository: Optional[ArchiveRepository] = None):
         # Inyectamos la interfaz (Puerto), no la implementación
         self.project_repository = project_repository
         self.epic_repository = epic_repository
+        # Cada caso de uso que escribe confirma una única vez a través de la unidad de trabajo
+        self.unit_of_work = unit_of_work
+        # Tras confirmar, los cambios se notifican a quien esté viendo el tablero del proyecto
+        self.event_publisher = event_publisher
+        # Lecturas con include_archived: el trabajo terminado y antiguo se mueve a las tablas de archivo
+        self.archive_repository = archive_repository
+
+    def _publish(self, operation: ChangeOperation, project_id: int) -> None:
+        self.event_publisher.publish([BoardEvent(project_id, ChangeEntity.PROJECT, project_id, operation)])
 
     def create_project(self, name: str, description: Optional[str] = None, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None, finalization_criteria: Optional[str] = None, status=ProjectStatus.ACTIVE, budget: Optional[float] = None) -> Project:
         # --- REGLA DE NEGOCIO 1: No nombres duplicados ---
-        # Se busca si ya existe un proyecto con ese nombre (ignorando mayúsculas/minúsculas)
-        existing_projects = self.project_repository.get_all()
-        if any(p.name.lower() == name.lower() for p in existing_projects):
+        # Se busca si ya existe un proyecto con ese nombre (ignorando mayúsculas/minúsculas) con una consulta indexada.
+        # El índice UNIQUE sigue cubriendo la carrera entre dos creaciones simultáneas.
+        if self.project_repository.exists_by_name(name):
             raise ValueError(f"The project with name '{name}' already exists.")
 
         # --- REGLA DE NEGOCIO 2: Validación de longitud ---
@@ -23,7 +40,11 @@ class ProjectService:
 
         # Creamos la entidad y la mandamos al "puerto"
         new_project = Project(name=name, description=description, start_date=start_date, end_date=end_date, finalization_criteria=finalization_criteria, status=status, budget=budget)
-        return self.project_repository.add(new_project)
+        with self.unit_of_work:
+            created = self.project_repository.add(new_project)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.UPSERT, created.id) # type: ignore[arg-type]
+        return created
 
     def delete_project(self, project_id: int):
         # --- REGLA DE NEGOCIO 3: No borrar si tiene épicas ---
@@ -35,13 +56,28 @@ class ProjectService:
         project = self.get_project_by_id(project_id)
         if project and project.status == ProjectStatus.COMPLETED:
             raise ValueError(f"The project with ID {project_id} cannot be deleted because its status is COMPLETED.")
-        return self.project_repository.delete(project_id)
+        with self.unit_of_work:
+            deleted = self.project_repository.delete(project_id)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.DELETE, project_id)
+        return deleted
     
-    def get_project_by_id(self, project_id: int) -> Optional[Project]:
+    def get_project_by_id(self, project_id: int, include_archived: bool = False) -> Optional[Project]:
+        if include_archived and self.archive_repository:
+            # El repositorio lanza ValueError si el proyecto no está en la tabla viva: se busca en el archivo
+            try:
+                return self.project_repository.get_by_id(project_id)
+            except ValueError:
+                return self.archive_repository.get_project_by_id(project_id)
         return self.project_repository.get_by_id(project_id)
     
-    def get_all_projects(self) -> List[Project]:
-        return self.project_repository.get_all()
+    def list_projects(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                      status: Optional[ProjectStatus] = None) -> Page[Project]:
+        return self.project_repository.get_page(limit, cursor=cursor, order_by=order_by, status=status)
+    
+    def get_projects_version(self, status: Optional[ProjectStatus] = None) -> Version:
+        # Para las peticiones condicionales: permite responder 304 sin cargar los proyectos
+        return self.project_repository.get_version(status=status)
     
     def update_project(self, project_id: int, project: Project) -> Project:
 
@@ -51,10 +87,8 @@ class ProjectService:
             raise ValueError(f"The project with ID {project_id} does not exist.")
         
         # --- REGLA DE NEGOCIO 6: No actualizar si el nombre ya existe (excepto para el mismo proyecto) ---
-        existing_projects = self.project_repository.get_all()
-        for p in existing_projects:
-            if p.name.lower() == project.name.lower() and p.id != project_id:
-                raise ValueError(f"The project with name '{project.name}' already exists.")
+        if self.project_repository.exists_by_name(project.name, exclude_id=project_id):
+            raise ValueError(f"The project with name '{project.name}' already exists.")
     
         # --- REGLA DE NEGOCIO 7: Validación de longitud al actualizar ---
         if len(project.name) < 3:
@@ -67,4 +101,8 @@ class ProjectService:
                 raise ValueError(f"The project with ID {project_id} cannot be updated because its status is COMPLETED.")
 
         # Actualizamos el proyecto
-        return self.project_repository.update(project_id, project)
\ No newline at end of file
+        with self.unit_of_work:
+            updated = self.project_repository.update(project_id, project)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.UPSERT, project_id)
+        return updated
\ No newline at end of file
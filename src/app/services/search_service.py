@@ -0,0 +1,25 @@
+from typing import Optional
+from src.domain.entities.change import ChangeEntity
+from src.domain.entities.page import Page
+from src.domain.entities.search import SearchHit
+from src.domain.repositories.search_repository import SearchRepository
+from src.domain.repositories.project_repository import ProjectRepository
+
+class SearchService:
+    def __init__(self, search_repository: SearchRepository, project_repository: ProjectRepository):
+        # Inyectamos la interfaz (Puerto), no la implementación
+        self.search_repository = search_repository
+        self.project_repository = project_repository
+
+    def search(self, text: str, entity: Optional[ChangeEntity] = None, project_id: Optional[int] = None,
+               limit: int = 20, cursor: Optional[str] = None) -> Page[SearchHit]:
+        # --- REGLA DE NEGOCIO 1: La búsqueda no puede estar vacía ---
+        if not text.strip():
+            raise ValueError("The search text cannot be empty.")
+
+        # --- REGLA DE NEGOCIO 2: Si se acota a un proyecto, el proyecto debe existir ---
+        if project_id is not None and not self.project_repository.get_by_id(project_id):
+            raise ValueError(f"The project with ID {project_id} does not exist.")
+
+        # La búsqueda y la relevancia las resuelve el índice de texto completo de la base de datos
+        return self.search_repository.search(text, entity=entity, project_id=project_id, limit=limit, cursor=cursor)
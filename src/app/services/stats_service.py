@@ -0,0 +1,44 @@
+from typing import List, Optional
+from src.domain.entities.page import Page
+from src.domain.entities.stats import AssigneeWorkload, EpicStats, ProjectStats, TaskStats
+from src.domain.repositories.project_repository import ProjectRepository
+from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.task_repository import TaskRepository
+
+class StatsService:
+    def __init__(self, project_repository: ProjectRepository, epic_repository: EpicRepository, task_repository: TaskRepository):
+        # Inyectamos la interfaz (Puerto), no la implementación
+        self.project_repository = project_repository
+        self.epic_repository = epic_repository
+        self.task_repository = task_repository
+
+    def get_project_stats(self, project_id: int) -> ProjectStats:
+        # --- REGLA DE NEGOCIO 1: Verificar que el proyecto exista ---
+        project = self.project_repository.get_by_id(project_id)
+        if not project:
+            raise ValueError(f"The project with ID {project_id} does not exist.")
+
+        # Agregados en la base de datos: nunca se cargan las tareas
+        return ProjectStats(project_id, epics=self.epic_repository.get_count_by_project_id(project_id),
+                            tasks=self.task_repository.get_stats_by_project_id(project_id))
+
+    def get_epic_stats(self, epic_id: int) -> EpicStats:
+        # --- REGLA DE NEGOCIO 2: Verificar que la épica exista ---
+        epic = self.epic_repository.get_by_id(epic_id)
+        if not epic:
+            raise ValueError(f"The epic with ID {epic_id} does not exist.")
+
+        stats = self.task_repository.get_stats_by_epic_ids([epic_id])
+        return EpicStats(epic_id, stats.get(epic_id, TaskStats()))
+
+    def get_epics_stats(self, epic_ids: List[int]) -> List[EpicStats]:
+        # Dos consultas para cualquier número de épicas: existencia y un único GROUP BY epic_id, status, priority.
+        # Los IDs que no existen se omiten de la respuesta
+        existing = {epic.id for epic in self.epic_repository.get_by_ids(epic_ids)}
+        stats = self.task_repository.get_stats_by_epic_ids(existing) # type: ignore[arg-type]
+        ordered = dict.fromkeys(epic_id for epic_id in epic_ids if epic_id in existing)
+        return [EpicStats(epic_id, stats.get(epic_id, TaskStats())) for epic_id in ordered]
+
+    def get_assignees_workload(self, limit: int, cursor: Optional[str] = None) -> Page[AssigneeWorkload]:
+        # Tareas por persona, estado y prioridad en un único GROUP BY; las tareas sin asignar no cuentan
+        return self.task_repository.get_workload_page(limit, cursor=cursor)
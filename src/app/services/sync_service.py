@@ -0,0 +1,72 @@
+import datetime
+from typing import Dict, List, Tuple
+from src.domain.entities.change import Change, ChangeEntity, ChangeOperation, ChangeSet
+from src.domain.repositories.change_log_repository import ChangeLogRepository
+from src.domain.repositories.project_repository import ProjectRepository
+from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.task_repository import TaskRepository
+
+# Un hueco en la secuencia puede ser una transacción que aún no ha hecho COMMIT (el autoincremental se reserva
+# al insertar) o una que se deshizo. La página se corta antes del hueco mientras la base de datos diga que alguna
+# transacción abierta puede confirmarlo (ChangeLogRepository.is_pending), dure lo que dure esa transacción.
+# Además se espera siempre este margen desde el cambio posterior, por si un número ya reservado aún no se ha insertado
+GAP_SETTLE_SECONDS = 5
+
+class SyncService:
+    def __init__(self, change_log_repository: ChangeLogRepository, project_repository: ProjectRepository,
+                 epic_repository: EpicRepository, task_repository: TaskRepository):
+        # Inyectamos la interfaz (Puerto), no la implementación
+        self.change_log_repository = change_log_repository
+        self.project_repository = project_repository
+        self.epic_repository = epic_repository
+        self.task_repository = task_repository
+
+    def _settled(self, since: int, changes: List[Change]) -> List[Change]:
+        # Devuelve el prefijo de cambios que ya no puede verse adelantado por una transacción en curso
+        settle_limit = datetime.datetime.now() - datetime.timedelta(seconds=GAP_SETTLE_SECONDS)
+        previous = since
+        for position, change in enumerate(changes):
+            if change.seq != previous + 1 and (change.changed_at > settle_limit
+                                               or self.change_log_repository.is_pending(previous, change.seq)):
+                return changes[:position]
+            previous = change.seq
+        return changes
+
+    def get_changes(self, since: int, limit: int) -> ChangeSet:
+        if limit < 1:
+            raise ValueError("Limit must be greater than 0")
+
+        # Un cursor anterior a la primera entrada que queda puede haberse saltado entradas ya purgadas: no se
+        # continúa, el cliente recarga todo y sigue desde el principio de lo que queda (se repiten cambios, no se pierden)
+        first_seq = self.change_log_repository.get_first_seq()
+        if first_seq is not None and since < first_seq - 1:
+            return ChangeSet(last_seq=first_seq - 1, has_more=True, resync=True)
+
+        # Pedimos un cambio de más para saber si hay otra página
+        changes = self.change_log_repository.get_since(since, limit + 1)
+        has_more = len(changes) > limit
+        page = self._settled(since, changes[:limit])
+        has_more = has_more or len(page) < len(changes[:limit])
+
+        # Solo cuenta la última operación de cada entidad dentro de la página
+        latest: Dict[Tuple[ChangeEntity, int], ChangeOperation] = {}
+        for change in page:
+            latest[(change.entity, change.entity_id)] = change.operation
+
+        upserts: Dict[ChangeEntity, List[int]] = {entity: [] for entity in ChangeEntity}
+        deletes: Dict[ChangeEntity, List[int]] = {entity: [] for entity in ChangeEntity}
+        for (entity, entity_id), operation in latest.items():
+            (upserts if operation == ChangeOperation.UPSERT else deletes)[entity].append(entity_id)
+
+        # Estado actual de lo modificado: una consulta por tipo. Si una fila ya no existe (borrada o archivada), su
+        # borrado está anotado en una página posterior, así que simplemente no aparece en esta
+        return ChangeSet(
+            last_seq=page[-1].seq if page else since,
+            has_more=has_more,
+            projects=sorted(self.project_repository.get_by_ids(upserts[ChangeEntity.PROJECT]), key=lambda p: p.id), # type: ignore
+            epics=sorted(self.epic_repository.get_by_ids(upserts[ChangeEntity.EPIC]), key=lambda e: e.id), # type: ignore
+            tasks=sorted(self.task_repository.get_by_ids(upserts[ChangeEntity.TASK]), key=lambda t: t.id), # type: ignore
+            deleted_projects=sorted(deletes[ChangeEntity.PROJECT]),
+            deleted_epics=sorted(deletes[ChangeEntity.EPIC]),
+            deleted_tasks=sorted(deletes[ChangeEntity.TASK]),
+        )
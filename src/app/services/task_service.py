@@ -1,13 +1,39 @@
-from typing import List, Optional
-from src.domain.entities.task import Task, TaskStatus
+import dataclasses
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from src.domain.entities.task import Task, TaskStatus, TaskPriority
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.bulk import BulkItemError, BulkResult
+from src.domain.entities.board_event import BoardEvent
+from src.domain.entities.change import ChangeEntity, ChangeOperation
 from src.domain.repositories.task_repository import TaskRepository
 from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.repositories.unit_of_work import UnitOfWork
+from src.domain.repositories.event_publisher import EventPublisher
+from src.domain.repositories.archive_repository import ArchiveRepository
+
+# Campos que ya no se pueden cambiar cuando la tarea está DONE (REGLA DE NEGOCIO 5)
+LOCKED_WHEN_DONE = ("name", "description", "finalization_date", "finalization_criteria", "epic_id")
 
 class TaskService:
-    def __init__(self, task_repository: TaskRepository, epic_repository: EpicRepository):
+    def __init__(self, task_repository: TaskRepository, epic_repository: EpicRepository, unit_of_work: UnitOfWork,
+                 event_publisher: EventPublisher, archive_repository: Optional[ArchiveRepository] = None):
         # Inyectamos la interfaz (Puerto), no la implementación
         self.task_repository = task_repository
         self.epic_repository = epic_repository
+        # Cada caso de uso que escribe confirma una única vez a través de la unidad de trabajo
+        self.unit_of_work = unit_of_work
+        # Tras confirmar, los cambios se notifican a quien esté viendo el tablero del proyecto
+        self.event_publisher = event_publisher
+        # Lecturas con include_archived: el trabajo terminado y antiguo se mueve a las tablas de archivo
+        self.archive_repository = archive_repository
+
+    def _publish(self, operation: ChangeOperation, tasks: List[Tuple[int, int]]) -> None:
+        # tasks: pares (task_id, epic_id). Los suscriptores van por proyecto: una consulta (o la caché) para las épicas
+        projects = {epic.id: epic.project_id for epic in self.epic_repository.get_by_ids({epic_id for _, epic_id in tasks})}
+        self.event_publisher.publish([BoardEvent(projects[epic_id], ChangeEntity.TASK, task_id, operation)
+                                      for task_id, epic_id in tasks if epic_id in projects])
 
     def create_task(self, name: str, epic_id: int, description: Optional[str] = None) -> Task:
         # --- REGLA DE NEGOCIO 1: Verificar que la épica exista ---
@@ -16,19 +42,41 @@ class TaskService:
             raise ValueError(f"The epic with ID {epic_id} does not exist.")
 
         # --- REGLA DE NEGOCIO 2: No nombres duplicados dentro de la misma épica ---
-        existing_tasks = self.task_repository.get_by_epic_id(epic_id)
-        if any(t.name.lower() == name.lower() for t in existing_tasks):
+        if self.task_repository.exists_by_name(epic_id, name):
             raise ValueError(f"The task with name '{name}' already exists in epic ID {epic_id}.")
 
         # Creamos la entidad y la mandamos al "puerto"
         new_task = Task(name=name, epic_id=epic_id, description=description)
-        return self.task_repository.add(new_task)
+        with self.unit_of_work:
+            created = self.task_repository.add(new_task)
+            self.unit_of_work.commit()
+        self.event_publisher.publish([BoardEvent(epic.project_id, ChangeEntity.TASK, created.id, ChangeOperation.UPSERT)]) # type: ignore[arg-type]
+        return created
     
-    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+    def get_task_by_id(self, task_id: int, include_archived: bool = False) -> Optional[Task]:
+        if include_archived and self.archive_repository:
+            # El repositorio lanza ValueError si la tarea no está en la tabla viva: se busca en el archivo
+            try:
+                return self.task_repository.get_by_id(task_id)
+            except ValueError:
+                return self.archive_repository.get_task_by_id(task_id)
         return self.task_repository.get_by_id(task_id)
     
-    def get_all_tasks(self) -> List[Task]:
-        return self.task_repository.get_all()
+    def list_tasks(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                   status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                   assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Page[Task]:
+        return self.task_repository.get_page(limit, cursor=cursor, order_by=order_by, status=status,
+                                             priority=priority, assignee=assignee, epic_id=epic_id)
+    
+    def list_due_tasks(self, before: datetime, limit: int, cursor: Optional[str] = None,
+                       exclude_statuses: Iterable[TaskStatus] = (TaskStatus.DONE,)) -> Page[Task]:
+        # Tareas con la fecha objetivo vencida (o que vencen antes de 'before'), de la más antigua a la más reciente
+        return self.task_repository.get_due_page(before, limit, cursor=cursor, exclude_statuses=exclude_statuses)
+    
+    def get_tasks_version(self, status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                          assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Version:
+        # Para las peticiones condicionales: permite responder 304 sin cargar las tareas
+        return self.task_repository.get_version(status=status, priority=priority, assignee=assignee, epic_id=epic_id)
     
     def update_task(self, task: Task, task_id: int) -> Task:
         
@@ -38,10 +86,8 @@ class TaskService:
             raise ValueError(f"The task with ID {task_id} does not exist.")
         
         # --- REGLA DE NEGOCIO 4: No actualizar si el nombre ya existe (excepto para la misma tarea) ---
-        existing_tasks = self.task_repository.get_by_epic_id(existing_task.epic_id)
-        for t in existing_tasks:
-            if t.name.lower() == task.name.lower() and t.id != task_id:
-                raise ValueError(f"The task with name '{task.name}' already exists in epic ID {existing_task.epic_id}.")
+        if self.task_repository.exists_by_name(existing_task.epic_id, task.name, exclude_id=task_id):
+            raise ValueError(f"The task with name '{task.name}' already exists in epic ID {existing_task.epic_id}.")
         
         # --- REGLA DE NEGOCIO 5: No actualizar si la tarea está COMPLETED, solo el estado ---
         if existing_task.status == TaskStatus.DONE:
@@ -50,8 +96,11 @@ class TaskService:
                 raise ValueError(f"The task with ID {task_id} cannot be updated because its status is DONE.")
         
         # Actualizamos la tarea
-        task.id = task_id
-        return self.task_repository.update(task)
+        with self.unit_of_work:
+            updated = self.task_repository.update(task_id, task)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.UPSERT, [(task_id, existing_task.epic_id)])
+        return updated
     
     def delete_task(self, task_id: int):
         # --- REGLA DE NEGOCIO 6: Verificar que la tarea exista antes de eliminar ---
@@ -63,20 +112,135 @@ class TaskService:
         if existing_task.status == TaskStatus.DONE:
             raise ValueError(f"The task with ID {task_id} cannot be deleted because its status is DONE.")
 
-        return self.task_repository.delete(task_id)
+        with self.unit_of_work:
+            deleted = self.task_repository.delete(task_id)
+            self.unit_of_work.commit()
+        self._publish(ChangeOperation.DELETE, [(task_id, existing_task.epic_id)])
+        return deleted
     
-    def get_tasks_by_epic_id(self, epic_id: int) -> List[Task]:
+    def get_tasks_by_epic_id(self, epic_id: int, include_archived: bool = False) -> List[Task]:
+        archive = self.archive_repository if include_archived else None
         #  --- REGLA DE NEGOCIO 8: Verificar que la épica exista ---
-        epic = self.epic_repository.get_by_id(epic_id)
-        if not epic:
-            raise ValueError(f"The epic with ID {epic_id} does not exist.")
-        
-        return self.task_repository.get_by_epic_id(epic_id)
+        if not archive:
+            epic = self.epic_repository.get_by_id(epic_id)
+            if not epic:
+                raise ValueError(f"The epic with ID {epic_id} does not exist.")
+            return self.task_repository.list_by_epic_id(epic_id)
+
+        # Con las archivadas: la épica puede estar viva (con tareas en ambos sitios, o ya todas archivadas)
+        # o archivada (todas archivadas). El repositorio lanza ValueError si no está en la tabla viva
+        try:
+            self.epic_repository.get_by_id(epic_id)
+            tasks = self.task_repository.list_by_epic_id(epic_id)
+        except ValueError:
+            if not archive.get_epic_by_id(epic_id):
+                raise ValueError(f"The epic with ID {epic_id} does not exist.")
+            tasks = []
+        return sorted(tasks + archive.get_tasks_by_epic_id(epic_id), key=lambda task: task.id) # type: ignore[arg-type, return-value]
     
-    def get_count_tasks_by_epic_id(self, epic_id: int) -> int:
+    def get_count_tasks_by_epic_id(self, epic_id: int, status: Optional[TaskStatus] = None) -> int:
         #  --- REGLA DE NEGOCIO 9: Verificar que la épica exista ---
         epic = self.epic_repository.get_by_id(epic_id)
         if not epic:
             raise ValueError(f"The epic with ID {epic_id} does not exist.")
         
-        return self.task_repository.get_count_by_epic_id(epic_id)
\ No newline at end of file
+        return self.task_repository.get_count_by_epic_id(epic_id, status=status)
+
+    # --- Operaciones masivas: las mismas reglas de negocio, comprobadas por conjuntos ---
+    # Cada elemento que no cumple una regla se informa en BulkResult.errors con su posición;
+    # el resto se guarda en una única transacción.
+
+    def bulk_create_tasks(self, tasks: List[Task]) -> BulkResult[Task]:
+        result: BulkResult[Task] = BulkResult()
+        # --- REGLA DE NEGOCIO 1: las épicas deben existir (una consulta para todas) ---
+        epic_ids = {epic.id for epic in self.epic_repository.get_by_ids({task.epic_id for task in tasks})}
+        # --- REGLA DE NEGOCIO 2: sin nombres duplicados en la épica (una consulta), ni dentro de la propia petición ---
+        taken = self.task_repository.get_ids_by_names((task.epic_id, task.name) for task in tasks)
+        seen: Set[Tuple[int, str]] = set()
+
+        valid: List[Task] = []
+        for index, task in enumerate(tasks):
+            key = (task.epic_id, task.name.lower())
+            if task.epic_id not in epic_ids:
+                result.errors.append(BulkItemError(index, f"The epic with ID {task.epic_id} does not exist."))
+            elif key in taken or key in seen:
+                result.errors.append(BulkItemError(index, f"The task with name '{task.name}' already exists in epic ID {task.epic_id}."))
+            else:
+                seen.add(key)
+                valid.append(task)
+
+        if valid:
+            with self.unit_of_work:
+                result.items = self.task_repository.add_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.UPSERT, [(task.id, task.epic_id) for task in result.items]) # type: ignore[misc]
+        return result
+
+    def bulk_update_tasks(self, changes: List[Tuple[int, Dict[str, Any]]]) -> BulkResult[Task]:
+        result: BulkResult[Task] = BulkResult()
+        # --- REGLA DE NEGOCIO 3: las tareas deben existir (una consulta para todas) ---
+        existing = {task.id: task for task in self.task_repository.get_by_ids(task_id for task_id, _ in changes)}
+        # --- REGLA DE NEGOCIO 4: los nombres nuevos no pueden estar en uso por otra tarea de la épica (una consulta) ---
+        taken = self.task_repository.get_ids_by_names(
+            (existing[task_id].epic_id, fields["name"]) for task_id, fields in changes
+            if task_id in existing and "name" in fields)
+        seen_ids: Set[int] = set()
+        seen_names: Dict[Tuple[int, str], int] = {}
+
+        valid: List[Task] = []
+        for index, (task_id, fields) in enumerate(changes):
+            current = existing.get(task_id)
+            if current is None:
+                result.errors.append(BulkItemError(index, f"The task with ID {task_id} does not exist."))
+                continue
+            if task_id in seen_ids:
+                result.errors.append(BulkItemError(index, f"The task with ID {task_id} appears more than once in the request."))
+                continue
+            if "name" in fields:
+                key = (current.epic_id, fields["name"].lower())
+                if taken.get(key, task_id) != task_id or seen_names.get(key, task_id) != task_id:
+                    result.errors.append(BulkItemError(index, f"The task with name '{fields['name']}' already exists in epic ID {current.epic_id}."))
+                    continue
+            # --- REGLA DE NEGOCIO 5: una tarea DONE solo admite cambios de estado, asignación y prioridad ---
+            if current.status == TaskStatus.DONE and any(
+                    field in fields and fields[field] != getattr(current, field) for field in LOCKED_WHEN_DONE):
+                result.errors.append(BulkItemError(index, f"The task with ID {task_id} cannot be updated because its status is DONE."))
+                continue
+
+            seen_ids.add(task_id)
+            if "name" in fields:
+                seen_names[(current.epic_id, fields["name"].lower())] = task_id
+            valid.append(dataclasses.replace(current, **fields))
+
+        if valid:
+            with self.unit_of_work:
+                result.items = self.task_repository.update_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.UPSERT, [(task.id, task.epic_id) for task in result.items]) # type: ignore[misc]
+        return result
+
+    def bulk_delete_tasks(self, task_ids: List[int]) -> BulkResult[int]:
+        result: BulkResult[int] = BulkResult()
+        existing = {task.id: task for task in self.task_repository.get_by_ids(task_ids)}
+
+        valid: List[int] = []
+        seen: Set[int] = set()
+        for index, task_id in enumerate(task_ids):
+            task = existing.get(task_id)
+            # --- REGLA DE NEGOCIO 6: la tarea debe existir ---
+            if task is None:
+                result.errors.append(BulkItemError(index, f"The task with ID {task_id} does not exist."))
+            # --- REGLA DE NEGOCIO 7: no eliminar tareas DONE ---
+            elif task.status == TaskStatus.DONE:
+                result.errors.append(BulkItemError(index, f"The task with ID {task_id} cannot be deleted because its status is DONE."))
+            elif task_id not in seen: # Los IDs repetidos se borran una sola vez
+                seen.add(task_id)
+                valid.append(task_id)
+
+        if valid:
+            with self.unit_of_work:
+                self.task_repository.delete_many(valid)
+                self.unit_of_work.commit()
+            self._publish(ChangeOperation.DELETE, [(task_id, existing[task_id].epic_id) for task_id in valid])
+        result.items = valid
+        return result
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task, TaskStatus
+
+@dataclass
+class BoardColumn:
+    """Una columna del tablero: las tareas de una épica con un mismo estado"""
+    status: TaskStatus
+    # Total de tareas de la columna; puede ser mayor que len(tasks) si se limitó el tamaño de la columna
+    count: int = 0
+    tasks: List[Task] = field(default_factory=list)
+
+@dataclass
+class EpicBoard:
+    epic: Epic
+    columns: List[BoardColumn] = field(default_factory=list)
+
+@dataclass
+class ProjectBoard:
+    """Tablero completo de un proyecto: sus épicas y, por cada una, sus tareas agrupadas por estado"""
+    project: Project
+    epics: List[EpicBoard] = field(default_factory=list)
+
+def group_by_status(tasks: Iterable[Task]) -> List[BoardColumn]:
+    """Reparte las tareas en una columna por estado, en el orden de TaskStatus (incluidas las vacías)"""
+    columns = {status: BoardColumn(status) for status in TaskStatus}
+    for task in tasks:
+        column = columns[task.status]
+        column.count += 1
+        column.tasks.append(task)
+    return list(columns.values())
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+
+@dataclass(frozen=True)
+class BoardEvent:
+    """Cambio confirmado en el tablero de un proyecto, para notificarlo a quien lo esté viendo"""
+    project_id: int
+    entity: ChangeEntity
+    entity_id: int
+    operation: ChangeOperation
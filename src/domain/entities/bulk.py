@@ -0,0 +1,16 @@
+from dataclasses import dataclass, field
+from typing import Generic, List, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class BulkItemError:
+    """Error de negocio de un elemento concreto de una operación masiva"""
+    index: int # Posición del elemento en la petición
+    message: str
+
+@dataclass
+class BulkResult(Generic[T]):
+    """Resultado de una operación masiva: los elementos aplicados y los errores por elemento"""
+    items: List[T] = field(default_factory=list)
+    errors: List[BulkItemError] = field(default_factory=list)
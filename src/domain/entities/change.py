@@ -0,0 +1,38 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import List
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+
+class ChangeEntity(Enum):
+    PROJECT = "project"
+    EPIC = "epic"
+    TASK = "task"
+
+class ChangeOperation(Enum):
+    UPSERT = "upsert" # Creación o modificación
+    DELETE = "delete"
+
+@dataclass
+class Change:
+    """Una entrada del registro de cambios; seq crece de forma monótona con cada escritura"""
+    seq: int
+    entity: ChangeEntity
+    entity_id: int
+    operation: ChangeOperation
+    changed_at: datetime
+
+@dataclass
+class ChangeSet:
+    """Cambios posteriores a un cursor: estado actual de lo creado/modificado e IDs de lo borrado"""
+    last_seq: int = 0 # Último cambio incluido: la siguiente llamada pide los posteriores
+    has_more: bool = False
+    resync: bool = False # El cursor es anterior a lo que conserva el registro: hay que recargarlo todo
+    projects: List[Project] = field(default_factory=list)
+    epics: List[Epic] = field(default_factory=list)
+    tasks: List[Task] = field(default_factory=list)
+    deleted_projects: List[int] = field(default_factory=list)
+    deleted_epics: List[int] = field(default_factory=list)
+    deleted_tasks: List[int] = field(default_factory=list)
@@ -15,7 +15,7 @@ class EpicPriority(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+@dataclass(slots=True)
 class Epic:
     project_id: int
     name: str
@@ -0,0 +1,16 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from src.domain.entities.task import TaskStatus
+
+@dataclass(frozen=True)
+class OverdueAlert:
+    """Tarea abierta cuya target_date acaba de pasar, detectada por el planificador de vencimientos"""
+    task_id: int
+    epic_id: int
+    name: str
+    status: TaskStatus
+    target_date: datetime
+    detected_at: datetime
+    assignee: Optional[str] = None
+    seq: int = 0 # Posición en el historial de avisos; la asigna el destino que los guarda
@@ -0,0 +1,11 @@
+from dataclasses import dataclass, field
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+@dataclass
+class Page(Generic[T]):
+    """Una página de resultados obtenida con paginación por cursor (keyset)"""
+    items: List[T] = field(default_factory=list)
+    # Cursor opaco para pedir la siguiente página; None si no hay más resultados
+    next_cursor: Optional[str] = None
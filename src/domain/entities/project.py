@@ -9,7 +9,7 @@ class ProjectStatus(Enum):
     ON_HOLD = "on_hold"
     CANCELLED = "cancelled"
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     name: str
     id: Optional[int] = None
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import Optional
+from src.domain.entities.change import ChangeEntity
+
+@dataclass
+class SearchHit:
+    """Proyecto, épica o tarea que coincide con una búsqueda de texto"""
+    entity: ChangeEntity
+    id: int
+    project_id: int
+    name: str
+    description: Optional[str] = None
+    epic_id: Optional[int] = None # Solo en las tareas
+    # Relevancia según el motor de búsqueda: mayor es mejor. Solo sirve para ordenar resultados de la misma búsqueda
+    score: float = 0.0
@@ -0,0 +1,44 @@
+from dataclasses import dataclass, field
+from typing import Dict
+from src.domain.entities.task import TaskPriority, TaskStatus
+
+@dataclass
+class TaskStats:
+    """Resumen de un conjunto de tareas, calculado con agregados en la base de datos"""
+    total: int = 0
+    # Tareas no terminadas cuya target_date ya ha pasado
+    overdue: int = 0
+    by_status: Dict[TaskStatus, int] = field(default_factory=lambda: {status: 0 for status in TaskStatus})
+    by_priority: Dict[TaskPriority, int] = field(default_factory=lambda: {priority: 0 for priority in TaskPriority})
+
+    @property
+    def done(self) -> int:
+        return self.by_status[TaskStatus.DONE]
+
+    @property
+    def progress(self) -> float:
+        """Fracción de tareas terminadas (0 si no hay tareas)"""
+        return self.done / self.total if self.total else 0.0
+
+    def add(self, status: TaskStatus, priority: TaskPriority, count: int, overdue: int) -> None:
+        self.total += count
+        self.overdue += overdue
+        self.by_status[status] += count
+        self.by_priority[priority] += count
+
+@dataclass
+class EpicStats:
+    epic_id: int
+    tasks: TaskStats = field(default_factory=TaskStats)
+
+@dataclass
+class ProjectStats:
+    project_id: int
+    epics: int = 0
+    tasks: TaskStats = field(default_factory=TaskStats)
+
+@dataclass
+class AssigneeWorkload:
+    """Carga de trabajo de una persona: sus tareas asignadas, en todos los proyectos"""
+    assignee: str
+    tasks: TaskStats = field(default_factory=TaskStats)
@@ -15,7 +15,7 @@ class TaskPriority(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+@dataclass(slots=True)
 class Task:
     epic_id: int
     name: str
@@ -0,0 +1,9 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+
+@dataclass(frozen=True)
+class Version:
+    """Huella de un conjunto de filas para las peticiones condicionales: cuántas hay y cuándo cambió la última"""
+    count: int
+    last_modified: Optional[datetime] = None
@@ -0,0 +1,36 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+
+class ArchiveRepository(ABC):
+    """
+    Read-only access to archived (completed and old) projects, epics and tasks.
+    Archived rows are moved out of the live tables, so the other repositories never return them.
+    """
+
+    @abstractmethod
+    def get_project_by_id(self, project_id: int) -> Optional[Project]:
+        """Retrieve an archived project by its ID"""
+        pass
+
+    @abstractmethod
+    def get_epic_by_id(self, epic_id: int) -> Optional[Epic]:
+        """Retrieve an archived epic by its ID"""
+        pass
+
+    @abstractmethod
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        """Retrieve an archived task by its ID"""
+        pass
+
+    @abstractmethod
+    def get_epics_by_project_id(self, project_id: int) -> List[Epic]:
+        """Retrieve the archived epics of a project (live or archived)"""
+        pass
+
+    @abstractmethod
+    def get_tasks_by_epic_id(self, epic_id: int) -> List[Task]:
+        """Retrieve the archived tasks of an epic (live or archived)"""
+        pass
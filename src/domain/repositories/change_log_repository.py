@@ -0,0 +1,20 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+from src.domain.entities.change import Change
+
+class ChangeLogRepository(ABC):
+
+    @abstractmethod
+    def get_since(self, seq: int, limit: int) -> List[Change]:
+        """Retrieve up to limit changes with a sequence number greater than seq, in sequence order"""
+        pass
+
+    @abstractmethod
+    def get_first_seq(self) -> Optional[int]:
+        """Sequence number of the oldest change still retained (None if the log is empty)"""
+        pass
+
+    @abstractmethod
+    def is_pending(self, after: int, before: int) -> bool:
+        """Whether a sequence number between after and before (exclusive) may still be committed by an open transaction"""
+        pass
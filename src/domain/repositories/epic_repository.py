@@ -1,6 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities.epic import Epic
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+from src.domain.entities.epic import Epic, EpicStatus, EpicPriority
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
 
 class EpicRepository(ABC):
 
@@ -10,7 +12,7 @@ class EpicRepository(ABC):
         pass
     
     @abstractmethod
-    def update(self, epic: Epic) -> Epic:
+    def update(self, epic_id: int, epic: Epic) -> Epic:
         """Update an existing Epic"""
         pass
 
@@ -25,8 +27,26 @@ class EpicRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Epic]:
-        """Retrieve the list of all epics"""
+    def list_by_project_id(self, project_id: int) -> List[Epic]:
+        """Retrieve all epics of a project ordered by ID (an empty list if it has none)"""
+        pass
+
+    @abstractmethod
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                 project_id: Optional[int] = None) -> Page[Epic]:
+        """Retrieve a keyset-paginated page of epics matching the given filters"""
+        pass
+
+    @abstractmethod
+    def get_version(self, status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                    project_id: Optional[int] = None) -> Version:
+        """Count and latest updated_at of the epics matching the given filters, in one aggregate query"""
+        pass
+
+    @abstractmethod
+    def exists_by_name(self, project_id: int, name: str, exclude_id: Optional[int] = None) -> bool:
+        """Check (case-insensitively) whether an epic with this name exists in the project, ignoring exclude_id"""
         pass
 
     @abstractmethod
@@ -35,6 +55,32 @@ class EpicRepository(ABC):
         pass
     
     @abstractmethod
-    def get_count_by_project_id(self, project_id: int) -> int:
-        """Get the count of epics associated with a specific project ID"""
-        pass
\ No newline at end of file
+    def get_count_by_project_id(self, project_id: int, status: Optional[EpicStatus] = None) -> int:
+        """Get the count of epics associated with a specific project ID, optionally only those with a given status"""
+        pass
+
+    @abstractmethod
+    def get_by_ids(self, epic_ids: Iterable[int]) -> List[Epic]:
+        """Retrieve the epics with the given IDs in a single query (missing IDs are skipped)"""
+        pass
+
+    @abstractmethod
+    def get_ids_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        """Map each (project_id, lower-cased name) already in use to the ID of the epic using it"""
+        pass
+
+    @abstractmethod
+    def add_many(self, epics: List[Epic]) -> List[Epic]:
+        """Create several epics with a multi-row insert, returned in the same order with their IDs"""
+        pass
+
+    @abstractmethod
+    def update_many(self, changes: List[Tuple[Epic, Collection[str]]]) -> List[Epic]:
+        """Persist the given fields of several existing epics in a single batched update"""
+        pass
+
+    @abstractmethod
+    def delete_many(self, epic_ids: List[int]) -> int:
+        """Delete several epics in a single statement and return how many were removed"""
+        pass
+
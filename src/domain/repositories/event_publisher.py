@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+from src.domain.entities.board_event import BoardEvent
+
+class EventPublisher(ABC):
+    """
+    Outbound port for board notifications. Services publish once the unit of work has committed,
+    so subscribers never hear about changes that were rolled back.
+    """
+
+    @abstractmethod
+    def publish(self, events: List[BoardEvent]) -> None:
+        """Deliver events to the subscribers of each event's project; must not block on slow subscribers"""
+        pass
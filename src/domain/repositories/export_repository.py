@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+
+class ExportRepository(ABC):
+    """
+    Streaming reads for full dumps. Implementations yield rows as the database returns them
+    (server-side cursors), so memory stays constant whatever the number of rows.
+    """
+
+    @abstractmethod
+    def stream_projects(self, project_id: Optional[int] = None) -> Iterator[Project]:
+        """Yield every project (or only the given one) ordered by ID"""
+        pass
+
+    @abstractmethod
+    def stream_epics(self, project_id: Optional[int] = None) -> Iterator[Epic]:
+        """Yield every epic (or those of a project) ordered by ID"""
+        pass
+
+    @abstractmethod
+    def stream_tasks(self, project_id: Optional[int] = None) -> Iterator[Task]:
+        """Yield every task (or those of a project's epics) ordered by epic ID and ID"""
+        pass
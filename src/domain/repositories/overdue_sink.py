@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+from typing import List
+from src.domain.entities.overdue import OverdueAlert
+
+class OverdueSink(ABC):
+    """
+    Outbound port for overdue-task alerts. The scheduler publishes each newly overdue task once,
+    in (target_date, id) order; implementations decide where the alerts go.
+    """
+
+    @abstractmethod
+    def publish(self, alerts: List[OverdueAlert]) -> None:
+        """Deliver a batch of alerts; must not raise for delivery failures the scheduler cannot retry"""
+        pass
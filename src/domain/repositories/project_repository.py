@@ -1,6 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities.project import Project
+from typing import Iterable, List, Optional
+from src.domain.entities.project import Project, ProjectStatus
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.board import ProjectBoard
 
 class ProjectRepository(ABC):
 
@@ -20,8 +23,34 @@ class ProjectRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Project]:
-        """Retrieve the list of all projects"""
+    def get_by_ids(self, project_ids: Iterable[int]) -> List[Project]:
+        """Retrieve the projects with the given IDs in a single query (missing IDs are skipped)"""
+        pass
+
+    @abstractmethod
+    def get_board(self, project_id: int) -> ProjectBoard:
+        """Retrieve a project with its epics and their tasks in a fixed number of queries"""
+        pass
+
+    @abstractmethod
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[ProjectStatus] = None) -> Page[Project]:
+        """Retrieve a keyset-paginated page of projects matching the given filters"""
+        pass
+
+    @abstractmethod
+    def get_version(self, status: Optional[ProjectStatus] = None) -> Version:
+        """Count and latest updated_at of the projects matching the given filters, in one aggregate query"""
+        pass
+
+    @abstractmethod
+    def get_board_version(self, project_id: int) -> Version:
+        """Count and latest updated_at over a project, its epics and their tasks, in one query"""
+        pass
+
+    @abstractmethod
+    def exists_by_name(self, name: str, exclude_id: Optional[int] = None) -> bool:
+        """Check (case-insensitively) whether a project with this name exists, ignoring exclude_id"""
         pass
 
     @abstractmethod
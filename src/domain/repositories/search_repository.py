@@ -0,0 +1,13 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+from src.domain.entities.change import ChangeEntity
+from src.domain.entities.page import Page
+from src.domain.entities.search import SearchHit
+
+class SearchRepository(ABC):
+
+    @abstractmethod
+    def search(self, text: str, entity: Optional[ChangeEntity] = None, project_id: Optional[int] = None,
+               limit: int = 20, cursor: Optional[str] = None) -> Page[SearchHit]:
+        """Full-text search over names, descriptions and criteria, most relevant first, optionally scoped to one entity type and project"""
+        pass
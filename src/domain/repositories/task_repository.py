@@ -1,6 +1,11 @@
+import datetime
 from abc import ABC, abstractmethod
-from typing import List, Optional
-from src.domain.entities.task import Task
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.domain.entities.task import Task, TaskStatus, TaskPriority
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.board import BoardColumn
+from src.domain.entities.stats import AssigneeWorkload, TaskStats
 
 class TaskRepository(ABC):
 
@@ -10,7 +15,7 @@ class TaskRepository(ABC):
         pass
     
     @abstractmethod
-    def update(self, task: Task) -> Task:
+    def update(self, task_id: int, task: Task) -> Task:
         """Update an existing Task"""
         pass
 
@@ -25,8 +30,37 @@ class TaskRepository(ABC):
         pass
 
     @abstractmethod
-    def get_all(self) -> List[Task]:
-        """Retrieve the list of all tasks"""
+    def list_by_epic_id(self, epic_id: int) -> List[Task]:
+        """Retrieve all tasks of an epic ordered by ID (an empty list if it has none)"""
+        pass
+
+    @abstractmethod
+    def get_board_columns(self, epic_ids: List[int], limit_per_column: Optional[int] = None) -> Dict[int, List[BoardColumn]]:
+        """Group the tasks of several epics into one column per TaskStatus, with the total count of each column"""
+        pass
+
+    @abstractmethod
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                 assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Page[Task]:
+        """Retrieve a keyset-paginated page of tasks matching the given filters"""
+        pass
+
+    @abstractmethod
+    def get_due_page(self, before: datetime.datetime, limit: int, cursor: Optional[str] = None,
+                     exclude_statuses: Iterable[TaskStatus] = (TaskStatus.DONE,)) -> Page[Task]:
+        """Tasks whose target_date is earlier than 'before', oldest first, keyset-paginated by (target_date, id)"""
+        pass
+
+    @abstractmethod
+    def get_version(self, status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                    assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Version:
+        """Count and latest updated_at of the tasks matching the given filters, in one aggregate query"""
+        pass
+
+    @abstractmethod
+    def exists_by_name(self, epic_id: int, name: str, exclude_id: Optional[int] = None) -> bool:
+        """Check (case-insensitively) whether a task with this name exists in the epic, ignoring exclude_id"""
         pass
 
     @abstractmethod
@@ -35,6 +69,47 @@ class TaskRepository(ABC):
         pass
 
     @abstractmethod
-    def get_count_by_epic_id(self, epic_id: int) -> int:
-        """Get the count of tasks associated with a specific epic ID"""
+    def get_count_by_epic_id(self, epic_id: int, status: Optional[TaskStatus] = None) -> int:
+        """Get the count of tasks associated with a specific epic ID, optionally only those with a given status"""
+        pass
+
+    @abstractmethod
+    def get_stats_by_epic_ids(self, epic_ids: Iterable[int]) -> Dict[int, TaskStats]:
+        """Aggregate the tasks of several epics (counts per status and priority, overdue); epics without tasks are omitted"""
+        pass
+
+    @abstractmethod
+    def get_stats_by_project_id(self, project_id: int) -> TaskStats:
+        """Aggregate every task of every epic in a project"""
+        pass
+
+    @abstractmethod
+    def get_workload_page(self, limit: int, cursor: Optional[str] = None) -> Page[AssigneeWorkload]:
+        """Aggregate the tasks of a page of assignees (ordered by name) with a single grouped query"""
+        pass
+
+    @abstractmethod
+    def get_by_ids(self, task_ids: Iterable[int]) -> List[Task]:
+        """Retrieve the tasks with the given IDs in a single query (missing IDs are skipped)"""
+        pass
+
+    @abstractmethod
+    def get_ids_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        """Map each (epic_id, lower-cased name) already in use to the ID of the task using it"""
         pass
+
+    @abstractmethod
+    def add_many(self, tasks: List[Task]) -> List[Task]:
+        """Create several tasks with a multi-row insert, returned in the same order with their IDs"""
+        pass
+
+    @abstractmethod
+    def update_many(self, tasks: List[Task]) -> List[Task]:
+        """Persist the full state of several existing tasks in a single batched update"""
+        pass
+
+    @abstractmethod
+    def delete_many(self, task_ids: List[int]) -> int:
+        """Delete several tasks in a single statement and return how many were removed"""
+        pass
+
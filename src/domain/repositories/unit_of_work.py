@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+
+class UnitOfWork(ABC):
+    """
+    Transaction boundary of a use case. Repositories only stage their changes (flush);
+    the service commits them all at once through the unit of work.
+
+    Used as a context manager: any exception inside the block rolls the work back.
+    """
+
+    @abstractmethod
+    def commit(self) -> None:
+        """Persist every change staged by the repositories since the last commit"""
+        pass
+
+    @abstractmethod
+    def rollback(self) -> None:
+        """Discard every change staged by the repositories since the last commit"""
+        pass
+
+    def __enter__(self) -> "UnitOfWork":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self.rollback()
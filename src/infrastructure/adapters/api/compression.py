@@ -0,0 +1,131 @@
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Sequence
+import anyio.to_thread
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+# Compresión de las respuestas según Accept-Encoding. gzip siempre; brotli ("br") y zstd solo si están instalados
+# (extra opcional "compression": uv sync --extra compression). Se reutilizan los responders de Starlette: no se
+# comprimen las respuestas pequeñas (minimum_size), las que ya traen Content-Encoding ni los tipos ya comprimidos o
+# en directo (application/gzip de la exportación, text/event-stream...), y las respuestas en streaming se comprimen
+# trozo a trozo. Siempre se añade "Vary: Accept-Encoding" para que las cachés compartidas guarden una copia por codificación
+
+try:
+    import brotli
+except ImportError:
+    brotli = None # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None # type: ignore[assignment]
+
+# Niveles elegidos con benchmarks/bench_compression sobre el JSON del tablero: tamaño parecido al de gzip -6 (o menor)
+# en menos tiempo de CPU
+BROTLI_QUALITY = 6
+ZSTD_LEVEL = 9
+
+# Trozos a partir de este tamaño se comprimen en un hilo para no bloquear el event loop (como hace GZipResponder)
+THREAD_MINIMUM_SIZE = 128 * 1024
+
+class _StreamResponder(IdentityResponder, ABC):
+    """Responder de Starlette para un compresor incremental: flush en cada trozo intermedio y cierre en el último"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int):
+        super().__init__(app, minimum_size)
+        # Se crea con el primer trozo que se comprime: las respuestas pequeñas o ya comprimidas no lo necesitan
+        self._compressor: Any = None
+
+    @abstractmethod
+    def _new_compressor(self) -> Any:
+        """Compresor incremental para el cuerpo de una respuesta"""
+        pass
+
+    @abstractmethod
+    def _compress_chunk(self, compressor: Any, body: bytes, more_body: bool) -> bytes:
+        """Comprime un trozo; con more_body hace flush para que el cliente pueda descomprimirlo ya, si no cierra"""
+        pass
+
+    def _compress_body(self, body: bytes, more_body: bool) -> bytes:
+        if self._compressor is None:
+            self._compressor = self._new_compressor()
+        return self._compress_chunk(self._compressor, body, more_body)
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            return await anyio.to_thread.run_sync(self._compress_body, body, more_body)
+        return self._compress_body(body, more_body)
+
+
+class BrotliResponder(_StreamResponder):
+    content_encoding = "br"
+
+    def _new_compressor(self) -> Any:
+        return brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def _compress_chunk(self, compressor: Any, body: bytes, more_body: bool) -> bytes:
+        return compressor.process(body) + (compressor.flush() if more_body else compressor.finish())
+
+
+class ZstdResponder(_StreamResponder):
+    content_encoding = "zstd"
+
+    def _new_compressor(self) -> Any:
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def _compress_chunk(self, compressor: Any, body: bytes, more_body: bool) -> bytes:
+        return compressor.compress(body) + (compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK) if more_body
+                                            else compressor.flush())
+
+
+def available_encodings() -> Dict[str, bool]:
+    return {"zstd": zstandard is not None, "br": brotli is not None, "gzip": True}
+
+def negotiate(accept_encoding: str, encodings: Sequence[str]) -> Optional[str]:
+    """
+    Elige la codificación con mayor q de Accept-Encoding entre las del servidor; a igual q, la primera de
+    'encodings' (orden de preferencia del servidor). q=0 la excluye y "*" vale para las no mencionadas.
+    """
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        name, _, params = item.strip().partition(";")
+        if not name:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip()] = q
+    best, best_q = None, 0.0
+    for encoding in encodings:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, encodings: Sequence[str] = ("br", "zstd", "gzip"),
+                 gzip_level: int = 6):
+        self.app = app
+        self.minimum_size = minimum_size
+        # Solo las que el servidor sabe producir, en el orden de preferencia configurado
+        available = available_encodings()
+        self.encodings = [encoding for encoding in encodings if available.get(encoding)]
+        self._responders: Dict[str, Callable[[], ASGIApp]] = {
+            "gzip": lambda: GZipResponder(self.app, self.minimum_size, compresslevel=gzip_level),
+            "br": lambda: BrotliResponder(self.app, self.minimum_size),
+            "zstd": lambda: ZstdResponder(self.app, self.minimum_size),
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        responder = self._responders[encoding]() if encoding else IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
@@ -0,0 +1,100 @@
+import hashlib
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
+from fastapi import Request, Response, status
+from src.domain.entities.version import Version
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.config.settings import settings
+
+S = TypeVar("S")
+R = TypeVar("R")
+
+# Marca interna para "no ha cambiado": el caso de uso no llega a cargar nada
+_NOT_MODIFIED = object()
+
+# Las respuestas con validadores se pueden guardar en cualquier caché: como mucho se sirven http_cache_max_age
+# segundos sin preguntar y después se revalidan con el ETag. Sin autenticación, no hay nada privado que proteger
+CACHE_CONTROL = f"public, max-age={settings.http_cache_max_age}" if settings.http_cache_max_age > 0 else "public, no-cache"
+
+class Validators:
+    """ETag y Last-Modified de una respuesta GET, calculados a partir de la Version de los datos que devuelve"""
+
+    def __init__(self, request: Request, version: Version):
+        # La ruta y los parámetros (filtros, cursor, limit...) forman parte del validador: cada página
+        # o filtro de una misma colección tiene su propio ETag
+        last_modified = version.last_modified.isoformat() if version.last_modified else ""
+        params = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+        digest = hashlib.sha1(f"{request.url.path}?{params}|{version.count}|{last_modified}".encode()).hexdigest()
+        # Débil: dos respuestas con el mismo ETag son equivalentes, no idénticas byte a byte
+        self.etag = f'W/"{digest[:32]}"'
+        self.last_modified = version.last_modified
+
+    def etag_matches(self, request: Request) -> bool:
+        if_none_match = request.headers.get("if-none-match")
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        # Comparación débil (RFC 9110): se ignora el prefijo W/
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return self.etag.removeprefix("W/") in candidates
+
+    def not_modified_since(self, request: Request) -> bool:
+        # If-Modified-Since solo se tiene en cuenta si no viene If-None-Match (RFC 9110)
+        if_modified_since = request.headers.get("if-modified-since")
+        if not if_modified_since or self.last_modified is None or "if-none-match" in request.headers:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Last-Modified tiene resolución de segundos
+        return int(self._utc_last_modified().timestamp()) <= int(since.timestamp())
+
+    def _utc_last_modified(self):
+        # updated_at se guarda como hora local sin zona (datetime.now)
+        return self.last_modified.astimezone(timezone.utc) # type: ignore[union-attr]
+
+    def headers(self) -> Dict[str, str]:
+        # También en el 304: actualiza la política de la copia que la caché ya tiene
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self._utc_last_modified(), usegmt=True)
+        return headers
+
+    def not_modified(self) -> Response:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=self.headers())
+
+
+async def conditional_collection(request: Request, response: Response, service: ServiceRunner[S],
+                                 version: Callable[[S], Version], load: Callable[[S], R]) -> Union[R, Response]:
+    """
+    GET condicional de una colección: primero una consulta agregada (COUNT + MAX(updated_at)) y, solo si
+    el ETag no coincide con If-None-Match, la carga de las filas. Ambas en el mismo viaje al servicio.
+    """
+    def use_case(s: S) -> Any:
+        validators = Validators(request, version(s))
+        # En colecciones solo vale el ETag: un borrado puede no mover MAX(updated_at), pero sí COUNT(*)
+        if validators.etag_matches(request):
+            return validators, _NOT_MODIFIED
+        return validators, load(s)
+
+    validators, result = await service.run(use_case)
+    if result is _NOT_MODIFIED:
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return result
+
+
+async def conditional_resource(request: Request, response: Response, service: ServiceRunner[S],
+                               load: Callable[[S], Optional[R]]) -> Union[R, Response, None]:
+    """GET condicional de un único recurso: el validador sale de su propio updated_at"""
+    entity = await service.run(load)
+    if entity is None:
+        return None
+    validators = Validators(request, Version(1, getattr(entity, "updated_at", None)))
+    if validators.etag_matches(request) or validators.not_modified_since(request):
+        return validators.not_modified()
+    response.headers.update(validators.headers())
+    return entity
@@ -1,14 +1,36 @@
-from typing import Annotated, Generator
+from typing import Annotated, Callable, Generator, Literal, Optional, TypeVar
 from fastapi.params import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from src.infrastructure.database import SessionLocal
+from src.infrastructure.async_database import DATABASE_ASYNC, get_async_db
+from src.infrastructure.adapters.api.service_runner import ServiceRunner, ThreadpoolServiceRunner, AsyncSessionServiceRunner
 from src.infrastructure.repositories.sqlalchemy_project_repository import SQLAlchemyProjectRepository
 from src.infrastructure.repositories.sqlalchemy_epic_repository import SQLAlchemyEpicRepository
 from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+from src.infrastructure.repositories.sqlalchemy_unit_of_work import SQLAlchemyUnitOfWork
+from src.infrastructure.repositories.sqlalchemy_change_log_repository import SQLAlchemyChangeLogRepository
+from src.infrastructure.repositories.sqlalchemy_search_repository import SQLAlchemySearchRepository
+from src.infrastructure.repositories.sqlalchemy_archive_repository import SQLAlchemyArchiveRepository
+from src.infrastructure.repositories.sqlalchemy_export_repository import SQLAlchemyExportRepository
+from src.infrastructure.repositories.cached_project_repository import CachedProjectRepository
+from src.infrastructure.repositories.cached_epic_repository import CachedEpicRepository
+from src.infrastructure.entity_cache import get_cache
+from src.infrastructure.event_broker import get_broker
+from src.domain.repositories.project_repository import ProjectRepository
+from src.domain.repositories.epic_repository import EpicRepository
+from src.infrastructure.repositories.loading import LoadingStrategy
+from src.infrastructure.config.settings import settings
 from src.app.services.project_service import ProjectService
 from src.app.services.epic_service import EpicService
 from src.app.services.task_service import TaskService
+from src.app.services.board_service import BoardService
+from src.app.services.sync_service import SyncService
+from src.app.services.stats_service import StatsService
+from src.app.services.search_service import SearchService
+from src.app.services.export_service import ExportService
 
+S = TypeVar("S")
 
 # 1. Proveedor de la sesión de base de datos
 def get_db() -> Generator[Session, None, None]:
@@ -23,22 +45,83 @@ def get_db() -> Generator[Session, None, None]:
 DbSession = Annotated[Session, Depends(get_db)]
 #El Tipo (Session): Esto es para el editor (Pylance). Le dice: "Lo que hay aquí dentro se comporta como una sesión de base de datos".
 #El Metadato (Depends(get_db)): Esto es una nota adhesiva que solo lee FastAPI. Le dice: "Cuando alguien pida esta caja, primero ejecuta la función get_db y mete el resultado dentro".
+AsyncDbSession = Annotated[AsyncSession, Depends(get_async_db)]
 
-# 2. Proveedor del Servicio de Proyectos
-def get_project_service(db: DbSession) -> ProjectService:
-    # Aquí es donde ocurre el "ensamblaje"
-    repo = SQLAlchemyProjectRepository(db)
-    epic_repo = SQLAlchemyEpicRepository(db) # Lo necesita para validar reglas de negocio
-    return ProjectService(repo, epic_repo)
+# 2. Repositorios de proyectos y épicas: se leen en casi todas las peticiones y cambian poco,
+# así que (si CACHE_ENABLED) se envuelven con una caché read-through; los servicios no lo notan
+def project_repository(db: Session, loading: LoadingStrategy = LoadingStrategy.RAISE) -> ProjectRepository:
+    repo = SQLAlchemyProjectRepository(db, loading=loading)
+    return CachedProjectRepository(repo, get_cache("projects"), db) if settings.cache_enabled else repo
 
-# 3. Proveedor del Servicio de Épicas
-def get_epic_service(db: DbSession) -> EpicService:
+def epic_repository(db: Session) -> EpicRepository:
     repo = SQLAlchemyEpicRepository(db)
-    project_repo = SQLAlchemyProjectRepository(db)
-    return EpicService(repo, project_repo)
+    return CachedEpicRepository(repo, get_cache("epics"), db) if settings.cache_enabled else repo
+
+# 3. Ensamblaje de los servicios a partir de una sesión (síncrona, o la fachada síncrona de una AsyncSession)
+def build_project_service(db: Session) -> ProjectService:
+    # Aquí es donde ocurre el "ensamblaje"
+    repo = project_repository(db)
+    epic_repo = epic_repository(db) # Lo necesita para validar reglas de negocio
+    return ProjectService(repo, epic_repo, SQLAlchemyUnitOfWork(db), get_broker(), SQLAlchemyArchiveRepository(db))
+
+def build_epic_service(db: Session) -> EpicService:
+    repo = epic_repository(db)
+    project_repo = project_repository(db)
+    return EpicService(repo, project_repo, SQLAlchemyUnitOfWork(db), get_broker(), SQLAlchemyArchiveRepository(db))
 
-# 4. Proveedor del Servicio de Tareas
-def get_task_service(db: DbSession) -> TaskService:
+def build_task_service(db: Session) -> TaskService:
     repo = SQLAlchemyTaskRepository(db)
-    epic_repo = SQLAlchemyEpicRepository(db)
-    return TaskService(repo, epic_repo)
\ No newline at end of file
+    epic_repo = epic_repository(db)
+    return TaskService(repo, epic_repo, SQLAlchemyUnitOfWork(db), get_broker(), SQLAlchemyArchiveRepository(db))
+
+def build_board_service(db: Session) -> BoardService:
+    # Solo lectura: no necesita unidad de trabajo. El tablero recorre las relaciones, así que elegimos cómo cargarlas
+    project_repo = project_repository(db, loading=LoadingStrategy(settings.db_loading_strategy))
+    return BoardService(project_repo, epic_repository(db), SQLAlchemyTaskRepository(db))
+
+def build_stats_service(db: Session) -> StatsService:
+    # Solo lectura: los agregados se calculan en la base de datos; la existencia se comprueba con las cachés
+    return StatsService(project_repository(db), epic_repository(db), SQLAlchemyTaskRepository(db))
+
+def build_sync_service(db: Session) -> SyncService:
+    # Solo lectura y sin caché: lo que se devuelve tiene que ser el estado confirmado en la base de datos
+    return SyncService(SQLAlchemyChangeLogRepository(db), SQLAlchemyProjectRepository(db),
+                       SQLAlchemyEpicRepository(db), SQLAlchemyTaskRepository(db))
+
+def build_search_service(db: Session) -> SearchService:
+    # Solo lectura: la existencia del proyecto se comprueba con la caché
+    return SearchService(SQLAlchemySearchRepository(db), project_repository(db))
+
+def build_export_service(db: Session) -> ExportService:
+    # Solo lectura y sin caché: el volcado tiene que ser el estado confirmado en la base de datos
+    return ExportService(SQLAlchemyExportRepository(db), SQLAlchemyProjectRepository(db))
+
+# 4. Proveedores de los servicios para los routers (async).
+# Según la configuración (DATABASE_ASYNC) el servicio se ejecuta en el threadpool con el driver
+# bloqueante o sobre una AsyncSession con el driver async; los routers no cambian.
+# scope="function" cierra la sesión al terminar el endpoint en lugar de al terminar la respuesta: necesario en las
+# respuestas de larga duración (SSE) para no retener una conexión del pool mientras el cliente sigue conectado
+def _service_runner(build: Callable[[Session], S],
+                    scope: Optional[Literal["function", "request"]] = None) -> Callable[..., ServiceRunner[S]]:
+    if DATABASE_ASYNC:
+        def get_async_runner(db: Annotated[AsyncSession, Depends(get_async_db, scope=scope)]) -> ServiceRunner[S]:
+            return AsyncSessionServiceRunner(db, build)
+        return get_async_runner
+
+    def get_runner(db: Annotated[Session, Depends(get_db, scope=scope)]) -> ServiceRunner[S]:
+        return ThreadpoolServiceRunner(db, build)
+    return get_runner
+
+get_project_service = _service_runner(build_project_service)
+get_epic_service = _service_runner(build_epic_service)
+get_task_service = _service_runner(build_task_service)
+get_board_service = _service_runner(build_board_service)
+get_stats_service = _service_runner(build_stats_service)
+get_sync_service = _service_runner(build_sync_service)
+get_search_service = _service_runner(build_search_service)
+get_stream_project_service = _service_runner(build_project_service, scope="function")
+
+# 5. Volcados en streaming: siempre con la sesión síncrona (también con DATABASE_ASYNC), que sigue abierta hasta
+# terminar de enviar la respuesta (scope "request", el de por defecto) para leer el cursor del servidor mientras tanto
+def get_export_service(db: DbSession) -> ExportService:
+    return build_export_service(db)
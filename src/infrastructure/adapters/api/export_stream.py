@@ -0,0 +1,92 @@
+import csv
+import datetime
+import io
+import json
+import zlib
+from enum import Enum
+from typing import Any, Dict, Iterable, Iterator, Literal, Tuple
+from fastapi.responses import StreamingResponse
+from src.app.services.export_service import ExportRecord
+
+ExportFormat = Literal["ndjson", "csv"]
+
+# Columnas del volcado: las de proyectos, épicas y tareas en una sola tabla (en CSV, vacías si no aplican)
+EXPORT_COLUMNS = ("type", "id", "project_id", "epic_id", "name", "description", "status", "priority", "assignee",
+                  "budget", "start_date", "end_date", "target_date", "finalization_date", "finalization_criteria",
+                  "completion_criteria", "updated_at")
+
+# Se envía en trozos de este tamaño: pocas escrituras al socket y memoria constante
+CHUNK_SIZE = 64 * 1024
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+def _value(value: Any) -> Any:
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return value
+
+# Columnas de cada entidad, calculadas una vez por clase y no en cada fila
+_entity_columns: Dict[type, Tuple[str, ...]] = {}
+
+def _row(record: ExportRecord) -> Dict[str, Any]:
+    entity_type, entity = record
+    columns = _entity_columns.get(type(entity))
+    if columns is None:
+        columns = _entity_columns[type(entity)] = tuple(c for c in EXPORT_COLUMNS[1:] if hasattr(entity, c))
+    row: Dict[str, Any] = {"type": entity_type.value}
+    for column in columns:
+        row[column] = _value(getattr(entity, column))
+    return row
+
+def _ndjson(records: Iterable[ExportRecord]) -> Iterator[str]:
+    # Una línea JSON por proyecto, épica o tarea, solo con sus propios campos
+    for record in records:
+        yield json.dumps(_row(record), ensure_ascii=False) + "\n"
+
+def _csv(records: Iterable[ExportRecord]) -> Iterator[str]:
+    # Un único buffer reutilizado: el módulo csv se encarga de las comillas y los saltos de línea
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS, lineterminator="\n")
+    writer.writeheader()
+    for record in records:
+        writer.writerow(_row(record))
+        if buffer.tell() >= CHUNK_SIZE:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+def _chunks(lines: Iterable[str]) -> Iterator[bytes]:
+    pending, size = [], 0
+    for line in lines:
+        pending.append(line)
+        size += len(line)
+        if size >= CHUNK_SIZE:
+            yield "".join(pending).encode()
+            pending, size = [], 0
+    if pending:
+        yield "".join(pending).encode()
+
+def _gzip(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # Compresión incremental (formato gzip): nunca se guarda el volcado entero, ni comprimido ni sin comprimir
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def export_response(records: Iterable[ExportRecord], export_format: ExportFormat, gzip: bool,
+                    filename: str) -> StreamingResponse:
+    """Respuesta en streaming con el volcado en NDJSON o CSV, opcionalmente como fichero .gz"""
+    body = _chunks(_ndjson(records) if export_format == "ndjson" else _csv(records))
+    filename = f"{filename}.{export_format}"
+    media_type = MEDIA_TYPES[export_format]
+    if gzip:
+        # Un fichero .gz para descargar, no Content-Encoding: el cliente recibe exactamente lo que guarda
+        body, filename, media_type = _gzip(body), f"{filename}.gz", "application/gzip"
+    # El generador es síncrono: Starlette lo recorre en el threadpool, así que el cursor no bloquea el event loop
+    return StreamingResponse(body, media_type=media_type,
+                             headers={"Content-Disposition": f'attachment; filename="{filename}"'})
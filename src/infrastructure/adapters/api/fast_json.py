@@ -0,0 +1,54 @@
+from typing import Any, Generic, Mapping, Optional, Type, TypeVar, Union, get_args, get_origin
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from src.infrastructure.config.settings import settings
+
+T = TypeVar("T")
+
+# Serialización directa a bytes de las entidades de dominio (FAST_SERIALIZATION=true).
+# Con response_model, FastAPI valida cada entidad contra el schema (from_attributes), la vuelca a dict y después
+# la pasa por json.dumps; en un listado grande eso cuesta más que la consulta. Aquí un TypeAdapter del tipo de
+# dominio, construido una vez, escribe el JSON en Rust sin volver a validar datos que acabamos de leer.
+# El response_model de la ruta se sigue usando para la documentación y para elegir los campos que se exponen
+
+def _include(annotation: Any) -> Any:
+    # Campos del schema de respuesta, recursivamente: las entidades tienen campos que la API no expone (created_at...)
+    if get_origin(annotation) is list:
+        return {"__all__": _include(get_args(annotation)[0])}
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return {name: _include(field.annotation) for name, field in annotation.model_fields.items()}
+    return True
+
+class EntitySerializer(Generic[T]):
+    """JSON de una entidad (o lista, página, tablero...) con los campos de un schema de respuesta, sin validarla"""
+
+    def __init__(self, entity_type: Any, response_model: Any):
+        self._adapter: TypeAdapter[T] = TypeAdapter(entity_type)
+        self._include = _include(response_model)
+
+    def dump_json(self, content: T) -> bytes:
+        return self._adapter.dump_json(content, include=self._include)
+
+
+class EntityJSONResponse(Response):
+    media_type = "application/json"
+
+    def __init__(self, content: Any, serializer: EntitySerializer, status_code: int = 200,
+                 headers: Optional[Mapping[str, str]] = None):
+        self.serializer = serializer
+        super().__init__(content, status_code=status_code, headers=headers)
+
+    def render(self, content: Any) -> bytes:
+        return self.serializer.dump_json(content)
+
+
+def entity_response(content: Union[T, Response], serializer: EntitySerializer[T], response: Response) -> Any:
+    """
+    Con FAST_SERIALIZATION, envuelve el resultado de una ruta en un EntityJSONResponse; si no, lo devuelve tal cual
+    para que FastAPI lo valide con el response_model. Las respuestas ya construidas (304) no se tocan.
+    """
+    if not settings.fast_serialization or isinstance(content, Response):
+        return content
+    # Al devolver una Response, FastAPI ya no copia las cabeceras de la inyectada (ETag, Last-Modified)
+    headers = {key: value for key, value in response.headers.items() if key != "content-length"}
+    return EntityJSONResponse(content, serializer, headers=headers)
@@ -0,0 +1,95 @@
+import bisect
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.infrastructure.query_metrics import RequestQueries, track_queries
+
+logger = logging.getLogger("kanban.requests")
+
+# Límites (en segundos) del histograma de latencia de cada ruta
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Las peticiones que no encajan con ninguna ruta (404) se agrupan para no crear una serie por URL
+UNMATCHED_ROUTE = "<unmatched>"
+
+@dataclass
+class RouteMetrics:
+    """Latencia y sentencias SQL acumuladas de una ruta (método + plantilla, p. ej. GET /tasks/{task_id})"""
+    requests: int = 0
+    server_errors: int = 0
+    seconds_total: float = 0.0
+    seconds_max: float = 0.0
+    # Peticiones por tramo de LATENCY_BUCKETS (no acumuladas); la última posición es +Inf
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+    statements_total: int = 0
+    statements_max: int = 0
+    db_seconds_total: float = 0.0
+    n_plus_one: int = 0
+
+
+# Todas las peticiones se registran desde el event loop, así que no hace falta lock
+_routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+def route_snapshot() -> Dict[Tuple[str, str], RouteMetrics]:
+    return dict(_routes)
+
+def server_timing(queries: RequestQueries, elapsed: float) -> str:
+    noun = "query" if queries.statements == 1 else "queries"
+    return (f'db;dur={queries.db_seconds * 1000:.1f};desc="{queries.statements} {noun}", '
+            f"app;dur={elapsed * 1000:.1f}")
+
+
+class InstrumentationMiddleware:
+    """
+    Mide cada petición HTTP: latencia por plantilla de ruta, sentencias SQL y tiempo en la base de datos.
+    Con server_timing añade la cabecera Server-Timing (db y app, visible en las devtools del navegador) y avisa en el
+    log kanban.requests de las peticiones que lanzan más de n_plus_one_threshold sentencias (0: sin aviso)
+    """
+
+    def __init__(self, app: ASGIApp, server_timing: bool = True, n_plus_one_threshold: int = 20):
+        self.app = app
+        self.server_timing = server_timing
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = 500
+        with track_queries() as queries:
+            async def send_with_timing(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    # En las respuestas en streaming (exportación) solo cuenta lo ejecutado antes de la primera línea
+                    if self.server_timing:
+                        MutableHeaders(scope=message).append("Server-Timing",
+                                                             server_timing(queries, time.perf_counter() - start))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._record(scope, status, time.perf_counter() - start, queries)
+
+    def _record(self, scope: Scope, status: int, elapsed: float, queries: RequestQueries) -> None:
+        # El router deja en el scope la ruta que ha atendido la petición; su path es la plantilla con el prefijo
+        route = getattr(scope.get("route"), "path", None) or UNMATCHED_ROUTE
+        metrics = _routes.setdefault((scope["method"], route), RouteMetrics())
+        metrics.requests += 1
+        metrics.server_errors += status >= 500
+        metrics.seconds_total += elapsed
+        metrics.seconds_max = max(metrics.seconds_max, elapsed)
+        metrics.buckets[bisect.bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+        metrics.statements_total += queries.statements
+        metrics.statements_max = max(metrics.statements_max, queries.statements)
+        metrics.db_seconds_total += queries.db_seconds
+        if 0 < self.n_plus_one_threshold < queries.statements:
+            metrics.n_plus_one += 1
+            logger.warning("Possible N+1: %s %s issued %d SQL statements (threshold %d, %.1f ms in the database)",
+                           scope["method"], route, queries.statements, self.n_plus_one_threshold,
+                           queries.db_seconds * 1000)
@@ -0,0 +1,124 @@
+from typing import Dict, Iterable, List, Mapping, Tuple, Union
+from src.infrastructure.adapters.api.instrumentation import LATENCY_BUCKETS, route_snapshot
+from src.infrastructure.entity_cache import cache_snapshot
+from src.infrastructure.event_broker import broker_snapshot
+from src.infrastructure.jobs.overdue_scheduler import scheduler_snapshot
+from src.infrastructure.pool_metrics import pool_snapshot
+from src.infrastructure.query_metrics import query_snapshot
+
+# Formato de texto de Prometheus (version 0.0.4) de GET /metrics. Reúne las métricas de las peticiones HTTP y de las
+# sentencias SQL con los contadores que ya exponen en JSON /metrics/pool, /metrics/cache, /metrics/events y /overdue
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Labels = Mapping[str, str]
+Number = Union[int, float]
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+class _Exposition:
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def metric(self, name: str, kind: str, help_text: str, samples: Iterable[Tuple[Labels, Number]]) -> None:
+        self.lines.append(f"# HELP {name} {help_text}")
+        self.lines.append(f"# TYPE {name} {kind}")
+        for labels, value in samples:
+            self.lines.append(f"{name}{_labels(labels)} {value}")
+
+    def family(self, metrics: Dict[str, Tuple[str, str, str]], snapshot: Mapping[str, Mapping[str, Number]],
+               label: str) -> None:
+        # Un snapshot {nombre: {contador: valor}} -> una métrica por contador con el nombre como etiqueta
+        for counter, (metric, kind, help_text) in metrics.items():
+            self.metric(metric, kind, help_text,
+                        [({label: name}, values[counter]) for name, values in snapshot.items() if counter in values])
+
+    def render(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _http(exposition: _Exposition) -> None:
+    routes = sorted(route_snapshot().items())
+    histogram: List[str] = []
+    for (method, route), metrics in routes:
+        labels = {"method": method, "route": route}
+        cumulative = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), metrics.buckets):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            histogram.append(f"http_request_duration_seconds_bucket{_labels({**labels, 'le': le})} {cumulative}")
+        histogram.append(f"http_request_duration_seconds_sum{_labels(labels)} {metrics.seconds_total:.6f}")
+        histogram.append(f"http_request_duration_seconds_count{_labels(labels)} {metrics.requests}")
+    exposition.lines.append("# HELP http_request_duration_seconds Request latency by route template")
+    exposition.lines.append("# TYPE http_request_duration_seconds histogram")
+    exposition.lines.extend(histogram)
+
+    def per_route(attribute: str) -> List[Tuple[Labels, Number]]:
+        return [({"method": method, "route": route}, getattr(metrics, attribute))
+                for (method, route), metrics in routes]
+
+    exposition.metric("http_server_errors_total", "counter", "Requests answered with a 5xx status",
+                      per_route("server_errors"))
+    exposition.metric("http_request_duration_seconds_max", "gauge", "Slowest request since start",
+                      per_route("seconds_max"))
+    exposition.metric("http_request_db_statements_total", "counter", "SQL statements issued by requests",
+                      per_route("statements_total"))
+    exposition.metric("http_request_db_statements_max", "gauge", "Most SQL statements issued by a single request",
+                      per_route("statements_max"))
+    exposition.metric("http_request_db_seconds_total", "counter", "Time spent executing SQL statements",
+                      [(labels, round(value, 6)) for labels, value in per_route("db_seconds_total")])
+    exposition.metric("http_request_n_plus_one_total", "counter",
+                      "Requests that issued more SQL statements than N_PLUS_ONE_THRESHOLD", per_route("n_plus_one"))
+
+
+def render_metrics() -> str:
+    exposition = _Exposition()
+    _http(exposition)
+    exposition.family({
+        "statements": ("db_statements_total", "counter", "SQL statements executed by the engine"),
+        "seconds_total": ("db_statement_seconds_total", "counter", "Time spent executing SQL statements"),
+        "slow_statements": ("db_slow_statements_total", "counter", "Statements slower than SLOW_QUERY_MS"),
+    }, query_snapshot(), "engine")
+    exposition.family({
+        "connects": ("db_pool_connects_total", "counter", "New DBAPI connections"),
+        "checkouts": ("db_pool_checkouts_total", "counter", "Connections checked out from the pool"),
+        "checkins": ("db_pool_checkins_total", "counter", "Connections returned to the pool"),
+        "invalidations": ("db_pool_invalidations_total", "counter",
+                          "Connections invalidated (including failed pre-pings)"),
+        "checkout_waits": ("db_pool_checkout_waits_total", "counter", "Checkouts that went through the pool queue"),
+        "checkout_wait_seconds_total": ("db_pool_checkout_wait_seconds_total", "counter",
+                                        "Time spent waiting for a free connection"),
+        "checkout_wait_seconds_max": ("db_pool_checkout_wait_seconds_max", "gauge",
+                                      "Longest wait for a free connection"),
+        "size": ("db_pool_size", "gauge", "Configured pool size"),
+        "checked_out": ("db_pool_checked_out", "gauge", "Connections currently in use"),
+        "checked_in": ("db_pool_checked_in", "gauge", "Idle connections in the pool"),
+        "overflow": ("db_pool_overflow", "gauge", "Connections open beyond the pool size"),
+    }, pool_snapshot(), "engine")
+    exposition.family({
+        "hits": ("entity_cache_hits_total", "counter", "Cache hits"),
+        "misses": ("entity_cache_misses_total", "counter", "Cache misses"),
+        "evictions": ("entity_cache_evictions_total", "counter", "Entries evicted by the LRU"),
+        "expirations": ("entity_cache_expirations_total", "counter", "Entries expired by the TTL"),
+        "invalidations": ("entity_cache_invalidations_total", "counter", "Entries invalidated by writes"),
+        "size": ("entity_cache_entries", "gauge", "Entries in the cache"),
+    }, cache_snapshot(), "cache")
+    events = broker_snapshot()
+    exposition.metric("events_subscribers", "gauge", "Live board connections in this worker",
+                      [({}, events["subscribers"])])
+    for counter in ("published", "delivered", "coalesced", "overflows", "publish_errors"):
+        exposition.metric(f"events_{counter}_total", "counter", f"Board events {counter.replace('_', ' ')}",
+                          [({}, events[counter])])
+    overdue = scheduler_snapshot()
+    exposition.metric("overdue_scheduler_running", "gauge", "Whether this worker runs the overdue scheduler",
+                      [({}, int(bool(overdue["running"])))])
+    for counter in ("ticks", "alerts", "queries", "errors"):
+        if counter in overdue:
+            exposition.metric(f"overdue_scheduler_{counter}_total", "counter", f"Overdue scheduler {counter}",
+                              [({}, overdue[counter])])
+    return exposition.render()
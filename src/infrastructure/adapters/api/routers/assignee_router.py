@@ -0,0 +1,49 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from typing import Annotated, Literal, Optional
+from src.app.services.task_service import TaskService
+from src.app.services.stats_service import StatsService
+from src.app.schemas.task_schema import TaskPage
+from src.app.schemas.stats_schema import AssigneeWorkloadPage
+from src.domain.entities.task import TaskStatus, TaskPriority
+from src.infrastructure.adapters.api.dependencies import get_task_service, get_stats_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.adapters.api.conditional import conditional_collection
+from src.infrastructure.adapters.api.routers.task_router import TASK_PAGE_JSON
+from src.infrastructure.adapters.api.fast_json import entity_response
+from fastapi import Depends
+
+# Definimos el router
+router = APIRouter(
+    prefix="/assignees",
+    tags=["Assignees"]
+)
+
+TaskServiceDep = Annotated[ServiceRunner[TaskService], Depends(get_task_service)]
+StatsServiceDep = Annotated[ServiceRunner[StatsService], Depends(get_stats_service)]
+
+@router.get("/workload", response_model=AssigneeWorkloadPage)
+async def get_workload(service: StatsServiceDep,
+                       limit: int = Query(50, ge=1, le=500),
+                       cursor: Optional[str] = None):
+    # Total, vencidas y desglose por estado y prioridad de cada persona con tareas asignadas
+    try:
+        return await service.run(lambda s: s.get_assignees_workload(limit, cursor=cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/{assignee}/tasks", response_model=TaskPage)
+async def list_assignee_tasks(assignee: str, request: Request, response: Response, service: TaskServiceDep,
+                              limit: int = Query(50, ge=1, le=500),
+                              cursor: Optional[str] = None,
+                              order_by: Literal["id", "updated_at"] = "id",
+                              status: Optional[TaskStatus] = None,
+                              priority: Optional[TaskPriority] = None):
+    # La pantalla "mis tareas": paginación keyset sobre los índices (assignee, id) / (assignee, updated_at)
+    try:
+        return entity_response(await conditional_collection(
+            request, response, service,
+            lambda s: s.get_tasks_version(status=status, priority=priority, assignee=assignee),
+            lambda s: s.list_tasks(limit, cursor=cursor, order_by=order_by, status=status,
+                                   priority=priority, assignee=assignee)), TASK_PAGE_JSON, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import List, Annotated, Literal, Optional
 from src.app.services.epic_service import EpicService
-from src.app.schemas.epic_schema import EpicCreate, EpicResponse
-from src.infrastructure.adapters.api.dependencies import get_epic_service
+from src.app.services.stats_service import StatsService
+from src.app.schemas.epic_schema import EpicCreate, EpicResponse, EpicPage, EpicBulkCreate, EpicBulkUpdate, EpicBulkResponse
+from src.app.schemas.bulk_schema import BulkDeleteRequest, BulkDeleteResponse
+from src.app.schemas.stats_schema import MAX_STATS_IDS, EpicStatsList, EpicStatsResponse
+from src.domain.entities.epic import Epic, EpicStatus, EpicPriority
+from src.domain.entities.page import Page
+from src.infrastructure.adapters.api.dependencies import get_epic_service, get_stats_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.adapters.api.conditional import conditional_collection, conditional_resource
+from src.infrastructure.adapters.api.fast_json import EntitySerializer, entity_response
 from fastapi import Depends
 
 # Definimos el router
@@ -12,40 +20,108 @@ router = APIRouter(
 )
 
 # Alias para la inyección del servicio, así el código queda más corto
-EpicServiceDep = Annotated[EpicService, Depends(get_epic_service)]
+EpicServiceDep = Annotated[ServiceRunner[EpicService], Depends(get_epic_service)]
+StatsServiceDep = Annotated[ServiceRunner[StatsService], Depends(get_stats_service)]
+
+# JSON de los listados sin validar cada épica contra el schema (solo con FAST_SERIALIZATION)
+EPIC_PAGE_JSON = EntitySerializer(Page[Epic], EpicPage)
+EPIC_LIST_JSON = EntitySerializer(List[Epic], List[EpicResponse])
 
 @router.post("/", response_model=EpicResponse, status_code=status.HTTP_201_CREATED)
-def create_epic(epic_data: EpicCreate, service: EpicServiceDep):
+async def create_epic(epic_data: EpicCreate, service: EpicServiceDep):
     try:
         # El router extrae los datos del Schema y se los pasa al servicio
-        return service.create_epic(
+        return await service.run(lambda s: s.create_epic(
             name=epic_data.name, 
             description=epic_data.description,
             project_id=epic_data.project_id
-        )
+        ))
     except ValueError as e:
         # Si el servicio lanza un error de negocio, lo convertimos en una respuesta HTTP con código 400
         raise HTTPException(status_code=400, detail=str(e))
     
-@router.get("/", response_model=List[EpicResponse])
-def list_epics(service: EpicServiceDep):
-    # El servicio devuelve Entidades de Dominio, 
-    # pero FastAPI las convierte a EpicResponse automáticamente
-    return service.get_all_epics()
+# Operaciones masivas. Van antes que las rutas "/{epic_id}" para que "bulk" no se interprete como un ID.
+# Responden 200 con los elementos aplicados y, en "errors", los que incumplen alguna regla de negocio
+@router.post("/bulk", response_model=EpicBulkResponse)
+async def bulk_create_epics(bulk_data: EpicBulkCreate, service: EpicServiceDep):
+    try:
+        # A diferencia de POST /, se respetan todos los campos del schema (importaciones desde otras herramientas)
+        epics = [Epic(**item.model_dump()) for item in bulk_data.items]
+        return await service.run(lambda s: s.bulk_create_epics(epics))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.patch("/bulk", response_model=EpicBulkResponse)
+async def bulk_update_epics(bulk_data: EpicBulkUpdate, service: EpicServiceDep):
+    # Solo los campos enviados con valor; el resto se conserva
+    changes = [(item.id, item.model_dump(exclude_unset=True, exclude_none=True, exclude={"id"})) for item in bulk_data.items]
+    return await service.run(lambda s: s.bulk_update_epics(changes))
+
+@router.delete("/bulk", response_model=BulkDeleteResponse)
+async def bulk_delete_epics(bulk_data: BulkDeleteRequest, service: EpicServiceDep):
+    return await service.run(lambda s: s.bulk_delete_epics(bulk_data.ids))
+
+@router.get("/stats", response_model=EpicStatsList)
+async def get_epics_stats(service: StatsServiceDep,
+                          ids: str = Query(..., pattern=r"^\d+(,\d+)*$", description="IDs separados por comas")):
+    # Progreso de muchas épicas (p.ej. todas las de un tablero) con un único GROUP BY; los IDs inexistentes se omiten
+    epic_ids = [int(epic_id) for epic_id in ids.split(",")]
+    if len(epic_ids) > MAX_STATS_IDS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_STATS_IDS} ids are allowed.")
+    stats = await service.run(lambda s: s.get_epics_stats(epic_ids))
+    return {"items": stats}
+
+@router.get("/{epic_id}/stats", response_model=EpicStatsResponse)
+async def get_epic_stats(epic_id: int, service: StatsServiceDep):
+    try:
+        return await service.run(lambda s: s.get_epic_stats(epic_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Epic {epic_id} not found")
+
+@router.get("/", response_model=EpicPage)
+async def list_epics(request: Request, response: Response, service: EpicServiceDep,
+                     limit: int = Query(50, ge=1, le=500),
+                     cursor: Optional[str] = None,
+                     order_by: Literal["id", "updated_at"] = "id",
+                     status: Optional[EpicStatus] = None,
+                     priority: Optional[EpicPriority] = None,
+                     project_id: Optional[int] = None):
+    # El servicio devuelve una página de Entidades de Dominio,
+    # pero FastAPI las convierte a EpicPage automáticamente.
+    # Con If-None-Match y sin cambios se responde 304 tras una sola consulta agregada
+    try:
+        return entity_response(await conditional_collection(
+            request, response, service,
+            lambda s: s.get_epics_version(status=status, priority=priority, project_id=project_id),
+            lambda s: s.list_epics(limit, cursor=cursor, order_by=order_by, status=status,
+                                   priority=priority, project_id=project_id)), EPIC_PAGE_JSON, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{epic_id}", response_model=EpicResponse)
-def get_epic(epic_id: int, service: EpicServiceDep):
-    epic = service.get_epic_by_id(epic_id)
+async def get_epic(epic_id: int, request: Request, response: Response, service: EpicServiceDep,
+                   include_archived: bool = False):
+    # include_archived: si no está en la tabla viva, se busca en el archivo (solo lectura)
+    epic = await conditional_resource(request, response, service,
+                                      lambda s: s.get_epic_by_id(epic_id, include_archived=include_archived))
     if not epic:
         raise HTTPException(status_code=404, detail=f"Epic {epic_id} not found")
     return epic
 
 @router.get("/project-epic/{project_id}", response_model=List[EpicResponse])
-def get_epics_by_project(project_id: int, service: EpicServiceDep):
-    return service.get_epics_by_project_id(project_id)
+async def get_epics_by_project(project_id: int, request: Request, response: Response, service: EpicServiceDep,
+                               include_archived: bool = False):
+    # El ETag sale de las épicas vivas: archivar cambia su número y el archivo no se modifica después
+    try:
+        return entity_response(await conditional_collection(request, response, service,
+                                                            lambda s: s.get_epics_version(project_id=project_id),
+                                                            lambda s: s.get_epics_by_project_id(project_id, include_archived=include_archived)),
+                               EPIC_LIST_JSON, response)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
 
 @router.put("/{epic_id}", response_model=EpicResponse)
-def update_epic(epic_id: int, epic_data: EpicCreate, service: EpicServiceDep):
+async def update_epic(epic_id: int, epic_data: EpicCreate, service: EpicServiceDep):
     try:
         # Importamos la entidad para convertir el schema de entrada
         from src.domain.entities.epic import Epic
@@ -57,7 +133,7 @@ def update_epic(epic_id: int, epic_data: EpicCreate, service: EpicServiceDep):
             project_id=epic_data.project_id
         )
         
-        updated = service.update_epic(epic_entity, epic_id)
+        updated = await service.run(lambda s: s.update_epic(epic_entity, epic_id))
         if not updated:
             raise HTTPException(status_code=404, detail="Epic not found")
         return updated
@@ -65,12 +141,13 @@ def update_epic(epic_id: int, epic_data: EpicCreate, service: EpicServiceDep):
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.delete("/{epic_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_epic(epic_id: int, service: EpicServiceDep):
-    deleted = service.delete_epic(epic_id)
+async def delete_epic(epic_id: int, service: EpicServiceDep):
+    deleted = await service.run(lambda s: s.delete_epic(epic_id))
     if not deleted:
         raise HTTPException(status_code=404, detail="Epic not found")
     return None  # FastAPI interpretará esto como una respuesta vacía con código 204
 
 @router.get("/count/{project_id}", response_model=int)
-def count_epics_by_project(project_id: int, service: EpicServiceDep):
-    return service.count_epics_by_project_id(project_id)
\ No newline at end of file
+async def count_epics_by_project(project_id: int, service: EpicServiceDep, status: Optional[EpicStatus] = None):
+    # Se lee de los contadores del proyecto: coste constante aunque tenga miles de épicas
+    return await service.run(lambda s: s.count_epics_by_project_id(project_id, status))
\ No newline at end of file
@@ -0,0 +1,94 @@
+import asyncio
+import json
+from typing import Annotated, AsyncIterator
+from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect, status
+from fastapi.responses import StreamingResponse
+from src.app.services.project_service import ProjectService
+from src.infrastructure.adapters.api.dependencies import get_stream_project_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.event_broker import EventBatch, Subscription, event_to_dict, get_broker
+from fastapi import Depends
+
+# Definimos el router
+router = APIRouter(
+    prefix="/projects",
+    tags=["Events"]
+)
+
+# La sesión se cierra al comprobar el proyecto: una conexión abierta durante horas no ocupa el pool
+ProjectServiceDep = Annotated[ServiceRunner[ProjectService], Depends(get_stream_project_service, scope="function")]
+
+# Cada cuánto se envía algo aunque no haya cambios, para que proxies y balanceadores no corten la conexión
+HEARTBEAT_SECONDS = 15
+
+def batch_payload(project_id: int, batch: EventBatch) -> dict:
+    # Solo identificadores: el cliente recarga lo que necesite (p.ej. con GET /sync o el tablero)
+    changes = [{key: value for key, value in event_to_dict(event).items() if key != "project_id"} for event in batch.events]
+    return {"project_id": project_id, "resync": batch.resync, "changes": changes}
+
+async def _ensure_project(service: ServiceRunner[ProjectService], project_id: int) -> bool:
+    try:
+        return bool(await service.run(lambda s: s.get_project_by_id(project_id)))
+    except ValueError:
+        return False
+
+@router.get("/{project_id}/events")
+async def stream_project_events(project_id: int, service: ProjectServiceDep):
+    # Server-Sent Events: un mensaje "changes" por lote agrupado, o "resync" si la conexión se quedó atrás
+    if not await _ensure_project(service, project_id):
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    subscription = get_broker().subscribe(project_id)
+
+    async def events() -> AsyncIterator[str]:
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                batch = await subscription.next_batch(HEARTBEAT_SECONDS)
+                if batch is None:
+                    yield ": ping\n\n"
+                    continue
+                event = "resync" if batch.resync else "changes"
+                yield f"event: {event}\ndata: {json.dumps(batch_payload(project_id, batch))}\n\n"
+        finally:
+            # Starlette cancela el generador cuando el cliente se desconecta
+            get_broker().unsubscribe(subscription)
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@router.websocket("/{project_id}/events/ws")
+async def project_events_websocket(websocket: WebSocket, project_id: int, service: ProjectServiceDep):
+    # Los mismos mensajes que el SSE, como JSON con un campo "type"
+    if not await _ensure_project(service, project_id):
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason=f"Project {project_id} not found")
+        return
+    await websocket.accept()
+    subscription = get_broker().subscribe(project_id)
+    sender = asyncio.create_task(_send_batches(websocket, project_id, subscription))
+    receiver = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        # Termina en cuanto el cliente se va o falla el envío
+        await asyncio.wait({sender, receiver}, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        sender.cancel()
+        receiver.cancel()
+        get_broker().unsubscribe(subscription)
+
+async def _send_batches(websocket: WebSocket, project_id: int, subscription: Subscription) -> None:
+    try:
+        while True:
+            batch = await subscription.next_batch(HEARTBEAT_SECONDS)
+            if batch is None:
+                await websocket.send_json({"type": "ping"})
+                continue
+            await websocket.send_json({"type": "resync" if batch.resync else "changes", **batch_payload(project_id, batch)})
+    except (WebSocketDisconnect, RuntimeError):
+        return # El cliente se fue mientras enviábamos
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    # El cliente no envía nada útil: solo leemos para enterarnos de la desconexión
+    try:
+        while True:
+            await websocket.receive_text()
+    except (WebSocketDisconnect, RuntimeError):
+        return
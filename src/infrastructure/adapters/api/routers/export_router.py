@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException
+from typing import Annotated
+from starlette.concurrency import run_in_threadpool
+from src.app.services.export_service import ExportService
+from src.infrastructure.adapters.api.dependencies import get_export_service
+from src.infrastructure.adapters.api.export_stream import ExportFormat, export_response
+from fastapi import Depends
+
+# Definimos el router
+router = APIRouter(
+    tags=["Export"]
+)
+
+ExportServiceDep = Annotated[ExportService, Depends(get_export_service)]
+
+# Volcados completos para informes: proyectos, épicas y tareas en NDJSON o CSV, enviados a medida que se leen
+# (memoria constante sea cual sea el tamaño). gzip=true descarga un fichero .gz
+@router.get("/projects/{project_id}/export")
+async def export_project(project_id: int, service: ExportServiceDep, format: ExportFormat = "ndjson",
+                         gzip: bool = False):
+    try:
+        # La comprobación de que el proyecto existe se hace antes de empezar la respuesta, para poder responder 404
+        records = await run_in_threadpool(service.export_project, project_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+    return export_response(records, format, gzip, f"project-{project_id}")
+
+@router.get("/export")
+async def export_all(service: ExportServiceDep, format: ExportFormat = "ndjson", gzip: bool = False):
+    return export_response(service.export_all(), format, gzip, "kanban")
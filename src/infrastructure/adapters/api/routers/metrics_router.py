@@ -0,0 +1,39 @@
+from typing import Dict, Union
+from fastapi import APIRouter, Response
+from src.infrastructure.adapters.api.prometheus import CONTENT_TYPE, render_metrics
+from src.infrastructure.pool_metrics import pool_snapshot
+from src.infrastructure.entity_cache import cache_snapshot
+from src.infrastructure.event_broker import broker_snapshot
+from src.infrastructure.jobs.overdue_scheduler import scheduler_snapshot
+
+# Definimos el router
+router = APIRouter(
+    prefix="/metrics",
+    tags=["Metrics"]
+)
+
+@router.get("", response_class=Response, responses={200: {"content": {CONTENT_TYPE: {}}}})
+async def get_prometheus_metrics():
+    # Todas las métricas en el formato de texto de Prometheus: latencia y sentencias SQL por ruta, pools, cachés...
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+@router.get("/pool", response_model=Dict[str, Dict[str, Union[int, float]]])
+async def get_pool_metrics():
+    # Espera en el checkout, conexiones en uso y uso del overflow de cada pool (sync / async)
+    return pool_snapshot()
+
+@router.get("/cache", response_model=Dict[str, Dict[str, int]])
+async def get_cache_metrics():
+    # Aciertos, fallos, expulsiones (LRU), caducidades (TTL) e invalidaciones de cada caché de entidades
+    return cache_snapshot()
+
+@router.get("/events", response_model=Dict[str, int])
+async def get_event_metrics():
+    # Conexiones suscritas en este worker, eventos publicados, lotes entregados, eventos agrupados y desbordes
+    return broker_snapshot()
+
+
+@router.get("/overdue", response_model=Dict[str, Union[bool, int, float, str]])
+async def get_overdue_metrics():
+    # Pasadas del planificador de vencimientos, avisos publicados, consultas, errores y marca de agua actual
+    return scheduler_snapshot()
@@ -1,8 +1,18 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Annotated
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import Annotated, Literal, Optional
 from src.app.services.project_service import ProjectService
-from src.app.schemas.project_schema import ProjectCreate, ProjectResponse
-from src.infrastructure.adapters.api.dependencies import get_project_service
+from src.app.services.board_service import BoardService
+from src.app.services.stats_service import StatsService
+from src.app.schemas.project_schema import ProjectCreate, ProjectResponse, ProjectPage
+from src.app.schemas.board_schema import ProjectBoardResponse
+from src.app.schemas.stats_schema import ProjectStatsResponse
+from src.domain.entities.project import Project, ProjectStatus
+from src.domain.entities.page import Page
+from src.domain.entities.board import ProjectBoard
+from src.infrastructure.adapters.api.dependencies import get_project_service, get_board_service, get_stats_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.adapters.api.conditional import conditional_collection, conditional_resource
+from src.infrastructure.adapters.api.fast_json import EntitySerializer, entity_response
 from fastapi import Depends
 
 # Definimos el router
@@ -12,13 +22,19 @@ router = APIRouter(
 )
 
 # Alias para la inyección del servicio, así el código queda más corto
-ProjectServiceDep = Annotated[ProjectService, Depends(get_project_service)]
+ProjectServiceDep = Annotated[ServiceRunner[ProjectService], Depends(get_project_service)]
+BoardServiceDep = Annotated[ServiceRunner[BoardService], Depends(get_board_service)]
+StatsServiceDep = Annotated[ServiceRunner[StatsService], Depends(get_stats_service)]
+
+# JSON del listado y del tablero sin validar cada entidad contra el schema (solo con FAST_SERIALIZATION)
+PROJECT_PAGE_JSON = EntitySerializer(Page[Project], ProjectPage)
+PROJECT_BOARD_JSON = EntitySerializer(ProjectBoard, ProjectBoardResponse)
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-def create_project(project_data: ProjectCreate, service: ProjectServiceDep):
+async def create_project(project_data: ProjectCreate, service: ProjectServiceDep):
     try:
         # El router extrae los datos del Schema y se los pasa al servicio
-        return service.create_project(
+        return await service.run(lambda s: s.create_project(
             name=project_data.name, 
             description=project_data.description,
             start_date=project_data.start_date,
@@ -26,28 +42,63 @@ def create_project(project_data: ProjectCreate, service: ProjectServiceDep):
             finalization_criteria=project_data.finalization_criteria,
             status=project_data.status,
             budget=project_data.budget
-        )
+        ))
     except ValueError as e:
         import traceback
         traceback.print_exc()
         # Si el servicio lanza un error de negocio, lo convertimos en una respuesta HTTP con código 400
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[ProjectResponse])
-def list_projects(service: ProjectServiceDep):
-    # El servicio devuelve Entidades de Dominio, 
-    # pero FastAPI las convierte a ProjectResponse automáticamente
-    return service.get_all_projects()
+@router.get("/", response_model=ProjectPage)
+async def list_projects(request: Request, response: Response, service: ProjectServiceDep,
+                        limit: int = Query(50, ge=1, le=500),
+                        cursor: Optional[str] = None,
+                        order_by: Literal["id", "updated_at"] = "id",
+                        status: Optional[ProjectStatus] = None):
+    # El servicio devuelve una página de Entidades de Dominio,
+    # pero FastAPI las convierte a ProjectPage automáticamente.
+    # Con If-None-Match y sin cambios se responde 304 tras una sola consulta agregada
+    try:
+        return entity_response(await conditional_collection(
+            request, response, service,
+            lambda s: s.get_projects_version(status=status),
+            lambda s: s.list_projects(limit, cursor=cursor, order_by=order_by, status=status)), PROJECT_PAGE_JSON, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-def get_project(project_id: int, service: ProjectServiceDep):
-    project = service.get_project_by_id(project_id)
+async def get_project(project_id: int, request: Request, response: Response, service: ProjectServiceDep,
+                      include_archived: bool = False):
+    # include_archived: si no está en la tabla viva, se busca en el archivo (solo lectura)
+    project = await conditional_resource(request, response, service,
+                                         lambda s: s.get_project_by_id(project_id, include_archived=include_archived))
     if not project:
         raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
     return project
 
+@router.get("/{project_id}/board", response_model=ProjectBoardResponse)
+async def get_project_board(project_id: int, request: Request, response: Response, service: BoardServiceDep,
+                            limit_per_column: Optional[int] = Query(None, ge=1, le=500)):
+    # Sustituye a las llamadas por épica a /epics/project-epic, /tasks/epic-tasks y /tasks/count.
+    # Un tablero sin cambios cuesta una consulta agregada y un 304
+    try:
+        return entity_response(await conditional_collection(request, response, service,
+                                                            lambda s: s.get_board_version(project_id),
+                                                            lambda s: s.get_project_board(project_id, limit_per_column)),
+                               PROJECT_BOARD_JSON, response)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
+@router.get("/{project_id}/stats", response_model=ProjectStatsResponse)
+async def get_project_stats(project_id: int, service: StatsServiceDep):
+    # Progreso del proyecto (hechas/total, desglose por estado y prioridad, vencidas) con un único GROUP BY
+    try:
+        return await service.run(lambda s: s.get_project_stats(project_id))
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Project {project_id} not found")
+
 @router.put("/{project_id}", response_model=ProjectResponse)
-def update_project(project_id: int, project_data: ProjectCreate, service: ProjectServiceDep):
+async def update_project(project_id: int, project_data: ProjectCreate, service: ProjectServiceDep):
     try:
         # Importamos la entidad para convertir el schema de entrada
         from src.domain.entities.project import Project
@@ -58,7 +109,7 @@ def update_project(project_id: int, project_data: ProjectCreate, service: Projec
             description=project_data.description
         )
         
-        updated = service.update_project(project_id, project_entity)
+        updated = await service.run(lambda s: s.update_project(project_id, project_entity))
         if not updated:
             raise HTTPException(status_code=404, detail="Project not found")
         return updated
@@ -66,8 +117,8 @@ def update_project(project_id: int, project_data: ProjectCreate, service: Projec
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_project(project_id: int, service: ProjectServiceDep):
-    deleted = service.delete_project(project_id)
+async def delete_project(project_id: int, service: ProjectServiceDep):
+    deleted = await service.run(lambda s: s.delete_project(project_id))
     if not deleted:
         raise HTTPException(status_code=404, detail="Project not found")
     return None  # FastAPI interpretará esto como una respuesta vacía con código 204
\ No newline at end of file
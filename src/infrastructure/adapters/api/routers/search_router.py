@@ -0,0 +1,30 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Annotated, Optional
+from src.app.services.search_service import SearchService
+from src.app.schemas.search_schema import SearchPage
+from src.domain.entities.change import ChangeEntity
+from src.infrastructure.adapters.api.dependencies import get_search_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from fastapi import Depends
+
+# Definimos el router
+router = APIRouter(
+    prefix="/search",
+    tags=["Search"]
+)
+
+SearchServiceDep = Annotated[ServiceRunner[SearchService], Depends(get_search_service)]
+
+@router.get("/", response_model=SearchPage)
+async def search(service: SearchServiceDep,
+                 q: str = Query(..., min_length=1, max_length=200),
+                 entity: Optional[ChangeEntity] = Query(None, alias="type"),
+                 project_id: Optional[int] = None,
+                 limit: int = Query(20, ge=1, le=100),
+                 cursor: Optional[str] = None):
+    # Busca en nombre, descripción y criterios de proyectos, épicas y tareas (o solo del tipo indicado),
+    # los más relevantes primero. Con project_id solo se buscan el proyecto y lo que contiene
+    try:
+        return await service.run(lambda s: s.search(q, entity=entity, project_id=project_id, limit=limit, cursor=cursor))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
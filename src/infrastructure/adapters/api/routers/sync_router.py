@@ -0,0 +1,39 @@
+from fastapi import APIRouter, HTTPException, Query
+from typing import Annotated, Optional
+from src.app.services.sync_service import SyncService
+from src.app.schemas.sync_schema import SyncResponse
+from src.infrastructure.adapters.api.dependencies import get_sync_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.repositories.pagination import decode_cursor, encode_cursor
+from fastapi import Depends
+
+# Definimos el router
+router = APIRouter(
+    prefix="/sync",
+    tags=["Sync"]
+)
+
+SyncServiceDep = Annotated[ServiceRunner[SyncService], Depends(get_sync_service)]
+
+@router.get("/", response_model=SyncResponse)
+async def get_changes(service: SyncServiceDep,
+                      since: Optional[str] = None,
+                      limit: int = Query(500, ge=1, le=5000)):
+    # Sin "since" se recorre el registro desde el principio. El cursor es opaco para el cliente:
+    # codifica la secuencia del último cambio entregado
+    try:
+        since_seq = decode_cursor(since, "id")[0] if since else 0
+        change_set = await service.run(lambda s: s.get_changes(since_seq, limit))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return SyncResponse.model_validate({
+        "next_cursor": encode_cursor([change_set.last_seq]),
+        "has_more": change_set.has_more,
+        "resync": change_set.resync,
+        "projects": change_set.projects,
+        "epics": change_set.epics,
+        "tasks": change_set.tasks,
+        "deleted_projects": change_set.deleted_projects,
+        "deleted_epics": change_set.deleted_epics,
+        "deleted_tasks": change_set.deleted_tasks,
+    }, from_attributes=True)
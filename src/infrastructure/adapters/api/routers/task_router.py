@@ -1,8 +1,16 @@
-from fastapi import APIRouter, HTTPException, status
-from typing import List, Annotated
+import datetime
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from typing import List, Annotated, Literal, Optional
 from src.app.services.task_service import TaskService
-from src.app.schemas.task_schema import TaskCreate, TaskResponse
+from src.app.schemas.task_schema import TaskCreate, TaskResponse, TaskPage, TaskBulkCreate, TaskBulkUpdate, TaskBulkResponse, OverdueAlertPage
+from src.app.schemas.bulk_schema import BulkDeleteRequest, BulkDeleteResponse
+from src.domain.entities.task import Task, TaskStatus, TaskPriority
+from src.domain.entities.page import Page
 from src.infrastructure.adapters.api.dependencies import get_task_service
+from src.infrastructure.adapters.api.service_runner import ServiceRunner
+from src.infrastructure.adapters.api.conditional import conditional_collection, conditional_resource
+from src.infrastructure.adapters.api.fast_json import EntitySerializer, entity_response
+from src.infrastructure.overdue_sinks import get_overdue_feed
 from fastapi import Depends
 
 # Definimos el router
@@ -12,40 +20,115 @@ router = APIRouter(
 )
 
 # Alias para la inyección del servicio, así el código queda más corto
-TaskServiceDep = Annotated[TaskService, Depends(get_task_service)]
+TaskServiceDep = Annotated[ServiceRunner[TaskService], Depends(get_task_service)]
+
+# JSON de los listados sin validar cada tarea contra el schema (solo con FAST_SERIALIZATION)
+TASK_PAGE_JSON = EntitySerializer(Page[Task], TaskPage)
+TASK_LIST_JSON = EntitySerializer(List[Task], List[TaskResponse])
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-def create_task(task_data: TaskCreate, service: TaskServiceDep):
+async def create_task(task_data: TaskCreate, service: TaskServiceDep):
     try:
         # El router extrae los datos del Schema y se los pasa al servicio
-        return service.create_task(
+        return await service.run(lambda s: s.create_task(
             name=task_data.name, 
             description=task_data.description,
             epic_id=task_data.epic_id
-        )
+        ))
     except ValueError as e:
         # Si el servicio lanza un error de negocio, lo convertimos en una respuesta HTTP con código 400
         raise HTTPException(status_code=400, detail=str(e))
 
-@router.get("/", response_model=List[TaskResponse])
-def list_tasks(service: TaskServiceDep):
-    # El servicio devuelve Entidades de Dominio, 
-    # pero FastAPI las convierte a TaskResponse automáticamente
-    return service.get_all_tasks()
+# Operaciones masivas. Van antes que las rutas "/{task_id}" para que "bulk" no se interprete como un ID.
+# Responden 200 con los elementos aplicados y, en "errors", los que incumplen alguna regla de negocio
+@router.post("/bulk", response_model=TaskBulkResponse)
+async def bulk_create_tasks(bulk_data: TaskBulkCreate, service: TaskServiceDep):
+    try:
+        # A diferencia de POST /, se respetan todos los campos del schema (importaciones desde otras herramientas)
+        tasks = [Task(**item.model_dump()) for item in bulk_data.items]
+        return await service.run(lambda s: s.bulk_create_tasks(tasks))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.patch("/bulk", response_model=TaskBulkResponse)
+async def bulk_update_tasks(bulk_data: TaskBulkUpdate, service: TaskServiceDep):
+    # Solo los campos enviados con valor; el resto se conserva
+    changes = [(item.id, item.model_dump(exclude_unset=True, exclude_none=True, exclude={"id"})) for item in bulk_data.items]
+    return await service.run(lambda s: s.bulk_update_tasks(changes))
+
+@router.delete("/bulk", response_model=BulkDeleteResponse)
+async def bulk_delete_tasks(bulk_data: BulkDeleteRequest, service: TaskServiceDep):
+    return await service.run(lambda s: s.bulk_delete_tasks(bulk_data.ids))
+
+@router.get("/", response_model=TaskPage)
+async def list_tasks(request: Request, response: Response, service: TaskServiceDep,
+                     limit: int = Query(50, ge=1, le=500),
+                     cursor: Optional[str] = None,
+                     order_by: Literal["id", "updated_at"] = "id",
+                     status: Optional[TaskStatus] = None,
+                     priority: Optional[TaskPriority] = None,
+                     assignee: Optional[str] = None,
+                     epic_id: Optional[int] = None):
+    # El servicio devuelve una página de Entidades de Dominio,
+    # pero FastAPI las convierte a TaskPage automáticamente.
+    # Con If-None-Match y sin cambios se responde 304 tras una sola consulta agregada
+    try:
+        return entity_response(await conditional_collection(
+            request, response, service,
+            lambda s: s.get_tasks_version(status=status, priority=priority, assignee=assignee, epic_id=epic_id),
+            lambda s: s.list_tasks(limit, cursor=cursor, order_by=order_by, status=status,
+                                   priority=priority, assignee=assignee, epic_id=epic_id)), TASK_PAGE_JSON, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Vencimientos. También antes de "/{task_id}"
+@router.get("/due", response_model=TaskPage)
+async def list_due_tasks(response: Response, service: TaskServiceDep,
+                         before: Optional[datetime.datetime] = None,
+                         exclude_status: List[TaskStatus] = Query([TaskStatus.DONE]),
+                         limit: int = Query(50, ge=1, le=500),
+                         cursor: Optional[str] = None):
+    # Sin "before": las vencidas ahora mismo. Por defecto se omiten las terminadas (status != done)
+    due_before = before or datetime.datetime.now()
+    try:
+        return entity_response(await service.run(lambda s: s.list_due_tasks(due_before, limit, cursor=cursor,
+                                                                            exclude_statuses=exclude_status)),
+                               TASK_PAGE_JSON, response)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.get("/overdue/alerts", response_model=OverdueAlertPage)
+async def list_overdue_alerts(since: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+    # Avisos del planificador de este worker posteriores a "since" (sondeo incremental, sin consultar la base de datos)
+    feed = get_overdue_feed()
+    if feed is None:
+        raise HTTPException(status_code=404, detail="The overdue alert feed is disabled (OVERDUE_SINKS)")
+    return OverdueAlertPage(items=feed.read(since, limit), last_seq=feed.last_seq) # type: ignore[arg-type]
 
 @router.get("/{task_id}", response_model=TaskResponse)
-def get_task(task_id: int, service: TaskServiceDep):
-    task = service.get_task_by_id(task_id)
+async def get_task(task_id: int, request: Request, response: Response, service: TaskServiceDep,
+                   include_archived: bool = False):
+    # include_archived: si no está en la tabla viva, se busca en el archivo (solo lectura)
+    task = await conditional_resource(request, response, service,
+                                      lambda s: s.get_task_by_id(task_id, include_archived=include_archived))
     if not task:
         raise HTTPException(status_code=404, detail=f"Task {task_id} not found")
     return task
 
 @router.get("/epic-tasks/{epic_id}", response_model=List[TaskResponse])
-def get_tasks_by_epic(epic_id: int, service: TaskServiceDep):
-    return service.get_tasks_by_epic_id(epic_id)
+async def get_tasks_by_epic(epic_id: int, request: Request, response: Response, service: TaskServiceDep,
+                            include_archived: bool = False):
+    # El ETag sale de las tareas vivas: archivar cambia su número y el archivo no se modifica después
+    try:
+        return entity_response(await conditional_collection(request, response, service,
+                                                            lambda s: s.get_tasks_version(epic_id=epic_id),
+                                                            lambda s: s.get_tasks_by_epic_id(epic_id, include_archived=include_archived)),
+                               TASK_LIST_JSON, response)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"Epic {epic_id} not found")
 
 @router.put("/{task_id}", response_model=TaskResponse)
-def update_task(task_id: int, task_data: TaskCreate, service: TaskServiceDep):
+async def update_task(task_id: int, task_data: TaskCreate, service: TaskServiceDep):
     try:
         # Importamos la entidad para convertir el schema de entrada
         from src.domain.entities.task import Task
@@ -57,7 +140,7 @@ def update_task(task_id: int, task_data: TaskCreate, service: TaskServiceDep):
             epic_id=task_data.epic_id
         )
         
-        updated = service.update_task(task_entity, task_id)
+        updated = await service.run(lambda s: s.update_task(task_entity, task_id))
         if not updated:
             raise HTTPException(status_code=404, detail="Task not found")
         return updated
@@ -65,12 +148,13 @@ def update_task(task_id: int, task_data: TaskCreate, service: TaskServiceDep):
         raise HTTPException(status_code=400, detail=str(e))
     
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_task(task_id: int, service: TaskServiceDep):
-    deleted = service.delete_task(task_id)
+async def delete_task(task_id: int, service: TaskServiceDep):
+    deleted = await service.run(lambda s: s.delete_task(task_id))
     if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
     return None  # FastAPI interpretará esto como una respuesta vacía con código 204
 
 @router.get("/count/{epic_id}", response_model=int)
-def count_tasks_by_epic(epic_id: int, service: TaskServiceDep):
-    return service.get_count_tasks_by_epic_id(epic_id)
\ No newline at end of file
+async def count_tasks_by_epic(epic_id: int, service: TaskServiceDep, status: Optional[TaskStatus] = None):
+    # Se lee de los contadores de la épica: coste constante aunque tenga miles de tareas
+    return await service.run(lambda s: s.get_count_tasks_by_epic_id(epic_id, status))
\ No newline at end of file
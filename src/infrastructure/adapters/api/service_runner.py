@@ -0,0 +1,46 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Generic, TypeVar
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+S = TypeVar("S")
+R = TypeVar("R")
+
+class ServiceRunner(ABC, Generic[S]):
+    """
+    Ejecuta un caso de uso de un servicio desde un router async sin bloquear el event loop.
+    Los servicios y repositorios son síncronos; lo que cambia es cómo se hace la E/S con la base de datos.
+    """
+
+    @abstractmethod
+    async def run(self, use_case: Callable[[S], R]) -> R:
+        """Run use_case(service) and return its result"""
+        pass
+
+
+def run_use_case(db: Session, build: Callable[[Session], S], use_case: Callable[[S], R]) -> R:
+    # La transacción la gestiona el propio servicio a través de su UnitOfWork
+    return use_case(build(db))
+
+
+class ThreadpoolServiceRunner(ServiceRunner[S]):
+    # Modo síncrono (por defecto): driver bloqueante (pymysql) ejecutado en el threadpool de Starlette,
+    # igual que cuando los endpoints eran "def"
+    def __init__(self, db: Session, build: Callable[[Session], S]):
+        self.db = db
+        self.build = build
+
+    async def run(self, use_case: Callable[[S], R]) -> R:
+        return await run_in_threadpool(run_use_case, self.db, self.build, use_case)
+
+
+class AsyncSessionServiceRunner(ServiceRunner[S]):
+    # Modo asíncrono: AsyncSession.run_sync ejecuta el servicio en un greenlet sobre el driver async
+    # (aiomysql/aiosqlite), así que la espera de E/S cede el event loop en lugar de ocupar un hilo
+    def __init__(self, db: AsyncSession, build: Callable[[Session], S]):
+        self.db = db
+        self.build = build
+
+    async def run(self, use_case: Callable[[S], R]) -> R:
+        return await self.db.run_sync(run_use_case, self.build, use_case)
@@ -0,0 +1,40 @@
+from typing import AsyncGenerator, Optional
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database import enable_sqlite_foreign_keys, engine_options
+from src.infrastructure.pool_metrics import TimedAsyncAdaptedQueuePool, instrument_engine
+from src.infrastructure.query_metrics import instrument_queries
+
+# Modo asíncrono: la API usa un driver async (aiomysql, o aiosqlite en local) en lugar del threadpool.
+# Se activa con DATABASE_ASYNC=true; los drivers son dependencias opcionales (uv sync --extra async).
+DATABASE_ASYNC = settings.database_async
+ASYNC_DATABASE_URL = settings.async_database_url
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
+
+def get_async_engine() -> AsyncEngine:
+    # El engine se crea bajo demanda para no exigir el driver async cuando el modo está desactivado
+    global _async_engine, _async_session_factory
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, TimedAsyncAdaptedQueuePool, "async"))
+        instrument_engine(_async_engine.sync_engine, "async")
+        enable_sqlite_foreign_keys(_async_engine.sync_engine)
+        if settings.instrumentation_enabled:
+            instrument_queries(_async_engine.sync_engine, "async", settings.slow_query_ms)
+        _async_session_factory = async_sessionmaker(_async_engine, autoflush=False, expire_on_commit=False)
+    return _async_engine
+
+async def dispose_async_engine() -> None:
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _async_session_factory = None
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    get_async_engine()
+    assert _async_session_factory is not None
+    async with _async_session_factory() as db:
+        yield db
@@ -0,0 +1,182 @@
+import copy
+import pickle
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from src.infrastructure.config.settings import settings
+
+@dataclass
+class CacheStats:
+    """Contadores de una caché de entidades"""
+    name: str
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0 # Entradas descartadas por falta de espacio (LRU)
+    expirations: int = 0 # Entradas descartadas al caducar su TTL
+    invalidations: int = 0 # Entradas eliminadas por una escritura
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+class CacheBackend(ABC):
+    """Almacén clave -> entidad usado por los repositorios con caché"""
+
+    def __init__(self, name: str):
+        self.stats = CacheStats(name)
+
+    @abstractmethod
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a copy of the cached value, or None if it is missing or expired"""
+        pass
+
+    @abstractmethod
+    def set(self, key: Hashable, value: Any) -> None:
+        """Store a copy of value under key"""
+        pass
+
+    @abstractmethod
+    def delete(self, key: Hashable) -> None:
+        """Remove key from the cache (no-op if it is missing)"""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Number of entries currently stored, -1 if the backend cannot tell"""
+        pass
+
+
+class InMemoryLRUCache(CacheBackend):
+    # Caché del proceso: LRU acotada en número de entradas y con TTL. Cada worker de uvicorn tiene la suya,
+    # así que una escritura en otro worker solo se ve aquí al caducar la entrada (de ahí un TTL corto)
+    def __init__(self, name: str, max_entries: int, ttl_seconds: float):
+        super().__init__(name)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                del self._entries[key]
+                self.stats.increment("expirations")
+                entry = None
+            if entry is None:
+                self.stats.increment("misses")
+                return None
+            self._entries.move_to_end(key)
+        self.stats.increment("hits")
+        # Devolvemos una copia: el servicio puede modificar la entidad sin alterar la que está en caché
+        return copy.copy(entry[1])
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, copy.copy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.increment("evictions")
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.stats.increment("invalidations")
+
+    def size(self) -> int:
+        return len(self._entries)
+
+
+class RedisCache(CacheBackend):
+    # Caché compartida entre workers/instancias (CACHE_BACKEND=redis). Requiere el extra opcional "cache".
+    # Las expulsiones las gestiona Redis (maxmemory-policy), así que aquí solo se cuentan aciertos y fallos
+    def __init__(self, name: str, url: str, ttl_seconds: float):
+        super().__init__(name)
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("CACHE_BACKEND=redis requires the 'cache' extra (uv sync --extra cache)") from e
+        self._client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def _key(self, key: Hashable) -> str:
+        # La versión cambia con el formato del pickle: las entidades con __slots__ no cargan los pickles antiguos
+        return f"kanban:v2:{self.stats.name}:{key}"
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        raw = self._client.get(self._key(key))
+        if raw is None:
+            self.stats.increment("misses")
+            return None
+        self.stats.increment("hits")
+        return pickle.loads(raw) # type: ignore[arg-type]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        self._client.set(self._key(key), pickle.dumps(value), px=int(self.ttl_seconds * 1000))
+
+    def delete(self, key: Hashable) -> None:
+        if self._client.delete(self._key(key)):
+            self.stats.increment("invalidations")
+
+    def size(self) -> int:
+        return -1
+
+
+# Una caché por tipo de entidad ("epics", "projects"), compartida por todas las peticiones del proceso
+_caches: Dict[str, CacheBackend] = {}
+_lock = threading.Lock()
+
+def get_cache(name: str) -> CacheBackend:
+    """Caché con el nombre dado, creada la primera vez según la configuración"""
+    with _lock:
+        if name not in _caches:
+            if settings.cache_backend == "redis":
+                _caches[name] = RedisCache(name, settings.cache_redis_url, settings.cache_ttl_seconds)
+            else:
+                _caches[name] = InMemoryLRUCache(name, settings.cache_max_entries, settings.cache_ttl_seconds)
+        return _caches[name]
+
+
+def invalidate(db: Session, cache: CacheBackend, keys: Iterable[Hashable]) -> None:
+    """
+    Borra las claves ahora y otra vez cuando termine la transacción de db (COMMIT o ROLLBACK). Sin el segundo borrado,
+    una petición concurrente que falle la caché entre la escritura y el COMMIT leería la fila anterior (aún la
+    confirmada) y la volvería a guardar durante todo el TTL, o se guardaría un cambio que luego se deshace
+    """
+    keys = list(keys)
+    for key in keys:
+        cache.delete(key)
+    pending: List[Tuple[CacheBackend, List[Hashable]]] = db.info.setdefault("cache_invalidations", [])
+    pending.append((cache, keys))
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _invalidate_pending(db: Session) -> None:
+    for cache, keys in db.info.pop("cache_invalidations", ()):
+        for key in keys:
+            cache.delete(key)
+
+
+def cache_snapshot() -> Dict[str, Dict[str, int]]:
+    """Contadores de cada caché de entidades y número de entradas"""
+    return {
+        name: {
+            "hits": cache.stats.hits,
+            "misses": cache.stats.misses,
+            "evictions": cache.stats.evictions,
+            "expirations": cache.stats.expirations,
+            "invalidations": cache.stats.invalidations,
+            "size": cache.size(),
+        }
+        for name, cache in _caches.items()
+    }
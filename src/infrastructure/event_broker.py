@@ -0,0 +1,226 @@
+import asyncio
+import json
+import threading
+import time
+from abc import abstractmethod
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+from src.domain.entities.board_event import BoardEvent
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+from src.domain.repositories.event_publisher import EventPublisher
+from src.infrastructure.config.settings import settings
+
+def event_to_dict(event: BoardEvent) -> Dict[str, Any]:
+    return {"project_id": event.project_id, "entity": event.entity.value, "id": event.entity_id,
+            "operation": event.operation.value}
+
+def event_from_dict(data: Dict[str, Any]) -> BoardEvent:
+    return BoardEvent(int(data["project_id"]), ChangeEntity(data["entity"]), int(data["id"]),
+                      ChangeOperation(data["operation"]))
+
+
+@dataclass
+class EventBatch:
+    """Cambios acumulados para una conexión desde el último envío"""
+    events: List[BoardEvent] = field(default_factory=list)
+    # True si se superó el máximo de cambios pendientes: se descartaron y el cliente debe recargar el tablero
+    resync: bool = False
+
+
+@dataclass
+class BrokerStats:
+    """Contadores del pub/sub de eventos del tablero"""
+    published: int = 0 # Eventos recibidos de los servicios
+    delivered: int = 0 # Lotes entregados a las conexiones
+    coalesced: int = 0 # Eventos absorbidos por otro posterior de la misma entidad antes de enviarse
+    overflows: int = 0 # Veces que una conexión lenta superó el máximo de pendientes y pasó a "resync"
+    publish_errors: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def increment(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+
+class Subscription:
+    # Buzón de una conexión SSE/WebSocket. Vive en el event loop de la conexión: solo se modifica desde ese loop.
+    # Es acotado por diseño: guarda el último evento de cada entidad (una ráfaga de cambios sobre la misma tarea
+    # ocupa una entrada) y, si una conexión lenta acumula más de max_pending entidades distintas, se vacía y
+    # se marca para "resync" en lugar de seguir creciendo
+    def __init__(self, project_id: int, stats: BrokerStats, max_pending: int, coalesce_seconds: float):
+        self.project_id = project_id
+        self.loop = asyncio.get_running_loop()
+        self.stats = stats
+        self.max_pending = max_pending
+        self.coalesce_seconds = coalesce_seconds
+        self._pending: Dict[Tuple[ChangeEntity, int], BoardEvent] = {}
+        self._resync = False
+        self._ready = asyncio.Event()
+
+    def push(self, events: List[BoardEvent]) -> None:
+        for event in events:
+            key = (event.entity, event.entity_id)
+            if self._pending.pop(key, None) is not None:
+                self.stats.increment("coalesced")
+            self._pending[key] = event
+        if len(self._pending) > self.max_pending:
+            self._pending.clear()
+            if not self._resync:
+                self.stats.increment("overflows")
+            self._resync = True
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> Optional[EventBatch]:
+        """Espera al siguiente lote de cambios; None si no llega ninguno en timeout segundos"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        # Ventana de agrupación: los cambios que lleguen mientras tanto salen en el mismo mensaje
+        await asyncio.sleep(self.coalesce_seconds)
+        batch = EventBatch(list(self._pending.values()), self._resync)
+        self._pending = {}
+        self._resync = False
+        self._ready.clear()
+        self.stats.increment("delivered")
+        return batch
+
+
+class EventBroker(EventPublisher):
+    """Pub/sub de eventos del tablero por proyecto: los servicios publican y cada conexión abierta se suscribe"""
+
+    def __init__(self, max_pending: int, coalesce_ms: int):
+        self.stats = BrokerStats()
+        self.max_pending = max_pending
+        self.coalesce_seconds = coalesce_ms / 1000
+        self._subscriptions: Dict[int, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def publish(self, events: List[BoardEvent]) -> None:
+        pass
+
+    def subscribe(self, project_id: int) -> Subscription:
+        """Registra una conexión (desde su event loop) para recibir los eventos del proyecto"""
+        subscription = Subscription(project_id, self.stats, self.max_pending, self.coalesce_seconds)
+        with self._lock:
+            self._subscriptions[project_id].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.project_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscriptions[subscription.project_id]
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscriptions.values())
+
+    def _dispatch(self, events: List[BoardEvent]) -> None:
+        # Reparto local. Se puede llamar desde cualquier hilo (threadpool de los servicios o el listener de Redis):
+        # se programa una sola llamada por event loop y proyecto, no una por suscriptor
+        by_project: Dict[int, List[BoardEvent]] = defaultdict(list)
+        for event in events:
+            by_project[event.project_id].append(event)
+        for project_id, project_events in by_project.items():
+            with self._lock:
+                subscribers = list(self._subscriptions.get(project_id, ()))
+            by_loop: Dict[asyncio.AbstractEventLoop, List[Subscription]] = defaultdict(list)
+            for subscription in subscribers:
+                by_loop[subscription.loop].append(subscription)
+            for loop, loop_subscribers in by_loop.items():
+                try:
+                    loop.call_soon_threadsafe(_deliver, loop_subscribers, project_events)
+                except RuntimeError:
+                    pass # El loop ya se cerró (apagado del servidor): no queda nadie a quien avisar
+
+
+def _deliver(subscriptions: List[Subscription], events: List[BoardEvent]) -> None:
+    for subscription in subscriptions:
+        subscription.push(events)
+
+
+class InProcessBroker(EventBroker):
+    # Por defecto: el reparto se hace dentro del proceso, así que cada worker de uvicorn solo avisa a sus
+    # propias conexiones de los cambios que hace él mismo. Con varios workers hay que usar EVENTS_BACKEND=redis
+    def publish(self, events: List[BoardEvent]) -> None:
+        if events:
+            self.stats.increment("published", len(events))
+            self._dispatch(events)
+
+
+class RedisBroker(EventBroker):
+    # Reparto entre workers/instancias a través de un canal de Redis (extra opcional "cache"). Cada worker
+    # escucha el canal en un hilo y reparte localmente, así que los suscriptores no saben de dónde viene el cambio
+    CHANNEL = "kanban:board-events"
+
+    def __init__(self, url: str, max_pending: int, coalesce_ms: int):
+        super().__init__(max_pending, coalesce_ms)
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("EVENTS_BACKEND=redis requires the 'cache' extra (uv sync --extra cache)") from e
+        self._redis = redis
+        self._client = redis.Redis.from_url(url)
+        self._listener: Optional[threading.Thread] = None
+
+    def publish(self, events: List[BoardEvent]) -> None:
+        if not events:
+            return
+        self.stats.increment("published", len(events))
+        try:
+            self._client.publish(self.CHANNEL, json.dumps([event_to_dict(event) for event in events]))
+        except self._redis.RedisError:
+            # La escritura ya está confirmada: perder la notificación no debe convertirla en un error
+            self.stats.increment("publish_errors")
+
+    def subscribe(self, project_id: int) -> Subscription:
+        with self._lock:
+            if self._listener is None:
+                self._listener = threading.Thread(target=self._listen, name="board-events", daemon=True)
+                self._listener.start()
+        return super().subscribe(project_id)
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                for message in pubsub.listen():
+                    self._dispatch([event_from_dict(data) for data in json.loads(message["data"])])
+            except self._redis.RedisError:
+                time.sleep(1) # Reintentamos la suscripción si se pierde la conexión
+
+
+_broker: Optional[EventBroker] = None
+_broker_lock = threading.Lock()
+
+def get_broker() -> EventBroker:
+    """Broker del proceso, creado la primera vez según la configuración"""
+    global _broker
+    with _broker_lock:
+        if _broker is None:
+            if settings.events_backend == "redis":
+                _broker = RedisBroker(settings.events_redis_url, settings.events_max_pending, settings.events_coalesce_ms)
+            else:
+                _broker = InProcessBroker(settings.events_max_pending, settings.events_coalesce_ms)
+        return _broker
+
+
+def broker_snapshot() -> Dict[str, int]:
+    """Contadores del broker y número de conexiones suscritas en este worker"""
+    broker = get_broker()
+    return {
+        "subscribers": broker.subscriber_count(),
+        "published": broker.stats.published,
+        "delivered": broker.stats.delivered,
+        "coalesced": broker.stats.coalesced,
+        "overflows": broker.stats.overflows,
+        "publish_errors": broker.stats.publish_errors,
+    }
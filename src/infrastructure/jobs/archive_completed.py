@@ -0,0 +1,38 @@
+"""
+Archiva el trabajo terminado: mueve a las tablas projects_archive, epics_archive y tasks_archive los proyectos
+COMPLETED, las épicas COMPLETED y las tareas DONE que no se han modificado en ARCHIVE_AFTER_DAYS días.
+
+Las tablas vivas solo conservan lo que sigue en uso, así que los listados, recuentos y agregados no se vuelven
+más lentos con los años. Se mueve en lotes de ARCHIVE_BATCH_SIZE filas con una transacción por lote (bloqueos
+cortos), se puede interrumpir y volver a lanzar, y está pensado para ejecutarse periódicamente (cron).
+Lo archivado se sigue leyendo por ID con include_archived=true. Después purga de change_log las entradas de hace
+más de CHANGE_LOG_RETENTION_DAYS días (0: no se purga).
+
+    uv run python -m src.infrastructure.jobs.archive_completed [días]
+"""
+import datetime
+import sys
+from typing import Dict, Optional
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.repositories.archive import archive_completed
+from src.infrastructure.repositories.change_log import prune_change_log
+
+def run(after_days: Optional[int] = None) -> Dict[str, int]:
+    now = datetime.datetime.now()
+    cutoff = now - datetime.timedelta(days=settings.archive_after_days if after_days is None else after_days)
+    db = SessionLocal()
+    try:
+        moved = archive_completed(db, cutoff, settings.archive_batch_size)
+        moved["change_log"] = 0
+        if settings.change_log_retention_days > 0:
+            retained_since = now - datetime.timedelta(days=settings.change_log_retention_days)
+            moved["change_log"] = prune_change_log(db, retained_since, settings.archive_batch_size)
+        return moved
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    moved = run(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"Archived: {moved['projects']} projects, {moved['epics']} epics, {moved['tasks']} tasks")
+    print(f"Pruned: {moved['change_log']} change_log entries")
@@ -0,0 +1,145 @@
+"""
+Planificador de avisos de tareas vencidas: tarea asyncio dentro del proceso de la API (se arranca en el lifespan).
+
+Cada OVERDUE_SCAN_SECONDS recorre el índice (target_date, id, status) desde una marca de agua, la clave
+(target_date, id) hasta donde ya miró, hasta "ahora", y publica en el OverdueSink las tareas abiertas que han
+vencido entre medias. Nunca vuelve a recorrer la tabla: cada pasada lee solo lo que ha vencido desde la anterior,
+en lotes de OVERDUE_BATCH_SIZE, así que el coste depende de las tareas que vencen, no de las que hay abiertas.
+
+La marca de agua empieza en el momento del arranque: las tareas que ya estaban vencidas no se avisan (se
+consultan con GET /tasks/due). Por lo mismo, tampoco se avisa de una tarea que se crea o se edita con una
+fecha que ya ha pasado; solo de las que vencen con el paso del tiempo. Con varios workers, cada uno tiene su
+planificador: hay que dejarlo activo solo en uno (OVERDUE_SCHEDULER_ENABLED=false en el resto).
+
+    uv run python -m src.infrastructure.jobs.overdue_scheduler   # una pasada desde hace 24 horas, sin publicar
+"""
+import asyncio
+import datetime
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple, Union
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from src.domain.entities.overdue import OverdueAlert
+from src.domain.entities.task import Task, TaskStatus
+from src.domain.repositories.overdue_sink import OverdueSink
+from src.infrastructure.config.settings import settings
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.overdue_sinks import get_overdue_sink
+from src.infrastructure.repositories.pagination import encode_cursor
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+
+logger = logging.getLogger("kanban.overdue")
+
+
+@dataclass
+class SchedulerStats:
+    """Contadores del planificador de vencimientos"""
+    ticks: int = 0
+    alerts: int = 0 # Tareas vencidas publicadas
+    queries: int = 0 # Consultas (lotes) sobre el índice
+    errors: int = 0
+    last_tick_ms: float = 0.0
+
+
+class OverdueScheduler:
+    def __init__(self, sink: OverdueSink, interval_seconds: float, batch_size: int,
+                 session_factory: Callable[[], Session] = SessionLocal,
+                 start: Optional[datetime.datetime] = None):
+        self.sink = sink
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self.session_factory = session_factory
+        self.stats = SchedulerStats()
+        # Clave (target_date, id) de la última posición revisada del índice; lo anterior ya se ha avisado
+        self.watermark: Tuple[datetime.datetime, int] = (start or datetime.datetime.now(), 0)
+        # tick() corre en el threadpool: una sola pasada a la vez
+        self._lock = threading.Lock()
+
+    def _alert(self, task: Task, detected_at: datetime.datetime) -> OverdueAlert:
+        return OverdueAlert(task_id=task.id, epic_id=task.epic_id, name=task.name, # type: ignore[arg-type]
+                            status=task.status or TaskStatus.TO_DO, target_date=task.target_date, # type: ignore[arg-type]
+                            detected_at=detected_at, assignee=task.assignee)
+
+    def tick(self, now: Optional[datetime.datetime] = None) -> int:
+        """Publica las tareas abiertas vencidas entre la marca de agua y now; devuelve cuántas"""
+        now = now or datetime.datetime.now()
+        started = time.perf_counter()
+        published = 0
+        with self._lock:
+            db = self.session_factory()
+            try:
+                repository = SQLAlchemyTaskRepository(db)
+                while True:
+                    page = repository.get_due_page(now, self.batch_size, cursor=encode_cursor(list(self.watermark)))
+                    self.stats.queries += 1
+                    if page.items:
+                        # Se publica lote a lote: la memoria no crece aunque venzan miles de tareas a la vez
+                        self.sink.publish([self._alert(task, now) for task in page.items])
+                        published += len(page.items)
+                        last = page.items[-1]
+                        self.watermark = (last.target_date, last.id) # type: ignore[assignment]
+                    if not page.next_cursor:
+                        break
+                # Todo lo anterior a now ya está revisado: la siguiente pasada empieza aquí y no vuelve a recorrer
+                # las tareas terminadas que queden entre la última avisada y now
+                self.watermark = max(self.watermark, (now, 0))
+            finally:
+                db.close()
+            self.stats.ticks += 1
+            self.stats.alerts += published
+            self.stats.last_tick_ms = (time.perf_counter() - started) * 1000
+        return published
+
+    async def run(self) -> None:
+        """Bucle del planificador; termina al cancelar la tarea"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                # Consultas bloqueantes: fuera del event loop, como los servicios
+                await run_in_threadpool(self.tick)
+            except Exception:
+                # Un fallo puntual (la base de datos no responde) no detiene el planificador: la siguiente pasada
+                # retoma desde la misma marca de agua, así que no se pierde ningún aviso
+                self.stats.errors += 1
+                logger.exception("Overdue scan failed")
+
+
+_scheduler: Optional[OverdueScheduler] = None
+
+def start_scheduler() -> "asyncio.Task[None]":
+    """Crea el planificador del proceso según la configuración y lanza su bucle en el event loop actual"""
+    global _scheduler
+    _scheduler = OverdueScheduler(get_overdue_sink(), settings.overdue_scan_seconds, settings.overdue_batch_size)
+    return asyncio.create_task(_scheduler.run(), name="overdue-scheduler")
+
+def scheduler_snapshot() -> Dict[str, Union[bool, int, float, str]]:
+    """Contadores del planificador de este worker y su marca de agua"""
+    if _scheduler is None:
+        return {"running": False}
+    watermark, last_id = _scheduler.watermark
+    return {
+        "running": True,
+        "ticks": _scheduler.stats.ticks,
+        "alerts": _scheduler.stats.alerts,
+        "queries": _scheduler.stats.queries,
+        "errors": _scheduler.stats.errors,
+        "last_tick_ms": round(_scheduler.stats.last_tick_ms, 3),
+        "watermark": f"{watermark.isoformat()}#{last_id}",
+    }
+
+if __name__ == "__main__":
+    class _CountingSink(OverdueSink):
+        def __init__(self):
+            self.count = 0
+
+        def publish(self, alerts) -> None:
+            self.count += len(alerts)
+
+    sink = _CountingSink()
+    scheduler = OverdueScheduler(sink, settings.overdue_scan_seconds, settings.overdue_batch_size,
+                                 start=datetime.datetime.now() - datetime.timedelta(days=1))
+    scheduler.tick()
+    print(f"Overdue in the last 24 h: {sink.count} open tasks ({scheduler.stats.last_tick_ms:.1f} ms)")
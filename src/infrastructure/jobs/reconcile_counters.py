@@ -0,0 +1,25 @@
+"""
+Recalcula los contadores desnormalizados de épicas y proyectos (tareas/épicas por estado).
+
+Los repositorios los mantienen al día en cada escritura; este proceso corrige lo que haya quedado desajustado
+por escrituras hechas fuera de la API (SQL a mano, migraciones) y rellena los contadores de una base de datos
+existente la primera vez. Es idempotente y solo escribe las filas que no coinciden.
+
+    uv run python -m src.infrastructure.jobs.reconcile_counters
+"""
+from typing import Dict
+from src.infrastructure.database import SessionLocal
+from src.infrastructure.repositories.counters import reconcile_counters
+
+def run() -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        fixed = reconcile_counters(db)
+        db.commit()
+        return fixed
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    fixed = run()
+    print(f"Counters reconciled: {fixed['epics']} epics, {fixed['projects']} projects fixed")
@@ -1,16 +1,49 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, Enum as SQLEnum, ForeignKey
+from typing import Optional
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Float, Enum as SQLEnum, ForeignKey, Index, Table, UniqueConstraint
+from sqlalchemy.dialects import mysql
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import relationship, validates
 from src.domain.entities.task import TaskStatus, TaskPriority
 from src.domain.entities.epic import EpicStatus, EpicPriority
 from src.infrastructure.database import Base
 from src.domain.entities.project import ProjectStatus
 import datetime
 
+# Relaciones: todas con lazy="raise", así que acceder a una relación que no se cargó explícitamente
+# (selectinload/joinedload, ver repositories/loading.py) lanza un error en lugar de hacer un SELECT por fila (N+1).
+# Los hijos se borran con ON DELETE CASCADE en la base de datos (passive_deletes: el ORM no los carga para borrarlos).
+
+# updated_at con microsegundos también en MySQL (DATETIME a secas redondea al segundo): los ETag de las colecciones
+# se calculan con MAX(updated_at) y dos cambios en el mismo segundo no deben producir el mismo validador
+PreciseDateTime = DateTime().with_variant(mysql.DATETIME(fsp=6), "mysql")
+
+# Las reglas de "nombre duplicado" ignoran mayúsculas/minúsculas. Guardamos el nombre normalizado
+# en su propia columna para que la unicidad la garantice un índice UNIQUE y no una carga en Python.
+def normalize_name(name: Optional[str]) -> Optional[str]:
+    return name.lower() if name is not None else None
+
+def is_name_conflict(error: IntegrityError) -> bool:
+    # Tanto MySQL (nombre de la clave) como SQLite (nombre de columnas) incluyen "name_normalized"
+    return "name_normalized" in str(error.orig)
+
+def is_missing_parent(error: IntegrityError) -> bool:
+    # Clave foránea incumplida: el padre ya no está en la tabla viva (borrado o archivado después de que una caché de
+    # otro worker lo diera por existente). MySQL: "a foreign key constraint fails"; SQLite: "FOREIGN KEY constraint failed"
+    return "foreign key constraint" in str(error.orig).lower()
+
 class ProjectModel(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        UniqueConstraint("name_normalized", name="uq_projects_name_normalized"),
+        Index("ix_projects_status", "status"),
+        Index("ix_projects_updated_at", "updated_at"),
+        Index("ix_projects_status_updated_at", "status", "updated_at"),
+    )
 
     # Detalles técnicos que el Dominio no necesita saber
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), nullable=False)
+    name_normalized = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     finalization_criteria = Column(String(500), nullable=True)
     status = Column(SQLEnum(ProjectStatus), default=ProjectStatus.ACTIVE)
@@ -18,15 +51,38 @@ class ProjectModel(Base):
     
     # Fechas automáticas gestionadas por la base de datos
     start_date = Column(DateTime, default=datetime.datetime.now)
-    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+    updated_at = Column(PreciseDateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
     end_date = Column(DateTime, nullable=True)
 
+    # Épicas del proyecto por estado, mantenidas por los repositorios (ver repositories/counters.py)
+    epics_not_started = Column(Integer, nullable=False, default=0, server_default="0")
+    epics_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    epics_completed = Column(Integer, nullable=False, default=0, server_default="0")
+    epics_blocked = Column(Integer, nullable=False, default=0, server_default="0")
+
+    epics = relationship("EpicModel", back_populates="project", lazy="raise",
+                         cascade="all, delete-orphan", passive_deletes=True, order_by="EpicModel.id")
+
+    @validates("name")
+    def _sync_name_normalized(self, key, value):
+        self.name_normalized = normalize_name(value)
+        return value
+
 class EpicModel(Base):
     __tablename__ = "epics"
+    __table_args__ = (
+        # El UNIQUE (project_id, name_normalized) sirve además como índice para get_by_project_id
+        UniqueConstraint("project_id", "name_normalized", name="uq_epics_project_id_name_normalized"),
+        Index("ix_epics_project_id_status", "project_id", "status"),
+        # COUNT/MAX(updated_at) de las épicas de un proyecto (ETag) sin leer la tabla
+        Index("ix_epics_project_id_updated_at", "project_id", "updated_at"),
+        Index("ix_epics_status_updated_at", "status", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(100), nullable=False)
+    name_normalized = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     completion_criteria = Column(String(500), nullable=True)
     status = Column(SQLEnum(EpicStatus), default=EpicStatus.NOT_STARTED)
@@ -34,16 +90,50 @@ class EpicModel(Base):
     
     # Fechas automáticas gestionadas por la base de datos
     created_at = Column(DateTime, default=datetime.datetime.now)
-    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+    updated_at = Column(PreciseDateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
+
+    # Tareas de la épica por estado, mantenidas por los repositorios (ver repositories/counters.py)
+    tasks_to_do = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_in_progress = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_done = Column(Integer, nullable=False, default=0, server_default="0")
+    tasks_blocked = Column(Integer, nullable=False, default=0, server_default="0")
+
+    project = relationship("ProjectModel", back_populates="epics", lazy="raise")
+    tasks = relationship("TaskModel", back_populates="epic", lazy="raise",
+                         cascade="all, delete-orphan", passive_deletes=True, order_by="TaskModel.id")
+
+    @validates("name")
+    def _sync_name_normalized(self, key, value):
+        self.name_normalized = normalize_name(value)
+        return value
     
 class TaskModel(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # El UNIQUE (epic_id, name_normalized) sirve además como índice para get_by_epic_id
+        UniqueConstraint("epic_id", "name_normalized", name="uq_tasks_epic_id_name_normalized"),
+        Index("ix_tasks_epic_id_status", "epic_id", "status"),
+        # Tareas de una persona (GET /assignees/{name}/tasks) paginadas por id o por updated_at
+        Index("ix_tasks_assignee_id", "assignee", "id"),
+        Index("ix_tasks_assignee_updated_at", "assignee", "updated_at"),
+        # Carga de trabajo (GET /assignees/workload): el GROUP BY assignee, status, priority se resuelve
+        # recorriendo solo este índice, que también sirve para filtrar por persona y estado
+        Index("ix_tasks_assignee_workload", "assignee", "status", "priority", "target_date"),
+        # COUNT/MAX(updated_at) de las tareas de una épica (ETag) sin leer la tabla
+        Index("ix_tasks_epic_id_updated_at", "epic_id", "updated_at"),
+        # Tareas vencidas (GET /tasks/due y el planificador de avisos): recorrido en orden (target_date, id)
+        # desde una marca de agua; el estado va en el índice para descartar las terminadas sin leer la tabla
+        Index("ix_tasks_target_date_id_status", "target_date", "id", "status"),
+        # Candidatas a archivar (tareas DONE antiguas) sin recorrer la tabla
+        Index("ix_tasks_status_updated_at", "status", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
-    epic_id = Column(Integer, ForeignKey("epics.id"), nullable=False)
+    epic_id = Column(Integer, ForeignKey("epics.id", ondelete="CASCADE"), nullable=False)
     name = Column(String(100), nullable=False)
+    name_normalized = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     finalization_criteria = Column(String(500), nullable=True)
     status = Column(SQLEnum(TaskStatus), default=TaskStatus.TO_DO)
@@ -52,8 +142,42 @@ class TaskModel(Base):
     
     # Fechas automáticas gestionadas por la base de datos
     created_at = Column(DateTime, default=datetime.datetime.now)
-    updated_at = Column(DateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
+    updated_at = Column(PreciseDateTime, default=datetime.datetime.now, onupdate=datetime.datetime.now)
     target_date = Column(DateTime, nullable=True)
     finalization_date = Column(DateTime, nullable=True)
-    
-    
+
+    epic = relationship("EpicModel", back_populates="tasks", lazy="raise")
+
+    @validates("name")
+    def _sync_name_normalized(self, key, value):
+        self.name_normalized = normalize_name(value)
+        return value
+
+def _archive_table(model, parent: Optional[str] = None) -> Table:
+    # Misma estructura que la tabla viva, sin claves foráneas ni UNIQUE (un nombre archivado se puede volver a usar)
+    # y con la fecha en que se archivó. Los IDs se conservan: un ID archivado no vuelve a existir en la tabla viva
+    columns = [Column(c.name, c.type, primary_key=c.primary_key, nullable=c.nullable, autoincrement=False)
+               for c in model.__table__.columns]
+    table = f"{model.__tablename__}_archive"
+    indexes = [Index(f"ix_{table}_{parent}", parent)] if parent else []
+    return Table(table, Base.metadata, *columns, Column("archived_at", DateTime, nullable=False), *indexes)
+
+# Archivo del trabajo terminado (ver repositories/archive.py): las filas completadas y antiguas se mueven aquí
+# para que las tablas vivas, sus índices y todas las consultas del día a día solo vean lo que sigue en uso
+ProjectArchiveTable = _archive_table(ProjectModel)
+EpicArchiveTable = _archive_table(EpicModel, "project_id")
+TaskArchiveTable = _archive_table(TaskModel, "epic_id")
+
+class ChangeLogModel(Base):
+    # Registro de cambios para la sincronización incremental (GET /sync). Los repositorios añaden una fila por
+    # cada creación, modificación o borrado en la misma transacción que la escritura; los borrados son físicos,
+    # así que esta tabla es la única constancia de qué IDs han desaparecido.
+    __tablename__ = "change_log"
+
+    # Secuencia monótona: el cursor de /sync. SQLite solo autoincrementa claves INTEGER
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity_type = Column(String(16), nullable=False) # ChangeEntity.value
+    entity_id = Column(Integer, nullable=False)
+    operation = Column(String(8), nullable=False) # ChangeOperation.value
+    changed_at = Column(PreciseDateTime, nullable=False, default=datetime.datetime.now)
+
@@ -0,0 +1,88 @@
+import logging
+import threading
+from collections import deque
+from dataclasses import replace
+from itertools import islice
+from typing import Deque, List, Optional
+from src.domain.entities.overdue import OverdueAlert
+from src.domain.repositories.overdue_sink import OverdueSink
+from src.infrastructure.config.settings import settings
+
+logger = logging.getLogger("kanban.overdue")
+
+
+class MemoryOverdueSink(OverdueSink):
+    # Historial acotado de avisos en el proceso, para GET /tasks/overdue/alerts. Cada aviso recibe un número
+    # consecutivo (seq) y el cliente pide "los posteriores a since"; si se superan max_alerts se pierden los más antiguos
+    def __init__(self, max_alerts: int):
+        self._alerts: Deque[OverdueAlert] = deque(maxlen=max_alerts)
+        self._last_seq = 0
+        self._lock = threading.Lock()
+
+    def publish(self, alerts: List[OverdueAlert]) -> None:
+        with self._lock:
+            for alert in alerts:
+                self._last_seq += 1
+                self._alerts.append(replace(alert, seq=self._last_seq))
+
+    def read(self, since: int = 0, limit: int = 100) -> List[OverdueAlert]:
+        """Avisos con seq > since, del más antiguo al más reciente"""
+        with self._lock:
+            if not self._alerts:
+                return []
+            # Los seq son consecutivos: la posición del primero que interesa se calcula sin recorrer el historial
+            start = max(0, since - self._alerts[0].seq + 1)
+            return list(islice(self._alerts, start, start + limit))
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._last_seq
+
+
+class LoggingOverdueSink(OverdueSink):
+    # Una línea de log por tarea vencida: para llevarlos a la herramienta de alertas que ya lea los logs
+    def publish(self, alerts: List[OverdueAlert]) -> None:
+        for alert in alerts:
+            logger.warning("Task %s overdue since %s (epic %s, assignee %s, status %s)", alert.task_id,
+                           alert.target_date.isoformat(), alert.epic_id, alert.assignee, alert.status.value)
+
+
+class CompositeOverdueSink(OverdueSink):
+    # Reparte cada lote entre varios destinos; el fallo de uno no impide que lleguen al resto
+    def __init__(self, sinks: List[OverdueSink]):
+        self.sinks = sinks
+
+    def publish(self, alerts: List[OverdueAlert]) -> None:
+        for sink in self.sinks:
+            try:
+                sink.publish(alerts)
+            except Exception:
+                logger.exception("Overdue sink %s failed", type(sink).__name__)
+
+
+_sink: Optional[CompositeOverdueSink] = None
+_feed: Optional[MemoryOverdueSink] = None
+_sink_lock = threading.Lock()
+
+def get_overdue_sink() -> OverdueSink:
+    """Destinos de los avisos del proceso, creados la primera vez según OVERDUE_SINKS ("memory", "log" o ambos)"""
+    global _sink, _feed
+    with _sink_lock:
+        if _sink is None:
+            sinks: List[OverdueSink] = []
+            for name in (part.strip() for part in settings.overdue_sinks.split(",")):
+                if name == "memory":
+                    _feed = MemoryOverdueSink(settings.overdue_feed_max)
+                    sinks.append(_feed)
+                elif name == "log":
+                    sinks.append(LoggingOverdueSink())
+                elif name:
+                    raise ValueError(f"Unknown overdue sink '{name}'")
+            _sink = CompositeOverdueSink(sinks)
+        return _sink
+
+def get_overdue_feed() -> Optional[MemoryOverdueSink]:
+    """Historial en memoria de los avisos, o None si OVERDUE_SINKS no incluye memory"""
+    get_overdue_sink()
+    return _feed
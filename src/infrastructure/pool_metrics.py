@@ -0,0 +1,108 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+@dataclass
+class PoolMetrics:
+    """Contadores de un pool de conexiones alimentados por los eventos de SQLAlchemy"""
+    name: str
+    connects: int = 0
+    checkouts: int = 0
+    checkins: int = 0
+    invalidations: int = 0
+    checkout_waits: int = 0
+    checkout_wait_seconds_total: float = 0.0
+    checkout_wait_seconds_max: float = 0.0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def observe_checkout_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.checkout_waits += 1
+            self.checkout_wait_seconds_total += seconds
+            self.checkout_wait_seconds_max = max(self.checkout_wait_seconds_max, seconds)
+
+    def increment(self, counter: str) -> None:
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+# Un registro por engine ("sync", "async"), indexado por el logging_name del pool,
+# que SQLAlchemy conserva cuando recrea el pool (engine.dispose())
+_registry: Dict[str, PoolMetrics] = {}
+_engines: Dict[str, Engine] = {}
+
+def _metrics_for(pool: Pool) -> PoolMetrics:
+    name = getattr(pool, "_orig_logging_name", None) or "default"
+    return _registry.setdefault(name, PoolMetrics(name))
+
+
+class _TimedCheckoutMixin:
+    # _do_get es el punto en el que QueuePool espera (hasta pool_timeout) a que quede una conexión libre
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()  # type: ignore[misc]
+        finally:
+            _metrics_for(self).observe_checkout_wait(time.perf_counter() - start)  # type: ignore[arg-type]
+
+class TimedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+class TimedAsyncAdaptedQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """Registra los eventos del pool de un engine bajo el nombre dado"""
+    _engines[name] = engine
+    metrics = _registry.setdefault(name, PoolMetrics(name))
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics.increment("connects")
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        metrics.increment("checkouts")
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics.increment("checkins")
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        # Incluye las conexiones descartadas por pre_ping al estar caducadas
+        metrics.increment("invalidations")
+
+
+def pool_snapshot() -> Dict[str, Dict[str, Union[int, float]]]:
+    """Estado actual de cada pool instrumentado: contadores acumulados y ocupación en este momento"""
+    snapshot: Dict[str, Dict[str, Any]] = {}
+    for name, engine in _engines.items():
+        pool = engine.pool
+        metrics = _registry[name]
+        data: Dict[str, Any] = {
+            "connects": metrics.connects,
+            "checkouts": metrics.checkouts,
+            "checkins": metrics.checkins,
+            "invalidations": metrics.invalidations,
+            "checkout_waits": metrics.checkout_waits,
+            "checkout_wait_seconds_total": round(metrics.checkout_wait_seconds_total, 6),
+            "checkout_wait_seconds_max": round(metrics.checkout_wait_seconds_max, 6),
+        }
+        if isinstance(pool, QueuePool):
+            data.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                # overflow() es negativo mientras no se han abierto todas las conexiones base del pool
+                "overflow": max(pool.overflow(), 0),
+            })
+        snapshot[name] = data
+    return snapshot
@@ -0,0 +1,101 @@
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("kanban.sql")
+
+# Los parámetros de una consulta lenta se recortan en el log: un executemany de la carga masiva lleva miles de filas
+MAX_LOGGED_PARAMETERS = 1000
+
+@dataclass
+class RequestQueries:
+    """Sentencias SQL y tiempo en la base de datos de la petición en curso"""
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+@dataclass
+class QueryMetrics:
+    """Contadores acumulados de las sentencias ejecutadas por un engine"""
+    name: str
+    statements: int = 0
+    seconds_total: float = 0.0
+    slow_statements: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, slow: bool) -> None:
+        with self._lock:
+            self.statements += 1
+            self.seconds_total += seconds
+            self.slow_statements += slow
+
+
+# La petición en curso. El threadpool de Starlette (run_in_threadpool) y los greenlets del modo async heredan el
+# contexto, así que las sentencias que lanzan los servicios se suman a la petición que las originó
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("kanban_request_queries", default=None)
+_registry: Dict[str, QueryMetrics] = {}
+
+@contextmanager
+def track_queries() -> Iterator[RequestQueries]:
+    """Cuenta las sentencias ejecutadas dentro del bloque (en este contexto) y el tiempo que tardan"""
+    queries = RequestQueries()
+    token = _current.set(queries)
+    try:
+        yield queries
+    finally:
+        _current.reset(token)
+
+
+def _format_parameters(parameters: Any) -> str:
+    text = repr(parameters)
+    if len(text) > MAX_LOGGED_PARAMETERS:
+        return f"{text[:MAX_LOGGED_PARAMETERS]}... ({len(text)} chars)"
+    return text
+
+def instrument_queries(engine: Engine, name: str, slow_query_ms: int) -> None:
+    """
+    Registra los eventos before/after_cursor_execute de un engine: cuenta cada sentencia (en el engine y en la
+    petición en curso) y deja en el log kanban.sql las que tardan slow_query_ms o más, con sus parámetros
+    (0: sin log de consultas lentas)
+    """
+    metrics = _registry.setdefault(name, QueryMetrics(name))
+    slow_seconds = slow_query_ms / 1000 if slow_query_ms > 0 else None
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        # Una conexión ejecuta una sentencia cada vez; si falla, la siguiente sobrescribe la marca
+        conn.info["query_started"] = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info.pop("query_started")
+        slow = slow_seconds is not None and elapsed >= slow_seconds
+        metrics.observe(elapsed, slow)
+        queries = _current.get()
+        if queries is not None:
+            queries.statements += 1
+            queries.db_seconds += elapsed
+        if slow:
+            logger.warning("Slow query (%.1f ms, %s engine%s): %s | parameters: %s", elapsed * 1000, name,
+                           ", executemany" if executemany else "", " ".join(statement.split()),
+                           _format_parameters(parameters))
+
+
+def query_snapshot() -> Dict[str, Dict[str, Union[int, float]]]:
+    """Sentencias, tiempo total y consultas lentas de cada engine instrumentado"""
+    return {
+        name: {
+            "statements": metrics.statements,
+            "seconds_total": round(metrics.seconds_total, 6),
+            "slow_statements": metrics.slow_statements,
+        }
+        for name, metrics in _registry.items()
+    }
@@ -0,0 +1,113 @@
+import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import Table, delete, exists, func, insert, literal, select
+from sqlalchemy.orm import Session
+from src.domain.entities.change import ChangeEntity
+from src.domain.entities.epic import EpicStatus
+from src.domain.entities.project import ProjectStatus
+from src.domain.entities.task import TaskStatus
+from src.infrastructure.models import (EpicArchiveTable, EpicModel, ProjectArchiveTable, ProjectModel,
+                                       TaskArchiveTable, TaskModel)
+from src.infrastructure.config.settings import settings
+from src.infrastructure.entity_cache import get_cache, invalidate
+from src.infrastructure.repositories.change_log import record_removed
+from src.infrastructure.repositories.counters import adjust_epic_counters, adjust_task_counters, count_by_parent_and_status
+
+# Archivo del trabajo terminado: mueve a las tablas *_archive, en lotes y con una transacción por lote, los
+# proyectos COMPLETED, las épicas COMPLETED y las tareas DONE que no se han modificado desde 'cutoff'.
+# Un proyecto se archiva con todas sus épicas y tareas, y una épica con todas sus tareas, solo si todo lo que cuelga
+# de él también está terminado y sin cambios desde 'cutoff': el estado de una épica no impide que tenga tareas
+# abiertas, y escribir en un hijo no cambia el updated_at del padre. Si no, se deja entero (y sus hijos terminados
+# se archivan sueltos).
+# Lo archivado deja de contar en los contadores, estadísticas, listados y búsqueda, y se anota en change_log como
+# borrado para que los clientes de /sync lo quiten de su copia; se sigue leyendo por ID con include_archived.
+# Los proyectos y épicas movidos se invalidan en la caché (en la de este proceso o en Redis; las cachés en memoria
+# de los workers de la API caducan con el TTL y, mientras, crear un hijo falla como "no existe" por la clave foránea)
+
+def _batches(db: Session, model, condition, batch_size: int) -> Iterator[List[int]]:
+    # IDs candidatos en lotes, con keyset por id: un lote que no se pueda mover no se vuelve a pedir
+    last_id = 0
+    while True:
+        ids = list(db.scalars(select(model.id).where(condition, model.id > last_id).order_by(model.id).limit(batch_size)))
+        if not ids:
+            return
+        yield ids
+        last_id = ids[-1]
+
+def _lock(db: Session, model, ids: List[int], guard=None) -> List[int]:
+    # Bloquea (MySQL) las filas que se van a mover: un hijo que se intente crear a la vez espera y luego falla
+    # por la clave foránea, en lugar de desaparecer con el borrado en cascada.
+    # La fila con el ID más alto nunca se archiva: SQLite (sin AUTOINCREMENT) reutilizaría su ID en la siguiente inserción
+    query = select(model.id).where(model.id.in_(ids), model.id < select(func.max(model.id)).correlate(None).scalar_subquery())
+    if guard is not None:
+        query = query.where(guard)
+    return list(db.scalars(query.with_for_update()))
+
+def _copy_and_delete(db: Session, model, archive: Table, entity: ChangeEntity, ids: List[int],
+                     archived_at: datetime.datetime, cache: Optional[str] = None) -> None:
+    # INSERT ... SELECT y DELETE de las mismas filas en la transacción actual: ningún dato pasa por Python
+    live = model.__table__
+    record_removed(db, entity, model, ids)
+    if cache is not None and settings.cache_enabled:
+        invalidate(db, get_cache(cache), ids)
+    db.execute(insert(archive).from_select([c.name for c in live.columns] + ["archived_at"],
+                                           select(*live.columns, literal(archived_at)).where(live.c.id.in_(ids))))
+    db.execute(delete(live).where(live.c.id.in_(ids)))
+
+def _move_tasks(db: Session, condition, batch_size: int, archived_at: datetime.datetime) -> int:
+    moved = 0
+    for batch in _batches(db, TaskModel, condition, batch_size):
+        ids = _lock(db, TaskModel, batch)
+        # Los contadores de las épicas que siguen vivas dejan de contar las tareas que se van
+        counts = count_by_parent_and_status(db, TaskModel, TaskModel.epic_id, ids)
+        _copy_and_delete(db, TaskModel, TaskArchiveTable, ChangeEntity.TASK, ids, archived_at)
+        adjust_task_counters(db, {key: -count for key, count in counts.items()})
+        db.commit()
+        moved += len(ids)
+    return moved
+
+def _move_epics(db: Session, epic_ids: List[int], done_tasks, batch_size: int,
+                archived_at: datetime.datetime) -> Tuple[int, int]:
+    # Primero sus tareas terminadas (en lotes) y después las épicas que ya no tengan ninguna viva: una tarea abierta
+    # creada mientras tanto se queda, y su épica con ella
+    moved_tasks = _move_tasks(db, TaskModel.epic_id.in_(epic_ids) & done_tasks, batch_size, archived_at)
+    ids = _lock(db, EpicModel, epic_ids, guard=~exists().where(TaskModel.epic_id == EpicModel.id))
+    counts = count_by_parent_and_status(db, EpicModel, EpicModel.project_id, ids)
+    _copy_and_delete(db, EpicModel, EpicArchiveTable, ChangeEntity.EPIC, ids, archived_at, cache="epics")
+    adjust_epic_counters(db, {key: -count for key, count in counts.items()})
+    db.commit()
+    return moved_tasks, len(ids)
+
+def archive_completed(db: Session, cutoff: datetime.datetime, batch_size: int = 1000) -> Dict[str, int]:
+    """
+    Archiva el trabajo terminado antes de cutoff (proyectos, luego épicas, luego tareas sueltas) y devuelve
+    cuántas filas de cada tipo se han movido. Es idempotente y se puede interrumpir: cada lote se confirma por separado.
+    """
+    archived_at = datetime.datetime.now()
+    moved = {"projects": 0, "epics": 0, "tasks": 0}
+
+    done_tasks = (TaskModel.status == TaskStatus.DONE) & (TaskModel.updated_at < cutoff)
+    completed_epics = ((EpicModel.status == EpicStatus.COMPLETED) & (EpicModel.updated_at < cutoff)
+                       & ~exists().where(TaskModel.epic_id == EpicModel.id, ~done_tasks))
+    completed_projects = ((ProjectModel.status == ProjectStatus.COMPLETED) & (ProjectModel.updated_at < cutoff)
+                          & ~exists().where(EpicModel.project_id == ProjectModel.id, ~completed_epics))
+
+    for project_ids in _batches(db, ProjectModel, completed_projects, batch_size):
+        epic_ids = list(db.scalars(select(EpicModel.id).where(EpicModel.project_id.in_(project_ids), completed_epics)))
+        for start in range(0, len(epic_ids), batch_size):
+            tasks, epics = _move_epics(db, epic_ids[start:start + batch_size], done_tasks, batch_size, archived_at)
+            moved["tasks"] += tasks
+            moved["epics"] += epics
+        ids = _lock(db, ProjectModel, project_ids, guard=~exists().where(EpicModel.project_id == ProjectModel.id))
+        _copy_and_delete(db, ProjectModel, ProjectArchiveTable, ChangeEntity.PROJECT, ids, archived_at,
+                         cache="projects")
+        db.commit()
+        moved["projects"] += len(ids)
+
+    for epic_ids in _batches(db, EpicModel, completed_epics, batch_size):
+        tasks, epics = _move_epics(db, epic_ids, done_tasks, batch_size, archived_at)
+        moved["tasks"] += tasks
+        moved["epics"] += epics
+
+    moved["tasks"] += _move_tasks(db, done_tasks, batch_size, archived_at)
+    return moved
@@ -0,0 +1,17 @@
+from typing import Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+# Tamaño de los lotes en las consultas masivas (IN (...)): 10k elementos caben en una sola sentencia
+# sin superar el límite de parámetros del driver (SQLite admite 32766)
+BULK_CHUNK_SIZE = 10_000
+
+def chunked(values: Iterable[T], size: int = BULK_CHUNK_SIZE) -> Iterator[List[T]]:
+    chunk: List[T] = []
+    for value in values:
+        chunk.append(value)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
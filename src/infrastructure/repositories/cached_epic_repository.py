@@ -0,0 +1,90 @@
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from src.domain.repositories.epic_repository import EpicRepository
+from src.domain.entities.epic import Epic, EpicPriority, EpicStatus
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.infrastructure.entity_cache import CacheBackend, invalidate
+
+class CachedEpicRepository(EpicRepository):
+    """
+    Decorador del puerto EpicRepository: get_by_id/get_by_ids leen primero de la caché (read-through)
+    y cualquier escritura sobre una épica invalida su entrada. El resto de operaciones se delegan tal cual.
+    """
+    def __init__(self, inner: EpicRepository, cache: CacheBackend, db: Session):
+        self.inner = inner
+        self.cache = cache
+        # Sesión de la transacción: las entradas se invalidan también al confirmarla (ver entity_cache.invalidate)
+        self.db = db
+
+    def get_by_id(self, epic_id: int) -> Optional[Epic]:
+        epic = self.cache.get(epic_id)
+        if epic is None:
+            # Si no existe, el repositorio lanza ValueError y no se guarda nada en caché
+            epic = self.inner.get_by_id(epic_id)
+            if epic is not None:
+                self.cache.set(epic_id, epic)
+        return epic
+
+    def get_by_ids(self, epic_ids: Iterable[int]) -> List[Epic]:
+        epics, missing = [], []
+        for epic_id in set(epic_ids):
+            epic = self.cache.get(epic_id)
+            if epic is None:
+                missing.append(epic_id)
+            else:
+                epics.append(epic)
+        if missing:
+            for epic in self.inner.get_by_ids(missing):
+                self.cache.set(epic.id, epic)
+                epics.append(epic)
+        return epics
+
+    def update(self, epic_id: int, epic: Epic) -> Epic:
+        invalidate(self.db, self.cache, [epic_id])
+        return self.inner.update(epic_id, epic)
+
+    def update_many(self, changes: List[Tuple[Epic, Collection[str]]]) -> List[Epic]:
+        invalidate(self.db, self.cache, [epic.id for epic, _ in changes])
+        return self.inner.update_many(changes)
+
+    def delete(self, epic_id: int) -> bool:
+        invalidate(self.db, self.cache, [epic_id])
+        return self.inner.delete(epic_id)
+
+    def delete_many(self, epic_ids: List[int]) -> int:
+        invalidate(self.db, self.cache, epic_ids)
+        return self.inner.delete_many(epic_ids)
+
+    # --- Sin caché: se delegan en el repositorio envuelto ---
+
+    def add(self, epic: Epic) -> Epic:
+        return self.inner.add(epic)
+
+    def add_many(self, epics: List[Epic]) -> List[Epic]:
+        return self.inner.add_many(epics)
+
+    def get_by_project_id(self, project_id: int) -> List[Epic]:
+        return self.inner.get_by_project_id(project_id)
+
+    def list_by_project_id(self, project_id: int) -> List[Epic]:
+        return self.inner.list_by_project_id(project_id)
+
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                 project_id: Optional[int] = None) -> Page[Epic]:
+        return self.inner.get_page(limit, cursor=cursor, order_by=order_by, status=status,
+                                   priority=priority, project_id=project_id)
+
+    def get_version(self, status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                    project_id: Optional[int] = None) -> Version:
+        return self.inner.get_version(status=status, priority=priority, project_id=project_id)
+
+    def exists_by_name(self, project_id: int, name: str, exclude_id: Optional[int] = None) -> bool:
+        return self.inner.exists_by_name(project_id, name, exclude_id=exclude_id)
+
+    def get_count_by_project_id(self, project_id: int, status: Optional[EpicStatus] = None) -> int:
+        return self.inner.get_count_by_project_id(project_id, status=status)
+
+    def get_ids_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        return self.inner.get_ids_by_names(keys)
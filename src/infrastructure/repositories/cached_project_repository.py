@@ -0,0 +1,71 @@
+from typing import Iterable, List, Optional
+from sqlalchemy.orm import Session
+from src.domain.repositories.project_repository import ProjectRepository
+from src.domain.entities.project import Project, ProjectStatus
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.board import ProjectBoard
+from src.infrastructure.entity_cache import CacheBackend, invalidate
+
+class CachedProjectRepository(ProjectRepository):
+    """
+    Decorador del puerto ProjectRepository: get_by_id/get_by_ids leen primero de la caché (read-through)
+    y cualquier escritura sobre un proyecto invalida su entrada. El resto de operaciones se delegan tal cual.
+    """
+    def __init__(self, inner: ProjectRepository, cache: CacheBackend, db: Session):
+        self.inner = inner
+        self.cache = cache
+        # Sesión de la transacción: las entradas se invalidan también al confirmarla (ver entity_cache.invalidate)
+        self.db = db
+
+    def get_by_id(self, project_id: int) -> Optional[Project]:
+        project = self.cache.get(project_id)
+        if project is None:
+            # Si no existe, el repositorio lanza ValueError y no se guarda nada en caché
+            project = self.inner.get_by_id(project_id)
+            if project is not None:
+                self.cache.set(project_id, project)
+        return project
+
+    def get_by_ids(self, project_ids: Iterable[int]) -> List[Project]:
+        projects, missing = [], []
+        for project_id in set(project_ids):
+            project = self.cache.get(project_id)
+            if project is None:
+                missing.append(project_id)
+            else:
+                projects.append(project)
+        if missing:
+            for project in self.inner.get_by_ids(missing):
+                self.cache.set(project.id, project)
+                projects.append(project)
+        return projects
+
+    def update(self, project_id: int, project: Project) -> Project:
+        invalidate(self.db, self.cache, [project_id])
+        return self.inner.update(project_id, project)
+
+    def delete(self, project_id: int) -> bool:
+        invalidate(self.db, self.cache, [project_id])
+        return self.inner.delete(project_id)
+
+    # --- Sin caché: se delegan en el repositorio envuelto ---
+
+    def add(self, project: Project) -> Project:
+        return self.inner.add(project)
+
+    def get_board(self, project_id: int) -> ProjectBoard:
+        return self.inner.get_board(project_id)
+
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[ProjectStatus] = None) -> Page[Project]:
+        return self.inner.get_page(limit, cursor=cursor, order_by=order_by, status=status)
+
+    def get_version(self, status: Optional[ProjectStatus] = None) -> Version:
+        return self.inner.get_version(status=status)
+
+    def get_board_version(self, project_id: int) -> Version:
+        return self.inner.get_board_version(project_id)
+
+    def exists_by_name(self, name: str, exclude_id: Optional[int] = None) -> bool:
+        return self.inner.exists_by_name(name, exclude_id=exclude_id)
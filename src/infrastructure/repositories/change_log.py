@@ -0,0 +1,60 @@
+import datetime
+from typing import Any, Iterable
+from sqlalchemy import delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+from src.infrastructure.models import ChangeLogModel, EpicModel, TaskModel
+
+# Los repositorios llaman a estas funciones en la misma transacción que la escritura: si se deshace,
+# tampoco queda constancia en el registro
+
+def record_changes(db: Session, entity: ChangeEntity, entity_ids: Iterable[int], operation: ChangeOperation) -> None:
+    """Añade al registro de cambios una fila por ID con un único INSERT (executemany)"""
+    now = datetime.datetime.now()
+    rows = [{"entity_type": entity.value, "entity_id": entity_id, "operation": operation.value, "changed_at": now}
+            for entity_id in entity_ids]
+    if rows:
+        db.execute(insert(ChangeLogModel), rows)
+
+def _record_deleted_from(db: Session, entity: ChangeEntity, entity_id: Any, condition: Any) -> None:
+    # INSERT ... SELECT: los IDs se leen y se registran sin salir de la base de datos
+    db.execute(insert(ChangeLogModel).from_select(
+        ["entity_type", "entity_id", "operation", "changed_at"],
+        select(literal(entity.value), entity_id, literal(ChangeOperation.DELETE.value),
+               literal(datetime.datetime.now(), ChangeLogModel.changed_at.type)).where(condition),
+    ))
+
+def record_removed(db: Session, entity: ChangeEntity, model: Any, ids: Iterable[int]) -> None:
+    """Registra como borradas las filas con estos IDs que siguen en la tabla viva (antes de moverlas al archivo)"""
+    _record_deleted_from(db, entity, model.id, model.id.in_(list(ids)))
+
+def record_cascade_from_epics(db: Session, epic_ids: Iterable[int]) -> None:
+    """Registra como borradas las tareas que ON DELETE CASCADE eliminará junto con estas épicas"""
+    _record_deleted_from(db, ChangeEntity.TASK, TaskModel.id, TaskModel.epic_id.in_(list(epic_ids)))
+
+def record_cascade_from_project(db: Session, project_id: int) -> None:
+    """Registra como borradas las épicas (y sus tareas) que ON DELETE CASCADE eliminará junto con el proyecto"""
+    epic_ids = select(EpicModel.id).where(EpicModel.project_id == project_id)
+    _record_deleted_from(db, ChangeEntity.TASK, TaskModel.id, TaskModel.epic_id.in_(epic_ids))
+    _record_deleted_from(db, ChangeEntity.EPIC, EpicModel.id, EpicModel.project_id == project_id)
+
+def prune_change_log(db: Session, cutoff: datetime.datetime, batch_size: int = 1000) -> int:
+    """
+    Borra las entradas del registro anteriores a cutoff, en lotes de batch_size con una transacción por lote, y
+    devuelve cuántas ha borrado. Solo un prefijo contiguo de la secuencia: /sync detecta un cursor purgado
+    comparándolo con la primera secuencia que queda, así que no puede haber huecos purgados por encima
+    """
+    first_kept = db.scalar(select(ChangeLogModel.seq).where(ChangeLogModel.changed_at >= cutoff)
+                           .order_by(ChangeLogModel.seq).limit(1))
+    if first_kept is None:
+        # Todo es anterior a cutoff: se conserva la última entrada, porque SQLite (sin AUTOINCREMENT) reutilizaría su seq
+        first_kept = db.scalar(select(func.max(ChangeLogModel.seq)))
+    deleted = 0
+    while first_kept is not None:
+        seqs = list(db.scalars(select(ChangeLogModel.seq).where(ChangeLogModel.seq < first_kept)
+                               .order_by(ChangeLogModel.seq).limit(batch_size)))
+        if not seqs:
+            break
+        deleted += db.execute(delete(ChangeLogModel).where(ChangeLogModel.seq <= seqs[-1])).rowcount
+        db.commit()
+    return deleted
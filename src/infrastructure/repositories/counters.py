@@ -0,0 +1,83 @@
+from collections import Counter, defaultdict
+from enum import Enum
+from typing import Dict, Iterable, Mapping, Tuple, Type
+from sqlalchemy import Table, bindparam, func, or_, select, update
+from sqlalchemy.orm import Session
+from src.domain.entities.epic import EpicStatus
+from src.domain.entities.task import TaskStatus
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.bulk import chunked
+
+# Contadores desnormalizados por estado: tareas de cada épica (EpicModel.tasks_<estado>) y épicas de cada
+# proyecto (ProjectModel.epics_<estado>). Los repositorios los ajustan en la misma transacción que la escritura
+# con UPDATE ... SET c = c + n (atómico, sin leer antes el valor) y reconcile_counters los recalcula en bloque.
+# Ninguno de los dos toca updated_at (se fija a su propio valor para que no salte el onupdate del modelo): cambiar los
+# hijos no edita al padre, y updated_at sigue sirviendo para el orden de las páginas, los ETag, la caché y el archivo
+TASK_COUNTERS: Dict[TaskStatus, str] = {status: f"tasks_{status.value}" for status in TaskStatus}
+EPIC_COUNTERS: Dict[EpicStatus, str] = {status: f"epics_{status.value}" for status in EpicStatus}
+
+# Deltas por (id del padre, estado del hijo)
+Deltas = Mapping[Tuple[int, Enum], int]
+
+def _adjust(db: Session, table: Table, counters: Mapping[Enum, str], default: Enum, deltas: Deltas) -> None:
+    by_parent: Dict[int, Dict[str, int]] = defaultdict(lambda: dict.fromkeys(counters.values(), 0))
+    for (parent_id, status), delta in deltas.items():
+        if delta:
+            # Filas antiguas con estado nulo: cuentan como el valor por defecto del modelo
+            by_parent[parent_id][counters[status or default]] += delta
+    if not by_parent:
+        return
+    # Un único UPDATE por lotes (executemany) sea cual sea el número de padres afectados
+    statement = update(table).where(table.c.id == bindparam("parent_id")).values(
+        {**{column: table.c[column] + bindparam(f"delta_{column}") for column in counters.values()},
+         "updated_at": table.c.updated_at})
+    db.execute(statement, [{"parent_id": parent_id, **{f"delta_{column}": delta for column, delta in columns.items()}}
+                           for parent_id, columns in by_parent.items()])
+
+def adjust_task_counters(db: Session, deltas: Deltas) -> None:
+    """Suma los deltas a los contadores de tareas de cada épica: {(epic_id, TaskStatus): n}"""
+    _adjust(db, EpicModel.__table__, TASK_COUNTERS, TaskStatus.TO_DO, deltas) # type: ignore[arg-type]
+
+def adjust_epic_counters(db: Session, deltas: Deltas) -> None:
+    """Suma los deltas a los contadores de épicas de cada proyecto: {(project_id, EpicStatus): n}"""
+    _adjust(db, ProjectModel.__table__, EPIC_COUNTERS, EpicStatus.NOT_STARTED, deltas) # type: ignore[arg-type]
+
+def count_by_parent_and_status(db: Session, model: Type, parent_column, ids: Iterable[int]) -> Counter:
+    """Cuántas de las filas indicadas hay por (padre, estado): lo que restar antes de borrarlas o cambiarlas"""
+    counts: Counter = Counter()
+    for chunk in chunked(list(ids)):
+        query = (select(parent_column, model.status, func.count())
+                 .where(model.id.in_(chunk)).group_by(parent_column, model.status))
+        for parent_id, status, count in db.execute(query):
+            counts[(parent_id, status)] += count
+    return counts
+
+def _status_is(column, status: Enum, default: Enum):
+    return or_(column == status, column.is_(None)) if status == default else column == status
+
+def reconcile_counters(db: Session) -> Dict[str, int]:
+    """
+    Recalcula todos los contadores con dos UPDATE con subconsultas correlacionadas (uno por tabla) y devuelve
+    cuántas filas estaban desajustadas. Solo escribe las filas que no coinciden.
+    """
+    task_counts = {
+        column: select(func.count()).where(TaskModel.epic_id == EpicModel.id,
+                                           _status_is(TaskModel.status, status, TaskStatus.TO_DO)).scalar_subquery()
+        for status, column in TASK_COUNTERS.items()
+    }
+    epic_counts = {
+        column: select(func.count()).where(EpicModel.project_id == ProjectModel.id,
+                                           _status_is(EpicModel.status, status, EpicStatus.NOT_STARTED)).scalar_subquery()
+        for status, column in EPIC_COUNTERS.items()
+    }
+    epics = db.execute(
+        update(EpicModel.__table__)
+        .where(or_(*(EpicModel.__table__.c[column] != count for column, count in task_counts.items())))
+        .values({**task_counts, "updated_at": EpicModel.__table__.c.updated_at})
+    ).rowcount
+    projects = db.execute(
+        update(ProjectModel.__table__)
+        .where(or_(*(ProjectModel.__table__.c[column] != count for column, count in epic_counts.items())))
+        .values({**epic_counts, "updated_at": ProjectModel.__table__.c.updated_at})
+    ).rowcount
+    return {"epics": epics, "projects": projects}
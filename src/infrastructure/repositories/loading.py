@@ -0,0 +1,21 @@
+from enum import Enum
+from sqlalchemy.orm import Load, joinedload, raiseload, selectinload
+
+class LoadingStrategy(str, Enum):
+    """Cómo cargan los repositorios las relaciones en las lecturas jerárquicas"""
+    # Por defecto: cualquier acceso a una relación lanza un error, así que un N+1 no puede colarse sin avisar
+    RAISE = "raise"
+    # Un SELECT ... WHERE parent_id IN (...) adicional por nivel de la jerarquía
+    SELECTIN = "selectin"
+    # Un único SELECT con LEFT OUTER JOIN (menos viajes, pero repite las columnas del padre en cada fila)
+    JOINED = "joined"
+
+def load_path(strategy: LoadingStrategy, *attributes) -> Load:
+    """Opción de carga de una cadena de relaciones (p. ej. ProjectModel.epics, EpicModel.tasks) según la estrategia"""
+    if strategy == LoadingStrategy.RAISE:
+        return raiseload(attributes[0])
+    loader = selectinload if strategy == LoadingStrategy.SELECTIN else joinedload
+    option = loader(attributes[0])
+    for attribute in attributes[1:]:
+        option = getattr(option, loader.__name__)(attribute)
+    return option
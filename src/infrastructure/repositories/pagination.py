@@ -0,0 +1,69 @@
+import base64
+import datetime
+import json
+from typing import Any, Callable, List, Optional, TypeVar
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+from src.domain.entities.page import Page
+
+T = TypeVar("T")
+
+# Columnas por las que se permite ordenar la paginación keyset.
+# "id" es estable y único; "updated_at" se desempata siempre con el id.
+ORDER_FIELDS = ("id", "updated_at")
+
+def encode_cursor(values: List[Any]) -> str:
+    # Serializamos la clave del último elemento devuelto (p.ej. [updated_at, id])
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime.datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str, order_by: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if order_by in ("updated_at", "target_date"):
+            updated_at, last_id = values
+            return [datetime.datetime.fromisoformat(updated_at), int(last_id)]
+        if order_by == "assignee":
+            (last_assignee,) = values
+            return [str(last_assignee)]
+        (last_id,) = values
+        return [int(last_id)]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+def paginate(query: Query, model: Any, limit: int, cursor: Optional[str], order_by: str,
+             to_entities: Callable[[List[Any]], List[T]]) -> Page[T]:
+    """Aplica la paginación keyset a una query ya filtrada y devuelve una Page de entidades (convertidas por lote)"""
+    if order_by not in ORDER_FIELDS:
+        raise ValueError(f"Invalid order field '{order_by}'")
+    if limit < 1:
+        raise ValueError("Limit must be greater than 0")
+
+    # La condición "después del cursor" usa el índice en lugar de un OFFSET que recorre filas
+    if order_by == "updated_at":
+        if cursor:
+            last_updated_at, last_id = decode_cursor(cursor, order_by)
+            query = query.filter(or_(
+                model.updated_at > last_updated_at,
+                and_(model.updated_at == last_updated_at, model.id > last_id),
+            ))
+        query = query.order_by(model.updated_at, model.id)
+    else:
+        if cursor:
+            (last_id,) = decode_cursor(cursor, order_by)
+            query = query.filter(model.id > last_id)
+        query = query.order_by(model.id)
+
+    # Pedimos un elemento de más para saber si existe una página siguiente
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    next_cursor = None
+    if has_more:
+        last = rows[-1]
+        key: List[Any] = [last.updated_at, last.id] if order_by == "updated_at" else [last.id]
+        next_cursor = encode_cursor(key)
+
+    return Page(items=to_entities(rows), next_cursor=next_cursor)
@@ -0,0 +1,52 @@
+import datetime
+from typing import Iterable, List, Sequence
+from sqlalchemy import Table
+from src.domain.entities.epic import Epic
+from src.domain.entities.project import Project
+from src.domain.entities.task import Task
+
+# Conversión directa de filas Core (tuplas) a entidades para las lecturas de listas: sin instancias del ORM
+# (ni identity map ni instrumentación) y sin int()/str()/Enum() por campo, porque los tipos de las columnas ya
+# devuelven int, str y los miembros del Enum. Se desempaqueta por posición, así que las consultas deben
+# seleccionar exactamente las columnas de *_FIELDS y en ese orden (ver columns()).
+# Los valores por defecto son los mismos que en los _to_entity de los repositorios (now() se calcula una vez por lote)
+
+PROJECT_FIELDS = ("id", "name", "description", "finalization_criteria", "status", "budget", "start_date",
+                  "updated_at", "end_date")
+EPIC_FIELDS = ("id", "project_id", "name", "description", "completion_criteria", "status", "priority",
+               "start_date", "updated_at", "end_date")
+TASK_FIELDS = ("id", "epic_id", "name", "description", "created_at", "updated_at", "target_date",
+               "finalization_criteria", "finalization_date", "status", "assignee", "priority")
+
+def columns(table: Table, fields: Sequence[str]) -> list:
+    """Columnas de fields en 'table' (tabla viva, de archivo o subconsulta), en el orden que esperan los conversores"""
+    return [table.c[field] for field in fields]
+
+def projects_from_rows(rows: Iterable[Sequence]) -> List[Project]:
+    now = datetime.datetime.now()
+    return [
+        Project(id=id, name=name, description=description or None, finalization_criteria=finalization_criteria or None,
+                status=status or None, budget=budget, start_date=start_date or now,
+                updated_at=now if updated_at is None else updated_at, end_date=end_date or None)
+        for id, name, description, finalization_criteria, status, budget, start_date, updated_at, end_date in rows
+    ]
+
+def epics_from_rows(rows: Iterable[Sequence]) -> List[Epic]:
+    now = datetime.datetime.now()
+    return [
+        Epic(project_id=project_id, name=name, id=id, description=description or None,
+             completion_criteria=completion_criteria or None, status=status or None, priority=priority or None,
+             start_date=start_date or now, updated_at=now if updated_at is None else updated_at, end_date=end_date or None)
+        for id, project_id, name, description, completion_criteria, status, priority, start_date, updated_at, end_date in rows
+    ]
+
+def tasks_from_rows(rows: Iterable[Sequence]) -> List[Task]:
+    now = datetime.datetime.now()
+    return [
+        Task(epic_id=epic_id, name=name, id=id, description=description or None, created_at=created_at or now,
+             updated_at=now if updated_at is None else updated_at, target_date=target_date or None,
+             finalization_criteria=finalization_criteria or None, finalization_date=finalization_date or None,
+             status=status or None, assignee=assignee or None, priority=priority or None)
+        for id, epic_id, name, description, created_at, updated_at, target_date, finalization_criteria,
+            finalization_date, status, assignee, priority in rows
+    ]
@@ -0,0 +1,40 @@
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.domain.repositories.archive_repository import ArchiveRepository
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+from src.infrastructure.models import EpicArchiveTable, ProjectArchiveTable, TaskArchiveTable
+from src.infrastructure.repositories.row_mapping import (EPIC_FIELDS, PROJECT_FIELDS, TASK_FIELDS, columns,
+                                                         epics_from_rows, projects_from_rows, tasks_from_rows)
+
+class SQLAlchemyArchiveRepository(ArchiveRepository):
+    # Lecturas sobre las tablas *_archive (ver repositories/archive.py). Tienen las mismas columnas que las vivas,
+    # así que las filas se convierten a entidades con los mismos conversores que usan los repositorios
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_project_by_id(self, project_id: int) -> Optional[Project]:
+        rows = self.db.execute(select(*columns(ProjectArchiveTable, PROJECT_FIELDS)).where(ProjectArchiveTable.c.id == project_id))
+        return next(iter(projects_from_rows(rows)), None)
+
+    def get_epic_by_id(self, epic_id: int) -> Optional[Epic]:
+        rows = self.db.execute(select(*columns(EpicArchiveTable, EPIC_FIELDS)).where(EpicArchiveTable.c.id == epic_id))
+        return next(iter(epics_from_rows(rows)), None)
+
+    def get_task_by_id(self, task_id: int) -> Optional[Task]:
+        rows = self.db.execute(select(*columns(TaskArchiveTable, TASK_FIELDS)).where(TaskArchiveTable.c.id == task_id))
+        return next(iter(tasks_from_rows(rows)), None)
+
+    def get_epics_by_project_id(self, project_id: int) -> List[Epic]:
+        # Índice (project_id) de epics_archive
+        rows = self.db.execute(select(*columns(EpicArchiveTable, EPIC_FIELDS))
+                               .where(EpicArchiveTable.c.project_id == project_id).order_by(EpicArchiveTable.c.id))
+        return epics_from_rows(rows)
+
+    def get_tasks_by_epic_id(self, epic_id: int) -> List[Task]:
+        # Índice (epic_id) de tasks_archive
+        rows = self.db.execute(select(*columns(TaskArchiveTable, TASK_FIELDS))
+                               .where(TaskArchiveTable.c.epic_id == epic_id).order_by(TaskArchiveTable.c.id))
+        return tasks_from_rows(rows)
@@ -0,0 +1,53 @@
+from typing import List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from src.domain.repositories.change_log_repository import ChangeLogRepository
+from src.domain.entities.change import Change, ChangeEntity, ChangeOperation
+from src.infrastructure.models import ChangeLogModel
+
+# MySQL 8: "Statement aborted because lock(s) could not be acquired immediately and NOWAIT is set"
+ER_LOCK_NOWAIT = 3572
+
+class SQLAlchemyChangeLogRepository(ChangeLogRepository):
+    def __init__(self, db: Session):
+        self.db = db
+
+    def _to_entity(self, db_model: ChangeLogModel) -> Change:
+        return Change(
+            seq=int(db_model.seq), # type: ignore
+            entity=ChangeEntity(db_model.entity_type),
+            entity_id=int(db_model.entity_id), # type: ignore
+            operation=ChangeOperation(db_model.operation),
+            changed_at=db_model.changed_at, # type: ignore
+        )
+
+    def get_since(self, seq: int, limit: int) -> List[Change]:
+        # Rango sobre la clave primaria: el coste depende de los cambios devueltos, no del tamaño del registro
+        query = select(ChangeLogModel).where(ChangeLogModel.seq > seq).order_by(ChangeLogModel.seq).limit(limit)
+        return [self._to_entity(db_change) for db_change in self.db.scalars(query)]
+
+    def get_first_seq(self) -> Optional[int]:
+        # MIN sobre la clave primaria: se resuelve con el índice
+        return self.db.scalar(select(func.min(ChangeLogModel.seq)))
+
+    def is_pending(self, after: int, before: int) -> bool:
+        backend = self.db.get_bind().dialect.name
+        if backend == "sqlite":
+            # SQLite serializa las escrituras: si ya se ve un cambio confirmado posterior al hueco, la transacción
+            # que tenía esos números ya ha terminado, y si no están es que se deshizo
+            return False
+        if backend == "mysql":
+            # Una lectura con bloqueo tiene que esperar al bloqueo implícito de las filas insertadas por transacciones
+            # aún abiertas; con NOWAIT falla al momento en lugar de esperar. Sin filas bloqueadas, el hueco es definitivo
+            gap = (ChangeLogModel.seq > after) & (ChangeLogModel.seq < before)
+            try:
+                with self.db.begin_nested():
+                    self.db.execute(select(ChangeLogModel.seq).where(gap).with_for_update(read=True, nowait=True)).all()
+            except OperationalError as e:
+                if e.orig.args[0] == ER_LOCK_NOWAIT: # type: ignore[union-attr]
+                    return True
+                raise
+            return False
+        # Otros backends: no se sabe, así que el hueco se espera hasta que pase GAP_SETTLE_SECONDS
+        return True
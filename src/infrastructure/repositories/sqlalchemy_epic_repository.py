@@ -1,13 +1,32 @@
 import datetime
-from typing import List, Optional
+from collections import Counter
+from typing import Collection, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from src.domain.repositories.epic_repository import EpicRepository
 from src.domain.entities.epic import Epic, EpicPriority, EpicStatus
-from src.infrastructure.models import EpicModel
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+from src.infrastructure.models import EpicModel, ProjectModel, is_missing_parent, is_name_conflict, normalize_name
+from src.infrastructure.repositories.pagination import paginate
+from src.infrastructure.repositories.bulk import chunked
+from src.infrastructure.repositories.change_log import record_cascade_from_epics, record_changes
+from src.infrastructure.repositories.counters import EPIC_COUNTERS, adjust_epic_counters, count_by_parent_and_status
+from src.infrastructure.repositories.row_mapping import EPIC_FIELDS, columns, epics_from_rows
+
+# Las lecturas de listas seleccionan estas columnas (filas Core, no instancias del ORM) y las convierte epics_from_rows
+EPIC_COLUMNS = columns(EpicModel.__table__, EPIC_FIELDS) # type: ignore[arg-type]
+# Campos que update_many escribe si vienen en el cambio (el proyecto de una épica no cambia)
+UPDATABLE_FIELDS = ("name", "description", "completion_criteria", "status", "priority", "start_date", "end_date")
 
 class SQLAlchemyEpicRepository(EpicRepository):
     def __init__(self, db: Session):
         self.db = db
+        # El identity map de la sesión guarda referencias débiles: retenemos las filas leídas por ID para que
+        # update()/delete() reutilicen la que el servicio acaba de cargar en lugar de volver a consultarla
+        self._loaded: Dict[int, EpicModel] = {}
     
     # funcion privada para convertir de modelo de DB a entidad de Dominio y evitar repetición de código y errores de Pylance
     def _to_entity(self, db_model: EpicModel) -> Epic:
@@ -33,24 +52,37 @@ class SQLAlchemyEpicRepository(EpicRepository):
             name=epic.name,
             description=epic.description,
             completion_criteria=epic.completion_criteria,
-            status=epic.status.value,
-            priority=epic.priority.value,
+            status=epic.status,
+            priority=epic.priority,
             start_date=epic.start_date,
             end_date=epic.end_date
         )
         # 2. Guardamos en MySQL
         self.db.add(db_epic)
-        self.db.commit()
-        self.db.refresh(db_epic) # Para obtener el ID generado automáticamente
+        try:
+            # flush envía el INSERT dentro de la transacción de la petición; el COMMIT lo hace quien la gestiona
+            self.db.flush()
+        except IntegrityError as e:
+            # El índice UNIQUE sobre name_normalized aplica la regla de nombres duplicados
+            if is_name_conflict(e):
+                raise ValueError(f"The epic with name '{epic.name}' already exists in project ID {epic.project_id}.")
+            if is_missing_parent(e):
+                raise ValueError(f"The project with ID {epic.project_id} does not exist.")
+            raise
+        # No hace falta refresh: el flush ya rellena el ID generado y los valores por defecto se calculan en Python
+        record_changes(self.db, ChangeEntity.EPIC, [db_epic.id], ChangeOperation.UPSERT) # type: ignore
+        adjust_epic_counters(self.db, {(epic.project_id, db_epic.status): 1}) # type: ignore[dict-item]
         
         # 3. Devolvemos el objeto actualizado con su ID
         epic.id = db_epic.id if isinstance(db_epic.id, int) else None
         return self._to_entity(db_epic)
     
     def update(self, epic_id:int, epic: Epic) -> Optional[Epic]:
-        db_epic = self.db.query(EpicModel).filter(EpicModel.id == epic_id).first()
+        # get() reutiliza la fila que el servicio ya cargó en esta sesión (identity map), sin otro SELECT
+        db_epic = self.db.get(EpicModel, epic_id)
         if not db_epic:
             raise ValueError("Epic not found")
+        previous_status = db_epic.status
         
         #Actualizamos los campos en los que se ha escrito alguna información
         #Usamos ignore para evitar errores marcados por Pylance por la duda de tipos en el metacodigo de sqlalchemy
@@ -65,53 +97,198 @@ class SQLAlchemyEpicRepository(EpicRepository):
             db_epic.completion_criteria = epic.completion_criteria # type: ignore
             
         if epic.status is not None:
-            db_epic.status = epic.status.value # type: ignore
+            db_epic.status = epic.status # type: ignore
 
         if epic.priority is not None:
-            db_epic.priority = epic.priority.value  # type: ignore
+            db_epic.priority = epic.priority  # type: ignore
             
         if epic.end_date is not None:
             db_epic.end_date = epic.end_date  # type: ignore
         
         db_epic.updated_at = datetime.datetime.now()  # type: ignore
         
-        self.db.commit()
-        self.db.refresh(db_epic)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError(f"The epic with name '{epic.name}' already exists in project ID {db_epic.project_id}.")
+            raise
+        record_changes(self.db, ChangeEntity.EPIC, [epic_id], ChangeOperation.UPSERT)
+        if db_epic.status != previous_status:
+            project_id = int(db_epic.project_id) # type: ignore
+            adjust_epic_counters(self.db, {(project_id, previous_status): -1, (project_id, db_epic.status): 1}) # type: ignore[dict-item]
         
         return self._to_entity(db_epic)
     
     def get_by_id(self, epic_id: int) -> Optional[Epic]:
-        db_epic = self.db.query(EpicModel).filter(EpicModel.id == epic_id).first()
+        db_epic = self.db.get(EpicModel, epic_id)
         if not db_epic:
             raise ValueError("Epic not found")
+        self._loaded[epic_id] = db_epic
         
         return self._to_entity(db_epic)
     
-    def get_all(self) -> Optional[List[Epic]]:
-        db_epics = self.db.query(EpicModel).all()
-        if not db_epics:
-            raise ValueError("No epics found")
-        
-        #Retornamos una lista de db_epic como hemos tipado en la función
-        return [self._to_entity(db_epic) for db_epic in db_epics]
+    def _filter(self, query, status: Optional[EpicStatus], priority: Optional[EpicPriority], project_id: Optional[int]):
+        # Los filtros se aplican en la base de datos, nunca cargamos la tabla completa
+        if status is not None:
+            query = query.filter(EpicModel.status == status)
+        if priority is not None:
+            query = query.filter(EpicModel.priority == priority)
+        if project_id is not None:
+            query = query.filter(EpicModel.project_id == project_id)
+        return query
+
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                 project_id: Optional[int] = None) -> Page[Epic]:
+        query = self._filter(self.db.query(*EPIC_COLUMNS), status, priority, project_id)
+        return paginate(query, EpicModel, limit, cursor, order_by, epics_from_rows)
+
+    def get_version(self, status: Optional[EpicStatus] = None, priority: Optional[EpicPriority] = None,
+                    project_id: Optional[int] = None) -> Version:
+        # Con project_id se resuelve solo con el índice (project_id, updated_at)
+        query = self._filter(self.db.query(func.count(EpicModel.id), func.max(EpicModel.updated_at)),
+                             status, priority, project_id)
+        count, last_modified = query.one()
+        return Version(count, last_modified)
     
     def get_by_project_id(self, project_id: int) -> Optional[List[Epic]]:
-        db_epics = self.db.query(EpicModel).filter(EpicModel.project_id == project_id).all()
+        rows = self.db.query(*EPIC_COLUMNS).filter(EpicModel.project_id == project_id).all()
         if not project_id:
             raise ValueError("Project ID must be provided")
-        if not db_epics:
+        if not rows:
             raise ValueError("No epics found for the given project ID")
-        return [self._to_entity(db_epic) for db_epic in db_epics]
+        return epics_from_rows(rows)
+    
+    def list_by_project_id(self, project_id: int) -> List[Epic]:
+        # Resuelto con el índice (project_id, status); a diferencia de get_by_project_id, un proyecto sin épicas no es un error
+        return epics_from_rows(self.db.query(*EPIC_COLUMNS).filter(EpicModel.project_id == project_id).order_by(EpicModel.id))
+    
+    def exists_by_name(self, project_id: int, name: str, exclude_id: Optional[int] = None) -> bool:
+        # Un único SELECT ... LIMIT 1 resuelto con el índice UNIQUE (project_id, name_normalized)
+        query = self.db.query(EpicModel.id).filter(EpicModel.project_id == project_id,
+                                                   EpicModel.name_normalized == normalize_name(name))
+        if exclude_id is not None:
+            query = query.filter(EpicModel.id != exclude_id)
+        return query.limit(1).first() is not None
     
     def delete(self, epic_id: int) -> bool:
-        db_epic = self.db.query(EpicModel).filter(EpicModel.id == epic_id).first()
+        db_epic = self.db.get(EpicModel, epic_id)
         if not db_epic:
             raise ValueError("Epic not found")
         
+        # Borrado físico: registramos también las tareas que la base de datos eliminará en cascada
+        record_cascade_from_epics(self.db, [epic_id])
+        record_changes(self.db, ChangeEntity.EPIC, [epic_id], ChangeOperation.DELETE)
+        adjust_epic_counters(self.db, {(int(db_epic.project_id), db_epic.status): -1}) # type: ignore
         self.db.delete(db_epic)
-        self.db.commit()
+        self.db.flush()
         return True
     
-    def get_count_by_project_id(self, project_id: int) -> int:
-        count = self.db.query(EpicModel).filter(EpicModel.project_id == project_id).count()
-        return count
\ No newline at end of file
+    def get_count_by_project_id(self, project_id: int, status: Optional[EpicStatus] = None) -> int:
+        # Lectura de los contadores del proyecto por clave primaria: no recorre las épicas
+        statuses = [status] if status is not None else list(EpicStatus)
+        row = self.db.execute(select(*(getattr(ProjectModel, EPIC_COUNTERS[s]) for s in statuses))
+                              .where(ProjectModel.id == project_id)).one_or_none()
+        return sum(row) if row else 0
+
+    # --- Operaciones masivas: sentencias por lotes en lugar de una ida y vuelta por fila ---
+
+    def get_by_ids(self, epic_ids: Iterable[int]) -> List[Epic]:
+        epics = []
+        for chunk in chunked(set(epic_ids)):
+            epics.extend(epics_from_rows(self.db.query(*EPIC_COLUMNS).filter(EpicModel.id.in_(chunk))))
+        return epics
+
+    def _find_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], EpicModel]:
+        # Un SELECT por lote con project_id IN (...) AND name_normalized IN (...), resuelto con el índice UNIQUE;
+        # puede traer combinaciones que no se pidieron, así que se filtran aquí
+        wanted = {(project_id, normalize_name(name)) for project_id, name in keys}
+        parent_ids = {project_id for project_id, _ in wanted}
+        found: Dict[Tuple[int, str], EpicModel] = {}
+        for names in chunked({name for _, name in wanted}):
+            query = self.db.query(EpicModel).filter(EpicModel.project_id.in_(parent_ids), EpicModel.name_normalized.in_(names))
+            for db_epic in query:
+                key = (int(db_epic.project_id), str(db_epic.name_normalized)) # type: ignore
+                if key in wanted:
+                    found[key] = db_epic
+        return found
+
+    def get_ids_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        return {key: int(db_epic.id) for key, db_epic in self._find_by_names(keys).items()} # type: ignore
+
+    def add_many(self, epics: List[Epic]) -> List[Epic]:
+        if not epics:
+            return []
+        rows = [
+            {
+                "project_id": epic.project_id,
+                "name": epic.name,
+                "description": epic.description,
+                "completion_criteria": epic.completion_criteria,
+                "status": epic.status,
+                "priority": epic.priority,
+                "start_date": epic.start_date,
+                "end_date": epic.end_date,
+                "created_at": epic.created_at,
+                "name_normalized": normalize_name(epic.name),
+                "updated_at": epic.updated_at,
+            }
+            for epic in epics
+        ]
+        try:
+            # INSERT de varias filas (executemany / insertmanyvalues) sin pasar por la unidad de trabajo del ORM
+            self.db.execute(insert(EpicModel), rows)
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError("Some epics in the request already exist in their project.")
+            if is_missing_parent(e):
+                raise ValueError("Some epics in the request belong to a project that no longer exists.")
+            raise
+        # MySQL no devuelve los IDs de un INSERT múltiple: los recuperamos por la clave única (project_id, name_normalized)
+        created = self._find_by_names((epic.project_id, epic.name) for epic in epics)
+        record_changes(self.db, ChangeEntity.EPIC, (db_epic.id for db_epic in created.values()), ChangeOperation.UPSERT) # type: ignore
+        adjust_epic_counters(self.db, Counter((epic.project_id, epic.status) for epic in epics))
+        return [self._to_entity(created[(epic.project_id, normalize_name(epic.name))]) for epic in epics]
+
+    def update_many(self, changes: List[Tuple[Epic, Collection[str]]]) -> List[Epic]:
+        if not changes:
+            return []
+        now = datetime.datetime.now()
+        epics = [epic for epic, _ in changes]
+        # Solo las columnas enviadas: la entidad leída trae valores de relleno (start_date NULL -> ahora) que no
+        # deben acabar en la base de datos
+        rows = []
+        for epic, fields in changes:
+            row = {"id": epic.id, "updated_at": now}
+            row.update((field, getattr(epic, field)) for field in UPDATABLE_FIELDS if field in fields)
+            if "name" in fields:
+                row["name_normalized"] = normalize_name(epic.name)
+            rows.append(row)
+        # El executemany agrupa las filas consecutivas con las mismas columnas: se ordenan para que sean pocos grupos
+        rows.sort(key=sorted)
+        # Lo que había antes por (proyecto, estado) se resta y lo nuevo se suma
+        deltas = Counter((epic.project_id, epic.status) for epic in epics)
+        deltas.subtract(count_by_parent_and_status(self.db, EpicModel, EpicModel.project_id, (epic.id for epic in epics))) # type: ignore[misc]
+        try:
+            # UPDATE por clave primaria en lote (executemany), un grupo por combinación de columnas enviadas
+            self.db.execute(update(EpicModel), rows)
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError("Some epics in the request would duplicate a name in their project.")
+            raise
+        record_changes(self.db, ChangeEntity.EPIC, (epic.id for epic in epics), ChangeOperation.UPSERT) # type: ignore
+        adjust_epic_counters(self.db, deltas)
+        for epic in epics:
+            epic.updated_at = now
+        return epics
+
+    def delete_many(self, epic_ids: List[int]) -> int:
+        removed = count_by_parent_and_status(self.db, EpicModel, EpicModel.project_id, epic_ids)
+        adjust_epic_counters(self.db, {key: -count for key, count in removed.items()})
+        deleted = 0
+        for chunk in chunked(epic_ids):
+            record_cascade_from_epics(self.db, chunk)
+            record_changes(self.db, ChangeEntity.EPIC, chunk, ChangeOperation.DELETE)
+            deleted += self.db.execute(delete(EpicModel).where(EpicModel.id.in_(chunk))).rowcount
+        return deleted
@@ -0,0 +1,51 @@
+from typing import Iterator, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from src.domain.repositories.export_repository import ExportRepository
+from src.domain.entities.project import Project
+from src.domain.entities.epic import Epic
+from src.domain.entities.task import Task
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+from src.infrastructure.repositories.row_mapping import (EPIC_FIELDS, PROJECT_FIELDS, TASK_FIELDS, columns,
+                                                         epics_from_rows, projects_from_rows, tasks_from_rows)
+
+# Filas que el driver trae de cada vez del cursor del servidor
+EXPORT_BATCH_SIZE = 1000
+
+class SQLAlchemyExportRepository(ExportRepository):
+    # Consultas Core (sin ORM: nada se queda en el identity map de la sesión) con yield_per, que activa
+    # stream_results: en MySQL un cursor del servidor, así que ni el driver ni el proceso cargan el resultado entero.
+    # Las tres consultas de un volcado van seguidas en la misma transacción: con REPEATABLE READ ven la misma foto
+    def __init__(self, db: Session, batch_size: int = EXPORT_BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def _stream(self, query, to_entities) -> Iterator:
+        # Cada lote de yield_per se convierte de una vez
+        for rows in self.db.execute(query.execution_options(yield_per=self.batch_size)).partitions():
+            yield from to_entities(rows)
+
+    def stream_projects(self, project_id: Optional[int] = None) -> Iterator[Project]:
+        projects = ProjectModel.__table__
+        query = select(*columns(projects, PROJECT_FIELDS)).order_by(projects.c.id) # type: ignore[arg-type]
+        if project_id is not None:
+            query = query.where(projects.c.id == project_id)
+        return self._stream(query, projects_from_rows)
+
+    def stream_epics(self, project_id: Optional[int] = None) -> Iterator[Epic]:
+        epics = EpicModel.__table__
+        query = select(*columns(epics, EPIC_FIELDS)).order_by(epics.c.id) # type: ignore[arg-type]
+        if project_id is not None:
+            query = query.where(epics.c.project_id == project_id)
+        return self._stream(query, epics_from_rows)
+
+    def stream_tasks(self, project_id: Optional[int] = None) -> Iterator[Task]:
+        tasks, epics = TaskModel.__table__, EpicModel.__table__
+        if project_id is None:
+            # Volcado completo: recorrido por la clave primaria, sin ordenar en la base de datos
+            query = select(*columns(tasks, TASK_FIELDS)).order_by(tasks.c.id) # type: ignore[arg-type]
+        else:
+            # Las tareas de cada épica del proyecto, juntas
+            query = (select(*columns(tasks, TASK_FIELDS)).join_from(tasks, epics, tasks.c.epic_id == epics.c.id)
+                     .where(epics.c.project_id == project_id).order_by(tasks.c.epic_id, tasks.c.id))
+        return self._stream(query, tasks_from_rows)
@@ -1,13 +1,34 @@
 import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from src.domain.repositories.project_repository import ProjectRepository
 from src.domain.entities.project import Project, ProjectStatus
-from src.infrastructure.models import ProjectModel
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+from src.domain.entities.board import EpicBoard, ProjectBoard, group_by_status
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel, is_name_conflict, normalize_name
+from src.infrastructure.repositories.pagination import paginate
+from src.infrastructure.repositories.bulk import chunked
+from src.infrastructure.repositories.change_log import record_cascade_from_project, record_changes
+from src.infrastructure.repositories.loading import LoadingStrategy, load_path
+from src.infrastructure.repositories.row_mapping import PROJECT_FIELDS, columns, projects_from_rows
+from src.infrastructure.repositories.sqlalchemy_epic_repository import SQLAlchemyEpicRepository
+from src.infrastructure.repositories.sqlalchemy_task_repository import SQLAlchemyTaskRepository
+
+# Las lecturas de listas seleccionan estas columnas (filas Core, no instancias del ORM) y las convierte projects_from_rows
+PROJECT_COLUMNS = columns(ProjectModel.__table__, PROJECT_FIELDS) # type: ignore[arg-type]
 
 class SQLAlchemyProjectRepository(ProjectRepository):
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, loading: LoadingStrategy = LoadingStrategy.RAISE):
         self.db = db
+        # Estrategia para las lecturas jerárquicas (get_board); con RAISE, recorrer las relaciones lanza un error
+        self.loading = loading
+        # El identity map de la sesión guarda referencias débiles: retenemos las filas leídas por ID para que
+        # update()/delete() reutilicen la que el servicio acaba de cargar en lugar de volver a consultarla
+        self._loaded: Dict[int, ProjectModel] = {}
     
     # funcion privada para convertir de modelo de DB a entidad de Dominio y evitar repetición de código y errores de Pylance
     def _to_entity(self, db_model: ProjectModel) -> Project:
@@ -37,15 +58,24 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         )
         # 2. Guardamos en MySQL
         self.db.add(db_project)
-        self.db.commit()
-        self.db.refresh(db_project) # Para obtener el ID generado automáticamente
+        try:
+            # flush envía el INSERT dentro de la transacción de la petición; el COMMIT lo hace quien la gestiona
+            self.db.flush()
+        except IntegrityError as e:
+            # El índice UNIQUE sobre name_normalized aplica la regla de nombres duplicados
+            if is_name_conflict(e):
+                raise ValueError(f"The project with name '{project.name}' already exists.")
+            raise
+        # No hace falta refresh: el flush ya rellena el ID generado y los valores por defecto se calculan en Python
+        record_changes(self.db, ChangeEntity.PROJECT, [db_project.id], ChangeOperation.UPSERT) # type: ignore
         
         # 3. Devolvemos el objeto actualizado con su ID
         project.id = db_project.id if isinstance(db_project.id, int) else None
         return self._to_entity(db_project)
     
     def update(self, project_id:int, project: Project) -> Optional[Project]:
-        db_project = self.db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+        # get() reutiliza la fila que el servicio ya cargó en esta sesión (identity map), sin otro SELECT
+        db_project = self.db.get(ProjectModel, project_id)
         if not db_project:
             raise ValueError("Project not found")
         
@@ -72,32 +102,97 @@ class SQLAlchemyProjectRepository(ProjectRepository):
         
         db_project.updated_at = datetime.datetime.now()  # type: ignore
         
-        self.db.commit()
-        self.db.refresh(db_project)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError(f"The project with name '{project.name}' already exists.")
+            raise
+        record_changes(self.db, ChangeEntity.PROJECT, [project_id], ChangeOperation.UPSERT)
         
         return self._to_entity(db_project)
     
     def get_by_id(self, project_id: int) -> Optional[Project]:
-        db_project = self.db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+        db_project = self.db.get(ProjectModel, project_id)
         if not db_project:
             raise ValueError("Project not found")
+        self._loaded[project_id] = db_project
         
         return self._to_entity(db_project)
     
-    def get_all(self) -> Optional[List[Project]]:
-        db_projects = self.db.query(ProjectModel).all()
-        if len(db_projects) != 0:
-            if not db_projects:
-                raise ValueError("No projects found")
-        
-        #Retornamos una lista de db_project como hemos tipado en la función
-        return [self._to_entity(db_project) for db_project in db_projects]
+    def get_by_ids(self, project_ids: Iterable[int]) -> List[Project]:
+        projects = []
+        for chunk in chunked(set(project_ids)):
+            projects.extend(projects_from_rows(self.db.query(*PROJECT_COLUMNS).filter(ProjectModel.id.in_(chunk))))
+        return projects
+    
+    def get_board(self, project_id: int) -> ProjectBoard:
+        # Proyecto -> épicas -> tareas: 3 consultas con SELECTIN o 1 con JOINED, sea cual sea el tamaño del tablero
+        db_project = (self.db.query(ProjectModel)
+                      .options(load_path(self.loading, ProjectModel.epics, EpicModel.tasks))
+                      .filter(ProjectModel.id == project_id)
+                      .one_or_none())
+        if not db_project:
+            raise ValueError("Project not found")
+
+        # Reutilizamos la conversión a entidades de los otros repositorios
+        epics, tasks = SQLAlchemyEpicRepository(self.db), SQLAlchemyTaskRepository(self.db)
+        return ProjectBoard(
+            project=self._to_entity(db_project),
+            epics=[EpicBoard(epics._to_entity(db_epic), group_by_status(tasks._to_entity(db_task) for db_task in db_epic.tasks))
+                   for db_epic in db_project.epics],
+        )
+    
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[ProjectStatus] = None) -> Page[Project]:
+        # Los filtros se aplican en la base de datos, nunca cargamos la tabla completa
+        query = self.db.query(*PROJECT_COLUMNS)
+        if status is not None:
+            query = query.filter(ProjectModel.status == status)
+
+        return paginate(query, ProjectModel, limit, cursor, order_by, projects_from_rows)
+
+    def get_version(self, status: Optional[ProjectStatus] = None) -> Version:
+        query = self.db.query(func.count(ProjectModel.id), func.max(ProjectModel.updated_at))
+        if status is not None:
+            query = query.filter(ProjectModel.status == status)
+        count, last_modified = query.one()
+        return Version(count, last_modified)
+
+    def get_board_version(self, project_id: int) -> Version:
+        # Una sola consulta con subconsultas escalares resueltas por los índices (project_id, updated_at)
+        # y (epic_id, updated_at); ninguna carga filas
+        epic_scope = EpicModel.project_id == project_id
+        task_scope = TaskModel.epic_id.in_(select(EpicModel.id).where(epic_scope))
+        row = self.db.execute(
+            select(ProjectModel.updated_at,
+                   select(func.count(EpicModel.id)).where(epic_scope).scalar_subquery(),
+                   select(func.max(EpicModel.updated_at)).where(epic_scope).scalar_subquery(),
+                   select(func.count(TaskModel.id)).where(task_scope).scalar_subquery(),
+                   select(func.max(TaskModel.updated_at)).where(task_scope).scalar_subquery())
+            .where(ProjectModel.id == project_id)
+        ).one_or_none()
+        if row is None:
+            raise ValueError("Project not found")
+        project_updated_at, epic_count, epics_updated_at, task_count, tasks_updated_at = row
+        changes = [value for value in (project_updated_at, epics_updated_at, tasks_updated_at) if value is not None]
+        return Version(1 + epic_count + task_count, max(changes) if changes else None)
+    
+    def exists_by_name(self, name: str, exclude_id: Optional[int] = None) -> bool:
+        # Un único SELECT ... LIMIT 1 resuelto con el índice UNIQUE de name_normalized
+        query = self.db.query(ProjectModel.id).filter(ProjectModel.name_normalized == normalize_name(name))
+        if exclude_id is not None:
+            query = query.filter(ProjectModel.id != exclude_id)
+        return query.limit(1).first() is not None
     
     def delete(self, project_id: int) -> bool:
-        db_project = self.db.query(ProjectModel).filter(ProjectModel.id == project_id).first()
+        db_project = self.db.get(ProjectModel, project_id)
         if not db_project:
             raise ValueError("Project not found")
         
+        # Borrado físico: registramos también las épicas y tareas que la base de datos eliminará en cascada
+        record_cascade_from_project(self.db, project_id)
+        record_changes(self.db, ChangeEntity.PROJECT, [project_id], ChangeOperation.DELETE)
         self.db.delete(db_project)
-        self.db.commit()
+        self.db.flush()
         return True
\ No newline at end of file
@@ -0,0 +1,176 @@
+import base64
+import json
+import re
+from typing import List, Optional, Tuple
+from sqlalchemy import Select, and_, func, literal, literal_column, null, or_, select, table, column
+from sqlalchemy.dialects import mysql
+from sqlalchemy.orm import Session
+from src.domain.repositories.search_repository import SearchRepository
+from src.domain.entities.change import ChangeEntity
+from src.domain.entities.page import Page
+from src.domain.entities.search import SearchHit
+from src.infrastructure.models import EpicModel, TaskModel
+from src.infrastructure.repositories.pagination import encode_cursor
+from src.infrastructure.search_index import SCOPE_COLUMNS, SEARCH_COLUMNS, fts_table_name
+
+# Se buscan como mucho estas palabras de la consulta; el resto se ignora
+MAX_TERMS = 10
+
+# SQLite: la relevancia (bm25) se calcula sobre las coincidencias más recientes de cada tipo, como mucho estas.
+# Con palabras poco frecuentes el orden es exacto; con palabras que aparecen en cientos de miles de filas el
+# coste ya no crece con la tabla (a cambio, solo se puede paginar hasta aquí)
+SEARCH_CANDIDATES = 2_000
+
+# SQLite: pesos de bm25 por columna del índice (texto y ámbito); el nombre pesa más que la descripción y los criterios
+SQLITE_WEIGHTS = (10.0, 2.0, 1.0, 0.0)
+
+# Por encima de estas épicas en un proyecto, las tareas se acotan con un JOIN sobre los candidatos en lugar de
+# dentro del índice (con palabras muy frecuentes puede dejar fuera tareas del proyecto)
+MAX_SCOPE_EPICS = 500
+
+# La última palabra se busca como prefijo (búsqueda mientras se escribe) solo a partir de esta longitud:
+# un prefijo de una o dos letras coincide con casi todo
+MIN_PREFIX_LENGTH = 3
+
+# Orden de desempate entre tipos con la misma relevancia
+ENTITY_RANK = {entity: rank for rank, entity in enumerate(ChangeEntity)}
+
+def search_terms(text: str) -> List[str]:
+    # Solo palabras: los operadores de la sintaxis de cada motor (+, -, ", *, NEAR...) no llegan a la consulta
+    return re.findall(r"\w+", text.lower())[:MAX_TERMS]
+
+def _decode_cursor(cursor: str) -> Tuple[float, ChangeEntity, int]:
+    # Clave del último resultado devuelto: [relevancia, tipo, id]
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, entity, last_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return float(score), ChangeEntity(entity), int(last_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+class SQLAlchemySearchRepository(SearchRepository):
+    def __init__(self, db: Session):
+        self.db = db
+        self.dialect = db.get_bind().dialect.name
+
+    def _scope_epic_ids(self, project_id: int) -> Optional[List[int]]:
+        # Épicas del proyecto para acotar las tareas dentro del índice; None si son demasiadas
+        ids = list(self.db.scalars(select(EpicModel.id).where(EpicModel.project_id == project_id)
+                                   .order_by(EpicModel.id).limit(MAX_SCOPE_EPICS + 1)))
+        return ids if len(ids) <= MAX_SCOPE_EPICS else None
+
+    def _sqlite_source(self, entity: ChangeEntity, terms: List[str], project_id: Optional[int]):
+        # Índice FTS5. Todas las palabras son obligatorias y la última se busca como prefijo. El ámbito del proyecto se resuelve dentro del índice siempre que se puede.
+        # Devuelve (FROM, condición adicional, relevancia) o None si no puede haber resultados
+        model, columns = SEARCH_COLUMNS[entity]
+        fts_name = fts_table_name(model.__tablename__)
+        phrases = [f'"{term}"' for term in terms]
+        if len(terms[-1]) >= MIN_PREFIX_LENGTH:
+            phrases[-1] += "*"
+        expression = f"{{{' '.join(columns)}}}: ({' '.join(phrases)})"
+        extra = None
+        fts = table(fts_name, column("rowid"))
+        scope = SCOPE_COLUMNS[entity]
+        if project_id is not None and entity == ChangeEntity.PROJECT:
+            extra = fts.c.rowid == project_id
+        elif project_id is not None and entity == ChangeEntity.EPIC:
+            expression = f"{scope}: {project_id} AND {expression}"
+        elif project_id is not None:
+            epic_ids = self._scope_epic_ids(project_id)
+            if epic_ids == []:
+                return None
+            if epic_ids is not None:
+                expression = f"{scope}: ({' OR '.join(map(str, epic_ids))}) AND {expression}"
+
+        fts_ref = literal_column(fts_name)
+        candidates = (select(fts.c.rowid.label("id"), (-func.bm25(fts_ref, *SQLITE_WEIGHTS)).label("score"))
+                      .select_from(fts).where(fts_ref.op("MATCH")(expression)))
+        if extra is not None:
+            candidates = candidates.where(extra)
+        # bm25 solo se calcula para las filas que salen de aquí: las coincidencias más recientes primero
+        candidates = candidates.order_by(fts.c.rowid.desc()).limit(SEARCH_CANDIDATES).subquery()
+        return model.__table__.join(candidates, model.id == candidates.c.id), None, candidates.c.score
+
+    def _source(self, entity: ChangeEntity, terms: List[str], project_id: Optional[int]):
+        model, columns = SEARCH_COLUMNS[entity]
+        table_columns = [model.__table__.c[name] for name in columns]
+        if self.dialect == "sqlite":
+            return self._sqlite_source(entity, terms, project_id)
+        if self.dialect == "mysql":
+            # Índice FULLTEXT en modo booleano: todas las palabras son obligatorias y la última se busca como prefijo
+            against = " ".join(f"+{term}" for term in terms) + ("*" if len(terms[-1]) >= MIN_PREFIX_LENGTH else "")
+            score = mysql.match(*table_columns, against=against).in_boolean_mode()
+            return model.__table__, score > 0, score
+        # Otras bases de datos: sin índice, todas las palabras en alguna columna y sin relevancia
+        condition = and_(*(or_(*(col.ilike(f"%{term}%") for col in table_columns)) for term in terms))
+        return model.__table__, condition, literal(0.0)
+
+    def _query(self, entity: ChangeEntity, terms: List[str], project_id: Optional[int],
+               after: Optional[Tuple[float, ChangeEntity, int]], limit: int) -> Optional[Select]:
+        source = self._source(entity, terms, project_id)
+        if source is None:
+            return None
+        model, _ = SEARCH_COLUMNS[entity]
+        from_clause, condition, score = source
+        if entity == ChangeEntity.TASK:
+            from_clause = from_clause.join(EpicModel, TaskModel.epic_id == EpicModel.id)
+            project_column, epic_column = EpicModel.project_id, TaskModel.epic_id
+        elif entity == ChangeEntity.EPIC:
+            project_column, epic_column = EpicModel.project_id, null()
+        else:
+            project_column, epic_column = model.id, null()
+
+        query = (select(model.id, project_column.label("project_id"), epic_column.label("epic_id"),
+                        model.name, model.description, score.label("score"))
+                 .select_from(from_clause))
+        if condition is not None:
+            query = query.where(condition)
+        if project_id is not None:
+            # En SQLite casi siempre ya viene acotado desde el índice; aquí es la comprobación barata sobre pocas filas
+            query = query.where(project_column == project_id)
+        if after is not None:
+            # Keyset sobre (relevancia desc, tipo, id): lo que va detrás del último resultado entregado
+            last_score, last_entity, last_id = after
+            if ENTITY_RANK[entity] < ENTITY_RANK[last_entity]:
+                query = query.where(score < last_score)
+            elif entity == last_entity:
+                query = query.where(or_(score < last_score, and_(score == last_score, model.id > last_id)))
+            else:
+                query = query.where(score <= last_score)
+        return query.order_by(score.desc(), model.id).limit(limit)
+
+    def search(self, text: str, entity: Optional[ChangeEntity] = None, project_id: Optional[int] = None,
+               limit: int = 20, cursor: Optional[str] = None) -> Page[SearchHit]:
+        if limit < 1:
+            raise ValueError("Limit must be greater than 0")
+        after = _decode_cursor(cursor) if cursor else None
+        terms = search_terms(text)
+        if not terms:
+            return Page(items=[])
+
+        # Una consulta por tipo (cada uno tiene su índice), con un resultado de más para saber si hay otra página;
+        # se mezclan por relevancia
+        hits: List[SearchHit] = []
+        for searched in ([entity] if entity else list(ChangeEntity)):
+            query = self._query(searched, terms, project_id, after, limit + 1)
+            if query is None:
+                continue
+            for row in self.db.execute(query):
+                hits.append(SearchHit(
+                    entity=searched,
+                    id=int(row.id),
+                    project_id=int(row.project_id),
+                    name=str(row.name),
+                    description=str(row.description) if row.description else None,
+                    epic_id=int(row.epic_id) if row.epic_id is not None else None,
+                    score=float(row.score),
+                ))
+        hits.sort(key=lambda hit: (-hit.score, ENTITY_RANK[hit.entity], hit.id))
+
+        has_more = len(hits) > limit
+        hits = hits[:limit]
+        next_cursor = None
+        if has_more:
+            last = hits[-1]
+            next_cursor = encode_cursor([last.score, last.entity.value, last.id])
+        return Page(items=hits, next_cursor=next_cursor)
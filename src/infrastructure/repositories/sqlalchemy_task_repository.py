@@ -1,13 +1,32 @@
 import datetime
-from typing import List, Optional
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, delete, func, insert, or_, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from src.domain.repositories.task_repository import TaskRepository
 from src.domain.entities.task import Task, TaskStatus, TaskPriority
-from src.infrastructure.models import TaskModel
+from src.domain.entities.page import Page
+from src.domain.entities.version import Version
+from src.domain.entities.board import BoardColumn
+from src.domain.entities.change import ChangeEntity, ChangeOperation
+from src.domain.entities.stats import AssigneeWorkload, TaskStats
+from src.infrastructure.models import EpicModel, TaskModel, is_missing_parent, is_name_conflict, normalize_name
+from src.infrastructure.repositories.pagination import decode_cursor, encode_cursor, paginate
+from src.infrastructure.repositories.bulk import chunked
+from src.infrastructure.repositories.change_log import record_changes
+from src.infrastructure.repositories.counters import TASK_COUNTERS, adjust_task_counters, count_by_parent_and_status
+from src.infrastructure.repositories.row_mapping import TASK_FIELDS, columns, tasks_from_rows
+
+# Las lecturas de listas seleccionan estas columnas (filas Core, no instancias del ORM) y las convierte tasks_from_rows
+TASK_COLUMNS = columns(TaskModel.__table__, TASK_FIELDS) # type: ignore[arg-type]
 
 class SQLAlchemyTaskRepository(TaskRepository):
     def __init__(self, db: Session):
         self.db = db
+        # El identity map de la sesión guarda referencias débiles: retenemos las filas leídas por ID para que
+        # update()/delete() reutilicen la que el servicio acaba de cargar en lugar de volver a consultarla
+        self._loaded: Dict[int, TaskModel] = {}
     
     # funcion privada para convertir de modelo de DB a entidad de Dominio y evitar repetición de código y errores de Pylance
     def _to_entity(self, db_model: TaskModel) -> Task:
@@ -39,23 +58,36 @@ class SQLAlchemyTaskRepository(TaskRepository):
             target_date=task.target_date,
             finalization_criteria=task.finalization_criteria,
             finalization_date=task.finalization_date,
-            status=task.status.value,
+            status=task.status,
             assignee=task.assignee,
-            priority=task.priority.value
+            priority=task.priority
         )
         # 2. Guardamos en MySQL
         self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task) # Para obtener el ID generado automáticamente
+        try:
+            # flush envía el INSERT dentro de la transacción de la petición; el COMMIT lo hace quien la gestiona
+            self.db.flush()
+        except IntegrityError as e:
+            # El índice UNIQUE sobre name_normalized aplica la regla de nombres duplicados
+            if is_name_conflict(e):
+                raise ValueError(f"The task with name '{task.name}' already exists in epic ID {task.epic_id}.")
+            if is_missing_parent(e):
+                raise ValueError(f"The epic with ID {task.epic_id} does not exist.")
+            raise
+        # No hace falta refresh: el flush ya rellena el ID generado y los valores por defecto se calculan en Python
+        record_changes(self.db, ChangeEntity.TASK, [db_task.id], ChangeOperation.UPSERT) # type: ignore
+        adjust_task_counters(self.db, {(task.epic_id, db_task.status): 1}) # type: ignore[dict-item]
         
         # 3. Devolvemos el objeto actualizado con su ID
         task.id = db_task.id if isinstance(db_task.id, int) else None
         return self._to_entity(db_task)
     
     def update(self, task_id:int, task: Task) -> Optional[Task]:
-        db_task = self.db.query(TaskModel).filter(TaskModel.id == task_id).first()
+        # get() reutiliza la fila que el servicio ya cargó en esta sesión (identity map), sin otro SELECT
+        db_task = self.db.get(TaskModel, task_id)
         if not db_task:
             raise ValueError("Task not found")
+        previous_status = db_task.status
         
         #Actualizamos los campos en los que se ha escrito alguna información
         #Usamos ignore para evitar errores marcados por Pylance por la duda de tipos en el metacodigo de sqlalchemy
@@ -76,53 +108,305 @@ class SQLAlchemyTaskRepository(TaskRepository):
             db_task.finalization_date = task.finalization_date # type: ignore
         
         if task.status is not None:
-            db_task.status = task.status.value  # type: ignore
+            db_task.status = task.status  # type: ignore
 
         if task.assignee is not None:
             db_task.assignee = task.assignee  # type: ignore
 
         if task.priority is not None:
-            db_task.priority = task.priority.value  # type: ignore
+            db_task.priority = task.priority  # type: ignore
         
         db_task.updated_at = datetime.datetime.now()  # type: ignore
         
-        self.db.commit()
-        self.db.refresh(db_task)
+        try:
+            self.db.flush()
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError(f"The task with name '{task.name}' already exists in epic ID {db_task.epic_id}.")
+            raise
+        record_changes(self.db, ChangeEntity.TASK, [task_id], ChangeOperation.UPSERT)
+        if db_task.status != previous_status:
+            epic_id = int(db_task.epic_id) # type: ignore
+            adjust_task_counters(self.db, {(epic_id, previous_status): -1, (epic_id, db_task.status): 1}) # type: ignore[dict-item]
         
         return self._to_entity(db_task)
     
     def get_by_id(self, task_id: int) -> Optional[Task]:
-        db_task = self.db.query(TaskModel).filter(TaskModel.id == task_id).first()
+        db_task = self.db.get(TaskModel, task_id)
         if not db_task:
             raise ValueError("Task not found")
+        self._loaded[task_id] = db_task
         
         return self._to_entity(db_task)
     
-    def get_all(self) -> Optional[List[Task]]:
-        db_tasks = self.db.query(TaskModel).all()
-        if not db_tasks:
-            raise ValueError("No tasks found")
-        
-        #Retornamos una lista de db_tasks como hemos tipado en la función
-        return [self._to_entity(db_task) for db_task in db_tasks]
+    def _filter(self, query, status: Optional[TaskStatus], priority: Optional[TaskPriority],
+                assignee: Optional[str], epic_id: Optional[int]):
+        # Los filtros se aplican en la base de datos, nunca cargamos la tabla completa
+        if status is not None:
+            query = query.filter(TaskModel.status == status)
+        if priority is not None:
+            query = query.filter(TaskModel.priority == priority)
+        if assignee is not None:
+            query = query.filter(TaskModel.assignee == assignee)
+        if epic_id is not None:
+            query = query.filter(TaskModel.epic_id == epic_id)
+        return query
+
+    def get_page(self, limit: int, cursor: Optional[str] = None, order_by: str = "id",
+                 status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                 assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Page[Task]:
+        query = self._filter(self.db.query(*TASK_COLUMNS), status, priority, assignee, epic_id)
+        return paginate(query, TaskModel, limit, cursor, order_by, tasks_from_rows)
+
+    def get_due_page(self, before: datetime.datetime, limit: int, cursor: Optional[str] = None,
+                     exclude_statuses: Iterable[TaskStatus] = (TaskStatus.DONE,)) -> Page[Task]:
+        if limit < 1:
+            raise ValueError("Limit must be greater than 0")
+        # Rango sobre ix_tasks_target_date_id_status. La comparación ya deja fuera las tareas sin fecha (no vencen
+        # nunca); un "IS NOT NULL" explícito haría que SQLite empezase el rango por el principio del índice
+        query = self.db.query(*TASK_COLUMNS).filter(TaskModel.target_date < before)
+        excluded = set(exclude_statuses)
+        if excluded:
+            # Filas antiguas con estado nulo: cuentan como TO_DO (igual que los contadores)
+            allowed = TaskModel.status.not_in(excluded)
+            query = query.filter(allowed if TaskStatus.TO_DO in excluded else or_(allowed, TaskModel.status.is_(None)))
+        if cursor:
+            last_date, last_id = decode_cursor(cursor, "target_date")
+            # El ">=" redundante fija el inicio del rango en el índice: sin él, el OR no acota el recorrido
+            query = query.filter(TaskModel.target_date >= last_date, or_(
+                TaskModel.target_date > last_date,
+                and_(TaskModel.target_date == last_date, TaskModel.id > last_id),
+            ))
+        rows = query.order_by(TaskModel.target_date, TaskModel.id).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1].target_date, rows[-1].id]) if has_more else None
+        return Page(items=tasks_from_rows(rows), next_cursor=next_cursor)
+
+    def get_version(self, status: Optional[TaskStatus] = None, priority: Optional[TaskPriority] = None,
+                    assignee: Optional[str] = None, epic_id: Optional[int] = None) -> Version:
+        # Con epic_id se resuelve solo con el índice (epic_id, updated_at)
+        query = self._filter(self.db.query(func.count(TaskModel.id), func.max(TaskModel.updated_at)),
+                             status, priority, assignee, epic_id)
+        count, last_modified = query.one()
+        return Version(count, last_modified)
+    
+    def get_board_columns(self, epic_ids: List[int], limit_per_column: Optional[int] = None) -> Dict[int, List[BoardColumn]]:
+        # Todas las columnas de todas las épicas en una sola consulta: las funciones de ventana numeran las tareas
+        # de cada (epic_id, status) y cuentan el total de la columna, así que limitar no exige un COUNT aparte
+        partition = (TaskModel.epic_id, TaskModel.status)
+        ranked = (
+            select(*TASK_COLUMNS,
+                   func.row_number().over(partition_by=partition, order_by=TaskModel.id).label("position"),
+                   func.count().over(partition_by=partition).label("column_count"))
+            .where(TaskModel.epic_id.in_(epic_ids))
+            .subquery()
+        )
+        query = select(*columns(ranked, TASK_FIELDS), ranked.c.column_count).order_by(ranked.c.epic_id, ranked.c.id)
+        if limit_per_column is not None:
+            query = query.where(ranked.c.position <= limit_per_column)
+
+        # Todas las columnas aparecen, en el orden de TaskStatus, aunque estén vacías
+        boards = {epic_id: {status: BoardColumn(status) for status in TaskStatus} for epic_id in epic_ids}
+        rows = self.db.execute(query).all()
+        for task, row in zip(tasks_from_rows(row[:-1] for row in rows), rows):
+            column = boards[task.epic_id][task.status]
+            column.count = row.column_count
+            column.tasks.append(task)
+        return {epic_id: list(columns.values()) for epic_id, columns in boards.items()}
     
     def get_by_epic_id(self, epic_id: int) -> Optional[List[Task]]:
-        db_tasks = self.db.query(TaskModel).filter(TaskModel.epic_id == epic_id).all()
+        rows = self.db.query(*TASK_COLUMNS).filter(TaskModel.epic_id == epic_id).all()
         if not epic_id:
             raise ValueError("Epic ID must be provided")
-        if not db_tasks:
+        if not rows:
             raise ValueError("No tasks found for the given epic ID")
-        return [self._to_entity(db_task) for db_task in db_tasks]
+        return tasks_from_rows(rows)
+    
+    def list_by_epic_id(self, epic_id: int) -> List[Task]:
+        # Resuelto con el índice (epic_id, status); a diferencia de get_by_epic_id, una épica sin tareas no es un error
+        return tasks_from_rows(self.db.query(*TASK_COLUMNS).filter(TaskModel.epic_id == epic_id).order_by(TaskModel.id))
+    
+    def exists_by_name(self, epic_id: int, name: str, exclude_id: Optional[int] = None) -> bool:
+        # Un único SELECT ... LIMIT 1 resuelto con el índice UNIQUE (epic_id, name_normalized)
+        query = self.db.query(TaskModel.id).filter(TaskModel.epic_id == epic_id,
+                                                   TaskModel.name_normalized == normalize_name(name))
+        if exclude_id is not None:
+            query = query.filter(TaskModel.id != exclude_id)
+        return query.limit(1).first() is not None
     
     def delete(self, task_id: int) -> bool:
-        db_task = self.db.query(TaskModel).filter(TaskModel.id == task_id).first()
+        db_task = self.db.get(TaskModel, task_id)
         if not db_task:
             raise ValueError("Task not found")
         
+        # Borrado físico: el registro de cambios es lo único que queda para que /sync informe del ID
+        record_changes(self.db, ChangeEntity.TASK, [task_id], ChangeOperation.DELETE)
+        adjust_task_counters(self.db, {(int(db_task.epic_id), db_task.status): -1}) # type: ignore
         self.db.delete(db_task)
-        self.db.commit()
+        self.db.flush()
         return True
 
-    def get_count_by_epic_id(self, epic_id: int) -> int:
-        count = self.db.query(TaskModel).filter(TaskModel.epic_id == epic_id).count()
-        return count
\ No newline at end of file
+    def get_count_by_epic_id(self, epic_id: int, status: Optional[TaskStatus] = None) -> int:
+        # Lectura de los contadores de la épica por clave primaria: no recorre las tareas
+        statuses = [status] if status is not None else list(TaskStatus)
+        row = self.db.execute(select(*(getattr(EpicModel, TASK_COUNTERS[s]) for s in statuses))
+                              .where(EpicModel.id == epic_id)).one_or_none()
+        return sum(row) if row else 0
+
+    def _stats_query(self, *group_by):
+        # Un GROUP BY (..., status, priority): cada fila trae el número de tareas y cuántas están vencidas.
+        # Con (status, priority) se rellenan a la vez los dos desgloses sin una segunda consulta
+        overdue = func.sum(case((and_(TaskModel.target_date < datetime.datetime.now(),
+                                      TaskModel.status != TaskStatus.DONE), 1), else_=0))
+        columns = (*group_by, TaskModel.status, TaskModel.priority)
+        return select(*columns, func.count(), overdue).group_by(*columns)
+
+    def _add_stats(self, stats: TaskStats, status, priority, count, overdue) -> None:
+        # Las filas antiguas pueden tener estado/prioridad nulos: cuentan como los valores por defecto del modelo
+        stats.add(status or TaskStatus.TO_DO, priority or TaskPriority.LOW, int(count), int(overdue or 0))
+
+    def get_stats_by_epic_ids(self, epic_ids: Iterable[int]) -> Dict[int, TaskStats]:
+        stats: Dict[int, TaskStats] = {}
+        for chunk in chunked(set(epic_ids)):
+            query = self._stats_query(TaskModel.epic_id).where(TaskModel.epic_id.in_(chunk))
+            for epic_id, status, priority, count, overdue in self.db.execute(query):
+                self._add_stats(stats.setdefault(epic_id, TaskStats()), status, priority, count, overdue)
+        return stats
+
+    def get_stats_by_project_id(self, project_id: int) -> TaskStats:
+        # Una sola consulta sea cual sea el número de épicas: las del proyecto se resuelven en un subselect
+        epic_ids = select(EpicModel.id).where(EpicModel.project_id == project_id)
+        stats = TaskStats()
+        for status, priority, count, overdue in self.db.execute(self._stats_query().where(TaskModel.epic_id.in_(epic_ids))):
+            self._add_stats(stats, status, priority, count, overdue)
+        return stats
+
+    def get_workload_page(self, limit: int, cursor: Optional[str] = None) -> Page[AssigneeWorkload]:
+        if limit < 1:
+            raise ValueError("Limit must be greater than 0")
+        # Keyset sobre el nombre: la página de personas (una de más para saber si hay otra) es una tabla derivada
+        # que se recorre con el índice, y el GROUP BY se hace solo sobre sus tareas, todo en la misma consulta
+        assignees = select(TaskModel.assignee).where(TaskModel.assignee.is_not(None)).distinct()
+        if cursor:
+            (last_assignee,) = decode_cursor(cursor, "assignee")
+            assignees = assignees.where(TaskModel.assignee > last_assignee)
+        page = assignees.order_by(TaskModel.assignee).limit(limit + 1).subquery()
+        query = (self._stats_query(TaskModel.assignee)
+                 .join_from(TaskModel, page, TaskModel.assignee == page.c.assignee)
+                 .order_by(TaskModel.assignee))
+
+        workloads: Dict[str, AssigneeWorkload] = {}
+        for assignee, status, priority, count, overdue in self.db.execute(query):
+            workload = workloads.setdefault(assignee, AssigneeWorkload(assignee))
+            self._add_stats(workload.tasks, status, priority, count, overdue)
+
+        items = list(workloads.values())
+        has_more = len(items) > limit
+        items = items[:limit]
+        return Page(items=items, next_cursor=encode_cursor([items[-1].assignee]) if has_more else None)
+
+    # --- Operaciones masivas: sentencias por lotes en lugar de una ida y vuelta por fila ---
+
+    def get_by_ids(self, task_ids: Iterable[int]) -> List[Task]:
+        tasks = []
+        for chunk in chunked(set(task_ids)):
+            tasks.extend(tasks_from_rows(self.db.query(*TASK_COLUMNS).filter(TaskModel.id.in_(chunk))))
+        return tasks
+
+    def _find_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], TaskModel]:
+        # Un SELECT por lote con epic_id IN (...) AND name_normalized IN (...), resuelto con el índice UNIQUE;
+        # puede traer combinaciones que no se pidieron, así que se filtran aquí
+        wanted = {(epic_id, normalize_name(name)) for epic_id, name in keys}
+        parent_ids = {epic_id for epic_id, _ in wanted}
+        found: Dict[Tuple[int, str], TaskModel] = {}
+        for names in chunked({name for _, name in wanted}):
+            query = self.db.query(TaskModel).filter(TaskModel.epic_id.in_(parent_ids), TaskModel.name_normalized.in_(names))
+            for db_task in query:
+                key = (int(db_task.epic_id), str(db_task.name_normalized)) # type: ignore
+                if key in wanted:
+                    found[key] = db_task
+        return found
+
+    def get_ids_by_names(self, keys: Iterable[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+        return {key: int(db_task.id) for key, db_task in self._find_by_names(keys).items()} # type: ignore
+
+    def add_many(self, tasks: List[Task]) -> List[Task]:
+        if not tasks:
+            return []
+        rows = [
+            {
+                "epic_id": task.epic_id,
+                "name": task.name,
+                "description": task.description,
+                "target_date": task.target_date,
+                "finalization_criteria": task.finalization_criteria,
+                "finalization_date": task.finalization_date,
+                "status": task.status,
+                "assignee": task.assignee,
+                "priority": task.priority,
+                "created_at": task.created_at,
+                "name_normalized": normalize_name(task.name),
+                "updated_at": task.updated_at,
+            }
+            for task in tasks
+        ]
+        try:
+            # INSERT de varias filas (executemany / insertmanyvalues) sin pasar por la unidad de trabajo del ORM
+            self.db.execute(insert(TaskModel), rows)
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError("Some tasks in the request already exist in their epic.")
+            if is_missing_parent(e):
+                raise ValueError("Some tasks in the request belong to an epic that no longer exists.")
+            raise
+        # MySQL no devuelve los IDs de un INSERT múltiple: los recuperamos por la clave única (epic_id, name_normalized)
+        created = self._find_by_names((task.epic_id, task.name) for task in tasks)
+        record_changes(self.db, ChangeEntity.TASK, (db_task.id for db_task in created.values()), ChangeOperation.UPSERT) # type: ignore
+        adjust_task_counters(self.db, Counter((task.epic_id, task.status) for task in tasks))
+        return [self._to_entity(created[(task.epic_id, normalize_name(task.name))]) for task in tasks]
+
+    def update_many(self, tasks: List[Task]) -> List[Task]:
+        if not tasks:
+            return []
+        now = datetime.datetime.now()
+        rows = [
+            {
+                "id": task.id,
+                "name": task.name,
+                "description": task.description,
+                "target_date": task.target_date,
+                "finalization_criteria": task.finalization_criteria,
+                "finalization_date": task.finalization_date,
+                "status": task.status,
+                "assignee": task.assignee,
+                "priority": task.priority,
+                "name_normalized": normalize_name(task.name),
+                "updated_at": now,
+            }
+            for task in tasks
+        ]
+        # Lo que había antes por (épica, estado) se resta y lo nuevo se suma
+        deltas = Counter((task.epic_id, task.status) for task in tasks)
+        deltas.subtract(count_by_parent_and_status(self.db, TaskModel, TaskModel.epic_id, (task.id for task in tasks))) # type: ignore[misc]
+        try:
+            # UPDATE por clave primaria en lote (executemany); las entidades ya traen el estado final completo
+            self.db.execute(update(TaskModel), rows)
+        except IntegrityError as e:
+            if is_name_conflict(e):
+                raise ValueError("Some tasks in the request would duplicate a name in their epic.")
+            raise
+        record_changes(self.db, ChangeEntity.TASK, (task.id for task in tasks), ChangeOperation.UPSERT) # type: ignore
+        adjust_task_counters(self.db, deltas)
+        for task in tasks:
+            task.updated_at = now
+        return tasks
+
+    def delete_many(self, task_ids: List[int]) -> int:
+        record_changes(self.db, ChangeEntity.TASK, task_ids, ChangeOperation.DELETE)
+        removed = count_by_parent_and_status(self.db, TaskModel, TaskModel.epic_id, task_ids)
+        adjust_task_counters(self.db, {key: -count for key, count in removed.items()})
+        deleted = 0
+        for chunk in chunked(task_ids):
+            deleted += self.db.execute(delete(TaskModel).where(TaskModel.id.in_(chunk))).rowcount
+        return deleted
@@ -0,0 +1,13 @@
+from sqlalchemy.orm import Session
+from src.domain.repositories.unit_of_work import UnitOfWork
+
+class SQLAlchemyUnitOfWork(UnitOfWork):
+    # Comparte la Session con los repositorios del mismo servicio: ellos hacen flush y aquí se confirma
+    def __init__(self, db: Session):
+        self.db = db
+
+    def commit(self) -> None:
+        self.db.commit()
+
+    def rollback(self) -> None:
+        self.db.rollback()
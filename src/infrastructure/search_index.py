@@ -0,0 +1,89 @@
+from typing import Dict, Optional, Tuple, Type
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from src.domain.entities.change import ChangeEntity
+from src.infrastructure.database import Base
+from src.infrastructure.models import EpicModel, ProjectModel, TaskModel
+
+# Índices de texto completo para GET /search. No se declaran en los modelos porque son específicos de cada
+# base de datos: FULLTEXT en MySQL y tablas virtuales FTS5 en SQLite (ejecuciones locales y benchmarks).
+# Se crean al arrancar, después de create_all, y la instalación es idempotente: en una base de datos
+# existente el primer arranque construye el índice con los datos que ya hay (puede tardar en tablas grandes)
+
+# Columnas de texto indexadas de cada tabla, en este orden (los pesos de la relevancia en SQLite siguen el mismo orden)
+SEARCH_COLUMNS: Dict[ChangeEntity, Tuple[Type, Tuple[str, ...]]] = {
+    ChangeEntity.PROJECT: (ProjectModel, ("name", "description", "finalization_criteria")),
+    ChangeEntity.EPIC: (EpicModel, ("name", "description", "completion_criteria")),
+    ChangeEntity.TASK: (TaskModel, ("name", "description", "finalization_criteria")),
+}
+
+# Columna que se indexa además en SQLite para acotar por proyecto dentro del propio índice (la épica de cada
+# tarea y el proyecto de cada épica): "epic_id: (3 OR 7)" se resuelve cruzando listas de términos, sin JOIN.
+# Sale de la propia fila, así que los triggers no dependen de otras tablas (tampoco en los borrados en cascada)
+SCOPE_COLUMNS: Dict[ChangeEntity, Optional[str]] = {
+    ChangeEntity.PROJECT: None, # El proyecto es la propia fila: se acota por rowid
+    ChangeEntity.EPIC: "project_id",
+    ChangeEntity.TASK: "epic_id",
+}
+
+def fulltext_index_name(table: str) -> str:
+    return f"ft_{table}_search"
+
+def fts_table_name(table: str) -> str:
+    return f"{table}_fts"
+
+def _install_mysql(connection: Connection, table: str, columns: Tuple[str, ...]) -> None:
+    index = fulltext_index_name(table)
+    exists = connection.execute(text(
+        "SELECT 1 FROM information_schema.statistics "
+        "WHERE table_schema = DATABASE() AND table_name = :table AND index_name = :index LIMIT 1"
+    ), {"table": table, "index": index}).first()
+    if not exists:
+        connection.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index} ({', '.join(columns)})"))
+
+def _install_sqlite(connection: Connection, table: str, columns: Tuple[str, ...]) -> None:
+    # columns: las de texto seguidas, si la hay, de la columna de ámbito
+    fts = fts_table_name(table)
+    exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                                {"name": fts}).first()
+    names = ", ".join(columns)
+    new_values = ", ".join(f"new.{column}" for column in columns)
+    old_values = ", ".join(f"old.{column}" for column in columns)
+    # Índice invertido "external content": solo guarda los términos, el texto sigue en la tabla original.
+    # unicode61 con remove_diacritics: "epica" encuentra "épica"; prefix acelera las búsquedas por prefijo
+    connection.execute(text(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+    ))
+    # Los triggers mantienen el índice en la misma transacción que la escritura (también en los borrados en
+    # cascada). El de UPDATE solo salta si cambia alguna columna indexada: estados y contadores no lo tocan
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END"
+    ))
+    connection.execute(text(
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} ON {table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END"
+    ))
+    if not exists:
+        # Tabla ya existente con datos: se indexa lo que hay
+        connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+
+def install_search_indexes(connection: Connection) -> None:
+    """Crea (si faltan) los índices de texto completo de proyectos, épicas y tareas"""
+    dialect = connection.dialect.name
+    for entity, (model, columns) in SEARCH_COLUMNS.items():
+        if dialect == "mysql":
+            _install_mysql(connection, model.__tablename__, columns)
+        elif dialect == "sqlite":
+            scope = SCOPE_COLUMNS[entity]
+            _install_sqlite(connection, model.__tablename__, columns + ((scope,) if scope else ()))
+
+@event.listens_for(Base.metadata, "after_create")
+def _install_after_create(target, connection: Connection, **kw) -> None:
+    install_search_indexes(connection)